@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import argparse
+
+from jumpbble.selfplay import POLICIES, BatchReport, run_games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Jumpbble games headlessly.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="Number of games.")
+    parser.add_argument(
+        "-p", "--policy", choices=list(POLICIES), default="random", help="Policy."
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed of first game.")
+    parser.add_argument(
+        "-j", "--processes", type=int, default=None, help="Number of processes."
+    )
+    parser.add_argument(
+        "-w",
+        "--words",
+        default=None,
+        help="Compiled word graph or word list to use instead of enchant.",
+    )
+    parser.add_argument(
+        "-o", "--output", default=None, help="Write results of each game as JSON lines."
+    )
+    parser.add_argument(
+        "--journals", default=None, help="Directory to write journal of each game."
+    )
+    parser.add_argument(
+        "--telemetry", default=None, help="Directory to record moves of each game to."
+    )
+    args = parser.parse_args()
+    if args.journals:
+        os.makedirs(args.journals, exist_ok=True)
+
+    report = BatchReport()
+    output = open(args.output, "w") if args.output else None
+    try:
+        for result in run_games(
+            args.games,
+            args.policy,
+            seed=args.seed,
+            processes=args.processes,
+            words_path=args.words,
+            telemetry_dir=args.telemetry,
+        ):
+            journal = result.pop("journal")
+            if args.journals:
+                path = os.path.join(args.journals, f"game-{result['seed']}.jbj")
+                with open(path, "wb") as journal_stream:
+                    journal_stream.write(journal)
+            report.add(result)
+            if output:
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output:
+            output.close()
+
+    json.dump(report.summary(), sys.stdout, indent=4)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+import os
+import sys
+import json
+import time
+import random
+import itertools
+import argparse
+import subprocess
+import platform
+import tempfile
+import statistics
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from jumpbble import snapshot
+from jumpbble.board import Board
+from jumpbble.config import load_special_tiles
+from jumpbble.dictionary import CompiledDictionary, WordList, compile_words
+from jumpbble.engine import GameState, SelectTile
+from jumpbble.journal import Summary, verify
+from jumpbble.player import Player
+from jumpbble.selfplay import greedy_policy
+
+BOARD_SIZES = (15, 50, 200)
+# Stored as chunks. Cost should depend on activity, not size.
+LARGE_BOARD_SIZES = (1024, 4096)
+FILL_LEVELS = (0.1, 0.5)
+# Fixed words so results don't depend on the installed dictionary.
+# fmt: off
+WORDS = {
+    "AT", "TO", "IN", "IT", "IS", "ON", "NO", "AN", "AS", "BE", "DO", "GO", "HE",
+    "ME", "OF", "OR", "WE", "ACE", "ACT", "ANT", "ART", "ATE", "CAR", "CAT", "DOG",
+    "EAR", "EAT", "END", "NET", "ONE", "RAT", "RED", "SAT", "SEA", "TAN", "TAR",
+    "TEA", "TEN", "TOE", "RATE", "TONE", "NOTE", "STAR", "RAIN", "TRAIN", "STONE",
+}
+# fmt: on
+
+
+def measure(
+    func: Callable[[], Any],
+    *,
+    repeat: int,
+    number: int,
+    setup: Optional[Callable] = None,
+) -> Dict[str, float]:
+    """
+    Time a function.
+
+    :param func: function to time.
+    :param repeat: number of timed rounds.
+    :param number: number of calls per round.
+    :param setup: called before each round. Not timed.
+    :return: min and median seconds per call.
+    """
+    per_call = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def filled_board(size: int, fill: float, seed: int = 0) -> Board:
+    """
+    Get board with a fraction of cells filled with random letters.
+    """
+    player = Player(position=(size // 2, size // 2))
+    board = Board(
+        player, size, load_special_tiles(), track_words=True, rng=random.Random(seed)
+    )
+    rng = np.random.default_rng(seed)
+    filled = rng.random(board.grid.shape) < fill
+    board.grid[filled] = rng.choice(
+        np.frombuffer(b"AEIOURSTLNCDG", dtype=np.uint8), filled.sum()
+    )
+    return board
+
+
+def bench_board(results: Dict[str, Any], repeat: int) -> None:
+    special_tiles = load_special_tiles()
+    for size in BOARD_SIZES:
+        number = max(1, 20_000 // (size * size))
+        board = filled_board(size, 0.0)
+        results[f"board.init[{size}]"] = measure(
+            board._init_board, repeat=repeat, number=number
+        )
+
+        for fill in FILL_LEVELS:
+            board = filled_board(size, fill)
+            results[f"board.find_words[{size},{fill}]"] = measure(
+                lambda: list(board.find_words()), repeat=repeat, number=number
+            )
+
+            def rescan_move():
+                x, y = board.player.position
+                board._mark_dirty(x, y)
+                list(board.find_new_words())
+
+            results[f"board.find_new_words[{size},{fill}]"] = measure(
+                rescan_move, repeat=repeat, number=number * 10
+            )
+
+            rng = random.Random(0)
+            place_board = filled_board(size, fill)
+            place_board.special_tiles_dist = special_tiles
+            results[f"board.place_piece[{size},{fill}]"] = measure(
+                lambda: place_board.place_piece(
+                    (rng.randrange(size), rng.randrange(size)), "E"
+                ),
+                repeat=repeat,
+                number=1000,
+                setup=lambda: place_board.replace_grid(filled_board(size, fill).grid),
+            )
+
+    for size in LARGE_BOARD_SIZES:
+        player = Player(position=(size // 2, size // 2))
+        board = Board(
+            player, size, special_tiles, track_words=True, rng=random.Random(0)
+        )
+        results[f"board.init[{size}]"] = measure(
+            board._init_board, repeat=repeat, number=10
+        )
+
+        # Place around player like a game does.
+        rng = random.Random(0)
+
+        def reset_large_board():
+            # Each round places the same tiles on a new board from the middle.
+            board.replace_grid(board._init_board())
+            board.player.position = (size // 2, size // 2)
+            rng.seed(0)
+
+        results[f"board.place_piece[{size}]"] = measure(
+            lambda: board.place_piece((rng.randint(-8, 8), rng.randint(-8, 8)), "E"),
+            repeat=repeat,
+            number=1000,
+            setup=reset_large_board,
+        )
+
+        def rescan_large_move():
+            x, y = board.player.position
+            board._mark_dirty(x, y)
+            list(board.find_new_words())
+
+        results[f"board.find_new_words[{size}]"] = measure(
+            rescan_large_move, repeat=repeat, number=1000
+        )
+
+
+def bench_game(results: Dict[str, Any], repeat: int) -> None:
+    dictionary = WordList(WORDS)
+    game = GameState(dictionary, seed=0)
+    words = ["CAT", "TRAIN", "XQZ", "STONE", "AT", "QQ"]
+
+    def get_scores():
+        for word in words:
+            game._get_score(word)
+
+    results["game.get_score[warm]"] = measure(get_scores, repeat=repeat, number=1000)
+
+    def get_scores_cold():
+        game.word_cache.invalidate()
+        get_scores()
+
+    results["game.get_score[cold]"] = measure(
+        get_scores_cold, repeat=repeat, number=1000
+    )
+
+    # Clicks and key presses are checked against the move table.
+    move = game.legal_moves()[0]
+    results["game.is_legal[move]"] = measure(
+        lambda: game.is_legal(move), repeat=repeat, number=10000
+    )
+
+    for path in ("normal", "ordered"):
+        games: List[GameState] = []
+
+        def new_game():
+            games.clear()
+            games.append(GameState(dictionary, seed=0))
+            if path == "ordered":
+                games[0].player.status.set("ordered", 10**6)
+
+        def exec_move():
+            game = games[0]
+            move = game.rng.choice(game.legal_moves())
+            game._exec_move(move.d_xy, game.current_char)
+
+        results[f"game.exec_move[{path}]"] = measure(
+            exec_move, repeat=repeat, number=80, setup=new_game
+        )
+
+
+def bench_render(results: Dict[str, Any], repeat: int) -> None:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from jumpbble.jumpbble import Jumpbble
+    from jumpbble.render import GlyphCache, GridLayout
+
+    pygame.font.init()
+    client = Jumpbble(dictionary=WordList(WORDS), seed=0)
+    # Score words inline so each move frame shows the highlights of its move.
+    client.game.word_validator = None
+    screen = pygame.Surface((client.WINDOW_X, client.WINDOW_Y))
+    layout = GridLayout(client.view_dim, client.block_width)
+    font = GlyphCache(pygame.font.Font(None, 25))
+
+    for fill in FILL_LEVELS:
+        client.game.board.replace_grid(filled_board(client.game.board_dim, fill).grid)
+
+        def full_frame():
+            game = client.game
+            possible_new_coords = game._get_poss_new_coords(game.n_spaces)
+            client._render_frame(
+                screen, layout, font, font, possible_new_coords, full=True
+            )
+
+        results[f"render.full_frame[{fill}]"] = measure(
+            full_frame, repeat=repeat, number=50
+        )
+
+        def move_frame():
+            game = client.game
+            move = game.rng.choice(game.legal_moves())
+            game._exec_move(move.d_xy, game.current_char)
+            if game.is_over:
+                game = client.game = GameState(game.dictionary, seed=0)
+            possible_new_coords = game._get_poss_new_coords(game.n_spaces)
+            client._render_frame(screen, layout, font, font, possible_new_coords)
+
+        results[f"render.move_frame[{fill}]"] = measure(
+            move_frame, repeat=repeat, number=50, setup=full_frame
+        )
+    client.close()
+
+
+def bench_dictionary(results: Dict[str, Any], repeat: int) -> None:
+    # Random words stand in for a real word list of about the same size.
+    rng = random.Random(0)
+    words = sorted(WORDS) + [
+        "".join(rng.choice("ABCDEILMNOPRSTU") for _ in range(rng.randint(2, 10)))
+        for _ in range(100000)
+    ]
+    probes = [rng.choice(words) for _ in range(500)] + [
+        "".join(rng.choice("ABCDEILMNOPRSTU") for _ in range(rng.randint(2, 8)))
+        for _ in range(500)
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "words.jbd")
+        compile_words(words, path)
+        for name, dictionary in (
+            ("word_list", WordList(words)),
+            ("compiled", CompiledDictionary(path)),
+        ):
+            results[f"dictionary.check[{name}]"] = measure(
+                lambda: [dictionary.check(word) for word in probes],
+                repeat=repeat,
+                number=10,
+            )
+            results[f"dictionary.has_prefix[{name}]"] = measure(
+                lambda: [dictionary.has_prefix(word[:3]) for word in probes],
+                repeat=repeat,
+                number=10,
+            )
+            results[f"dictionary.check_many[{name}]"] = measure(
+                lambda: dictionary.check_many(probes), repeat=repeat, number=10
+            )
+
+        def load_compiled():
+            CompiledDictionary(path).close()
+
+        results["dictionary.load[compiled]"] = measure(
+            load_compiled, repeat=repeat, number=10
+        )
+        results["dictionary.load[word_list]"] = measure(
+            lambda: WordList(words), repeat=repeat, number=1
+        )
+
+
+def bench_replay(results: Dict[str, Any], repeat: int) -> None:
+    dictionary = WordList(WORDS)
+    journals = []
+    for seed in range(20):
+        state = GameState(dictionary, seed=seed)
+        rng = random.Random(seed)
+        while not state.is_over:
+            state.step(SelectTile(rng.randrange(len(state.current_tiles))))
+            state.step(rng.choice(state.legal_moves()))
+        journals.append((state.journal, Summary.of(state)))
+    shared = GameState(dictionary, seed=0)
+    games = itertools.cycle(journals)
+
+    def verify_game(shared=None):
+        journal, summary = next(games)
+        verify(journal, summary, dictionary, shared=shared)
+
+    # Per game replayed.
+    results["replay.verify"] = measure(verify_game, repeat=repeat, number=len(journals))
+    results["replay.verify[shared]"] = measure(
+        lambda: verify_game(shared), repeat=repeat, number=len(journals)
+    )
+
+
+def bench_snapshot(results: Dict[str, Any], repeat: int) -> None:
+    dictionary = WordList(WORDS)
+    state = GameState(dictionary, seed=0)
+    rng = random.Random(0)
+    while not state.is_over:
+        for action in greedy_policy(state, rng):
+            state.step(action)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "jumpbble.sav")
+        results["snapshot.save"] = measure(
+            lambda: snapshot.save(state, path), repeat=repeat, number=100
+        )
+        # Compare with startup.new_game. Resuming should cost less than a new game.
+        loaded = GameState(dictionary, seed=0)
+        results["snapshot.load"] = measure(
+            lambda: snapshot.load(loaded, path), repeat=repeat, number=100
+        )
+
+
+def bench_startup(results: Dict[str, Any], repeat: int) -> None:
+    # Fresh interpreter each call so nothing is already imported. Run from the repo so the
+    # package is found wherever bench is run from.
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in ("jumpbble.engine", "jumpbble.selfplay", "jumpbble.jumpbble"):
+        command = [sys.executable, "-c", f"import {module}"]
+        results[f"startup.import[{module}]"] = measure(
+            lambda: subprocess.run(command, check=True, cwd=repo_dir),
+            repeat=repeat,
+            number=1,
+        )
+
+    dictionary = WordList(WORDS)
+    results["startup.new_game"] = measure(
+        lambda: GameState(dictionary, seed=0), repeat=repeat, number=100
+    )
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Find benchmarks slower than baseline.
+
+    :param threshold: allowed fraction slower than baseline median.
+    :return: messages of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if not (base := baseline.get(name)):
+            continue
+        ratio = result["median"] / base["median"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {base['median'] * 1e6:.1f} -> {result['median'] * 1e6:.1f} us "
+                f"({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Jumpbble.")
+    parser.add_argument("-o", "--output", default=None, help="Write results as JSON.")
+    parser.add_argument(
+        "-c", "--compare", default=None, help="Baseline JSON to compare against."
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fraction slower than baseline counted as a regression.",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed rounds.")
+    parser.add_argument(
+        "-k", "--filter", default="", help="Only run benchmarks starting with prefix."
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for group, bench in (
+        ("board", bench_board),
+        ("game", bench_game),
+        ("render", bench_render),
+        ("dictionary", bench_dictionary),
+        ("replay", bench_replay),
+        ("snapshot", bench_snapshot),
+        ("startup", bench_startup),
+    ):
+        if group.startswith(args.filter) or args.filter.startswith(group):
+            bench(results, args.repeat)
+    results = {
+        name: result for name, result in results.items() if name.startswith(args.filter)
+    }
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    for name, result in results.items():
+        print(f"{name:<40} {result['median'] * 1e6:>12.1f} us")
+
+    if args.output:
+        with open(args.output, "w") as json_stream:
+            json.dump(report, json_stream, indent=4)
+
+    if args.compare:
+        with open(args.compare) as json_stream:
+            baseline = json.load(json_stream)["results"]
+        if regressions := compare(results, baseline, args.threshold):
+            print("Regressions:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import time
+import argparse
+
+from jumpbble.dictionary import compile_words
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile a word list into a word graph for Jumpbble."
+    )
+    parser.add_argument("words", help="Word list with one word per line.")
+    parser.add_argument(
+        "-o", "--output", default="words.jbd", help="Compiled word graph to write."
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.words) as word_stream:
+        n_words = compile_words(word_stream, args.output)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Compiled {n_words} words into {args.output} "
+        f"({os.path.getsize(args.output) / 1024:.0f} KiB) in {elapsed:.2f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from typing import NamedTuple, Tuple, Union
+
+
+class SelectTile(NamedTuple):
+    """
+    Select tile at index of current tiles.
+    """
+
+    tile: int
+
+
+class SetWildcard(NamedTuple):
+    """
+    Replace selected tile with letter. Requires wildcard tile or effect.
+    """
+
+    letter: str
+
+
+class Move(NamedTuple):
+    """
+    Place selected tile at change in x and y from player position.
+    """
+
+    d_xy: Tuple[int, int]
+
+
+Action = Union[SelectTile, SetWildcard, Move]
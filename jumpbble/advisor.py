@@ -0,0 +1,352 @@
+import io
+import os
+import time
+import pickle
+import random
+import concurrent.futures
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .actions import Action
+from .bag import Bag
+from .cache import WordCache
+from .engine import GameState
+from .moves import MoveTable
+from .selfplay import POLICIES
+from .solver import Hint, Solver
+
+# Dictionary of each worker process. Set when the pool starts.
+_DICTIONARY = None
+# Word caches and move tables of each worker, shared by every state it unpickles.
+_SHARED: Dict[Tuple, Any] = {}
+# Last state unpickled by worker as (search id, state). Searches send the same state often.
+_STATE: Tuple[int, Optional[GameState]] = (-1, None)
+
+
+class MoveEstimate(NamedTuple):
+    """
+    Points a placement gains by the end of its rollouts.
+    """
+
+    hint: Hint
+    n_rollouts: int
+    mean: float
+    variance: float
+
+
+class _Tally:
+    """
+    Running mean and sum of squared differences, merged from batches of rollouts.
+    """
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, n: int, mean: float, m2: float) -> None:
+        # Parallel form of Welford's algorithm.
+        total = self.n + n
+        if total == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+
+class _StatePickler(pickle.Pickler):
+    """
+    Pickle a game without the parts workers have their own of.
+    """
+
+    def __init__(self, stream: io.BytesIO, state: GameState) -> None:
+        super().__init__(stream, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shared = {
+            id(state.dictionary): ("dictionary",),
+            id(state.word_cache): (
+                "word_cache",
+                tuple(state.word_cache.letter_scores.items()),
+            ),
+            id(state.moves): ("moves", state.moves.size),
+        }
+        # Rollouts score words synchronously and aren't recorded.
+        for unshared in (state.word_validator, state.recorder):
+            if unshared is not None:
+                self._shared[id(unshared)] = ("none",)
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple]:
+        return self._shared.get(id(obj))
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Tuple) -> Any:
+        kind = pid[0]
+        if kind == "dictionary":
+            return _DICTIONARY
+        if kind == "none":
+            return None
+        if (shared := _SHARED.get(pid)) is None:
+            if kind == "moves":
+                shared = MoveTable(pid[1])
+            else:
+                shared = WordCache(
+                    _DICTIONARY.check,
+                    dict(pid[1]),
+                    maxsize=GameState.WORD_CACHE_SIZE,
+                    check_many=getattr(_DICTIONARY, "check_many", None),
+                )
+            _SHARED[pid] = shared
+        return shared
+
+
+def _dumps_state(state: GameState) -> bytes:
+    stream = io.BytesIO()
+    _StatePickler(stream, state).dump(state)
+    return stream.getvalue()
+
+
+def _init_worker(dictionary: Any) -> None:
+    global _DICTIONARY
+    _DICTIONARY = dictionary
+
+
+def resample_hidden(state: GameState, rng: random.Random) -> None:
+    """
+    Replace what the player can't know with a random guess consistent with what they can.
+    The order of tiles left in the bag is shuffled and future effect rolls are reseeded.
+    """
+    tiles = list(state.bag)
+    rng.shuffle(tiles)
+    state.bag = Bag(tiles, state.letters)
+    # Board rolls effects with the game's random number generator.
+    state.rng.seed(rng.getrandbits(64))
+
+
+def rollout(
+    state: GameState,
+    actions: List[Action],
+    rng: random.Random,
+    horizon: int,
+    policy_name: str = "random",
+) -> int:
+    """
+    Play a placement then a number of moves of a policy on a copy of a game.
+
+    :param actions: actions of placement.
+    :param horizon: number of moves after placement.
+    :return: points gained.
+    """
+    state = state.copy()
+    resample_hidden(state, rng)
+    start = state.score
+    for action in actions:
+        state.step(action)
+    policy = POLICIES[policy_name]
+    for _ in range(horizon):
+        if state.is_over:
+            break
+        for action in policy(state, rng):
+            state.step(action)
+    return state.score - start
+
+
+def _run_rollouts(
+    search_id: int,
+    state_bytes: bytes,
+    actions: List[Action],
+    n_rollouts: int,
+    seed: int,
+    horizon: int,
+    policy_name: str,
+) -> Tuple[int, float, float]:
+    global _STATE
+    if _STATE[0] != search_id:
+        _STATE = (search_id, _StateUnpickler(io.BytesIO(state_bytes)).load())
+    state = _STATE[1]
+    rng = random.Random(seed)
+    tally = _Tally()
+    for _ in range(n_rollouts):
+        tally.merge(1, rollout(state, actions, rng, horizon, policy_name), 0.0)
+    return tally.n, tally.mean, tally.m2
+
+
+class Advisor:
+    """
+    Estimate the points of the best placements by playing randomized rollouts of each.
+
+    Rollouts are spread over a process pool and merged as they finish, so results can be
+    read at any time without waiting. A search stops starting rollouts once its time budget
+    is spent.
+    """
+
+    def __init__(
+        self,
+        dictionary: Any,
+        *,
+        processes: Optional[int] = None,
+        n_candidates: int = 8,
+        horizon: int = 6,
+        batch_size: int = 4,
+        policy_name: str = "random",
+    ) -> None:
+        """
+        :param dictionary: word checker of workers. Must be picklable.
+        :param processes: number of worker processes. Defaults to number of CPUs.
+        :param n_candidates: number of placements with the most immediate points estimated.
+        :param horizon: number of random moves played after each placement.
+        :param batch_size: rollouts per task sent to a worker.
+        :param policy_name: policy of moves after placement. See selfplay.POLICIES.
+        """
+        if policy_name not in POLICIES:
+            raise ValueError(f"Not a valid policy: {policy_name}")
+        if n_candidates < 1 or batch_size < 1 or horizon < 0:
+            raise ValueError(
+                f"Not a valid search: {n_candidates} candidates, batches of {batch_size}, "
+                f"horizon of {horizon}"
+            )
+        self.dictionary = dictionary
+        self.processes = processes or os.cpu_count() or 1
+        self.n_candidates = n_candidates
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.policy_name = policy_name
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._rng = random.Random()
+        self._search_id = 0
+        self._state_bytes = b""
+        self._deadline = 0.0
+        self._hints: List[Hint] = []
+        self._actions: List[List[Action]] = []
+        self._tallies: List[_Tally] = []
+        # Candidate of each rollout task in flight.
+        self._running: Dict[concurrent.futures.Future, int] = {}
+
+    @property
+    def pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        # Started on first search so creating an advisor is free.
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                self.processes, initializer=_init_worker, initargs=(self.dictionary,)
+            )
+        return self._pool
+
+    @property
+    def searching(self) -> bool:
+        return bool(self._running)
+
+    def start(
+        self, state: GameState, budget: float, seed: Optional[int] = None
+    ) -> None:
+        """
+        Start searching placements of a game. Replaces any search running.
+
+        :param state: game to advise. Not changed.
+        :param budget: seconds to start rollouts for.
+        :param seed: seed of rollouts. Random if not given.
+        """
+        self.cancel()
+        self._search_id += 1
+        self._rng.seed(seed)
+        self._deadline = time.monotonic() + budget
+        self._hints = Solver(state).best(self.n_candidates)
+        self._actions = [hint.actions(state) for hint in self._hints]
+        self._tallies = [_Tally() for _ in self._hints]
+        if not self._hints:
+            return
+        self._state_bytes = _dumps_state(state)
+        self._submit()
+
+    def _submit(self) -> None:
+        # Keep every worker busy with a task queued behind it.
+        n_tasks = 2 * self.processes
+        while len(self._running) < n_tasks and time.monotonic() < self._deadline:
+            # Candidate with fewest rollouts so far so estimates improve evenly.
+            in_flight = [0] * len(self._hints)
+            for candidate in self._running.values():
+                in_flight[candidate] += 1
+            candidate = min(
+                range(len(self._hints)),
+                key=lambda i: self._tallies[i].n + in_flight[i] * self.batch_size,
+            )
+            future = self.pool.submit(
+                _run_rollouts,
+                self._search_id,
+                self._state_bytes,
+                self._actions[candidate],
+                self.batch_size,
+                self._rng.getrandbits(64),
+                self.horizon,
+                self.policy_name,
+            )
+            self._running[future] = candidate
+
+    def poll(self) -> List[MoveEstimate]:
+        """
+        Merge finished rollouts and start more if the budget allows. Never waits.
+
+        :return: estimate of each placement, best mean first.
+        """
+        for future in [future for future in self._running if future.done()]:
+            candidate = self._running.pop(future)
+            if not future.cancelled():
+                self._tallies[candidate].merge(*future.result())
+        if time.monotonic() >= self._deadline:
+            # Rollouts started before the deadline are still used if they finish.
+            self._deadline = 0.0
+        else:
+            self._submit()
+        return self.estimates()
+
+    def estimates(self) -> List[MoveEstimate]:
+        estimates = [
+            MoveEstimate(hint, tally.n, tally.mean, tally.variance)
+            for hint, tally in zip(self._hints, self._tallies)
+        ]
+        # Immediate points until a placement has rollouts.
+        return sorted(
+            estimates,
+            key=lambda estimate: estimate.mean
+            if estimate.n_rollouts
+            else estimate.hint.points,
+            reverse=True,
+        )
+
+    def advise(
+        self, state: GameState, budget: float, seed: Optional[int] = None
+    ) -> List[MoveEstimate]:
+        """
+        Search placements of a game until the budget is spent.
+
+        :return: estimate of each placement, best mean first.
+        """
+        self.start(state, budget, seed)
+        while self.searching:
+            timeout = max(self._deadline - time.monotonic(), 0.0)
+            concurrent.futures.wait(
+                self._running,
+                timeout=timeout or None,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            self.poll()
+        return self.estimates()
+
+    def cancel(self) -> None:
+        """
+        Stop the search. Rollouts already running are left to finish and ignored.
+        """
+        for future in self._running:
+            future.cancel()
+        self._running.clear()
+        self._deadline = 0.0
+
+    def close(self) -> None:
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
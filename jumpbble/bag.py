@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Sequence
+
+
+class Bag:
+    """
+    Tiles in a fixed draw order, also indexed by letter.
+
+    Drawing the next tile, removing the first of a letter, membership and finding the next
+    letter left in alphabet order are all O(1) amortized.
+    """
+
+    def __init__(
+        self,
+        tiles: Sequence[str],
+        alphabet: Sequence[str],
+        taken: Optional[bytes] = None,
+    ) -> None:
+        """
+        :param tiles: tiles in draw order. ex. from random.sample of all tiles.
+        :param alphabet: all letters in order used by next_available. Wraps around.
+        :param taken: flag of each tile already taken. Used to restore a bag.
+        """
+        self.order: List[str] = list(tiles)
+        self.taken = bytearray(taken or len(self.order))
+        self.alphabet: List[str] = list(alphabet)
+        self.letter_idx: Dict[str, int] = {
+            letter: i for i, letter in enumerate(self.alphabet)
+        }
+        # Positions in draw order of each letter not taken yet. Earliest first.
+        self.positions: Dict[str, Deque[int]] = {
+            letter: deque() for letter in self.alphabet
+        }
+        for pos, letter in enumerate(self.order):
+            if not self.taken[pos]:
+                self.positions[letter].append(pos)
+        # Successor table. Points to itself if letter left, otherwise towards the next letter.
+        self._succ = [
+            i if self.positions[letter] else (i + 1) % len(self.alphabet)
+            for i, letter in enumerate(self.alphabet)
+        ]
+        self._head = 0
+        self._n_left = len(self.order) - sum(self.taken)
+
+    def __len__(self) -> int:
+        return self._n_left
+
+    def __contains__(self, letter: str) -> bool:
+        return bool(self.positions.get(letter))
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over tiles left in draw order.
+        """
+        for pos in range(self._head, len(self.order)):
+            if not self.taken[pos]:
+                yield self.order[pos]
+
+    def count(self, letter: str) -> int:
+        positions = self.positions.get(letter)
+        return len(positions) if positions else 0
+
+    def _take(self, letter: str) -> str:
+        pos = self.positions[letter].popleft()
+        self.taken[pos] = 1
+        self._n_left -= 1
+        if not self.positions[letter]:
+            idx = self.letter_idx[letter]
+            self._succ[idx] = (idx + 1) % len(self.alphabet)
+        return letter
+
+    def draw(self) -> str:
+        """
+        Take the next tile in draw order.
+        """
+        if not self._n_left:
+            raise IndexError("Draw from an empty bag")
+        # Skip tiles already taken out of order.
+        while self.taken[self._head]:
+            self._head += 1
+        # Next tile is always the earliest position of its letter.
+        return self._take(self.order[self._head])
+
+    def remove(self, letter: str) -> None:
+        """
+        Take the first tile of a letter in draw order.
+        """
+        if letter not in self:
+            raise ValueError(f"Letter not in bag: {letter}")
+        self._take(letter)
+
+    def _find(self, idx: int) -> int:
+        root = idx
+        while self._succ[root] != root:
+            root = self._succ[root]
+        # Path compression. Letters never return to bag so skipped letters stay skipped.
+        while self._succ[idx] != root:
+            self._succ[idx], idx = root, self._succ[idx]
+        return root
+
+    def next_available(self, letter: str) -> str:
+        """
+        Get first letter after a letter in alphabet order that is left in bag.
+
+        :param letter: letter to start after. Is returned if it's the only letter left.
+        """
+        if not self._n_left:
+            raise IndexError("No letters left in bag")
+        idx = (self.letter_idx[letter] + 1) % len(self.alphabet)
+        return self.alphabet[self._find(idx)]
@@ -1,52 +1,145 @@
+import zlib
 import random
+from collections import Counter
 import numpy as np
-from typing import Dict, Iterator, Tuple, List
+from typing import Dict, Iterator, Tuple, List, Optional, Sequence, Set, Union
 
+from .config import EffectTable
+from .grid import ChunkedGrid
 from .player import Player
 
 
+Run = Tuple[str, List[Tuple[int, int]]]
+
+
 class Board:
+    # Letters are stored as their ASCII code. Everything else is a sentinel code.
     EMPTY_CHAR = ""
-    STARTING_POS_CHAR = b"@"
-    SPECIAL_TILE_CHAR = b"?"
-    DEFAULT_CHARS = (EMPTY_CHAR, STARTING_POS_CHAR, SPECIAL_TILE_CHAR)
+    STARTING_POS_CHAR = "@"
+    SPECIAL_TILE_CHAR = "?"
+    EMPTY_CODE = 0
+    STARTING_POS_CODE = ord(STARTING_POS_CHAR)
+    SPECIAL_TILE_CODE = ord(SPECIAL_TILE_CHAR)
+    DEFAULT_CODES = (EMPTY_CODE, STARTING_POS_CODE, SPECIAL_TILE_CODE)
+    # If each code is a letter. Indexing is much faster than np.isin on small lines.
+    IS_LETTER = np.ones(256, dtype=bool)
+    IS_LETTER[list(DEFAULT_CODES)] = False
     SPECIAL_TILES_PERC = 0.10
+    # Boards with more cells per side are stored in chunks created when first accessed.
+    MAX_DENSE_SIZE = 256
 
     def __init__(
-        self, player: Player, size: int, special_tiles_dist: Dict[str, float]
+        self,
+        player: Player,
+        size: int,
+        special_tiles_dist: Dict[str, float],
+        *,
+        track_words: bool = False,
+        rng: Optional[random.Random] = None,
+        chunked: Optional[bool] = None,
     ) -> None:
+        """
+        :param chunked: store grid in chunks. Defaults to if size is over MAX_DENSE_SIZE.
+        """
         self.player = player
+        self.rng = rng or random.Random()
         self.size = size
         self.special_tiles_dist = special_tiles_dist
-        self.grid = self._init_board()
+        self.chunked = size > self.MAX_DENSE_SIZE if chunked is None else chunked
+        self.grid: Union[np.ndarray, ChunkedGrid] = self._init_board()
+
+        # Word tracking. Only runs through cells changed by place_piece are rescanned.
+        self.track_words = track_words
+        self._dirty_cells: Set[Tuple[int, int]] = set()
+        self._rescan_all = False
+        # Number of times each effect was rolled.
+        self.effects_triggered = Counter()
+        # Records effects rolled if set. See GameState.set_recorder.
+        self.recorder = None
+
+    @classmethod
+    def encode(cls, char: str) -> int:
+        """
+        Convert a character to its grid code.
+        """
+        if char == cls.EMPTY_CHAR:
+            return cls.EMPTY_CODE
+        code = ord(char)
+        if code > 127:
+            raise ValueError(f"Not a valid board character: {char}")
+        return code
 
-    def _init_board(self):
-        # Allow characters of up to 1-len
-        board = np.chararray((self.size, self.size), itemsize=1)
-        board[:] = ""
+    @classmethod
+    def decode(cls, code: int) -> str:
+        """
+        Convert a grid code to its character.
+        """
+        return cls.EMPTY_CHAR if code == cls.EMPTY_CODE else chr(code)
 
-        n_special_tiles = int(self.size * self.size * self.SPECIAL_TILES_PERC)
+    def char_at(self, x: int, y: int) -> str:
+        return self.decode(self.grid[x, y])
 
-        # Don't allow center tile.
-        all_coords = list(np.ndindex(board.shape))
-        all_coords.remove(self.player.position)
+    def _init_board(self) -> Union[np.ndarray, ChunkedGrid]:
+        if self.chunked:
+            # Special tiles of each chunk are rolled when the chunk is first accessed.
+            self.chunk_seed = self.rng.getrandbits(64)
+            grid = ChunkedGrid(self.size, self._fill_chunk)
+            grid[self.player.position] = self.STARTING_POS_CODE
+            return grid
 
-        special_tiles = random.sample(all_coords, n_special_tiles)
+        board = np.zeros((self.size, self.size), dtype=np.uint8)
 
-        for sample_tile in special_tiles:
-            x, y = sample_tile
-            board[x, y] = self.SPECIAL_TILE_CHAR
+        n_cells = self.size * self.size
+        n_special_tiles = int(n_cells * self.SPECIAL_TILES_PERC)
 
-        board[self.player.position] = self.STARTING_POS_CHAR
+        # Don't allow center tile. Sample from all other cells and shift past it.
+        start_idx = np.ravel_multi_index(self.player.position, board.shape)
+        special_tiles = np.array(
+            self.rng.sample(range(n_cells - 1), n_special_tiles), dtype=np.intp
+        )
+        special_tiles[special_tiles >= start_idx] += 1
+
+        board.flat[special_tiles] = self.SPECIAL_TILE_CODE
+        board[self.player.position] = self.STARTING_POS_CODE
         return board
 
-    def _roll_effect(self) -> str:
-        rolled_effect = random.choices(
-            population=list(self.special_tiles_dist.keys()),
-            weights=list(self.special_tiles_dist.values()),
-            k=1,
+    def _fill_chunk(self, cx: int, cy: int, shape: Tuple[int, int]) -> np.ndarray:
+        rng = np.random.default_rng([self.chunk_seed, cx, cy])
+        is_special = rng.random(shape) < self.SPECIAL_TILES_PERC
+        return np.where(is_special, self.SPECIAL_TILE_CODE, self.EMPTY_CODE).astype(
+            np.uint8
         )
-        return rolled_effect[0]
+
+    def window(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Get codes of every combination of x and y. ex. the cells in view.
+
+        :return: codes with shape (len(xs), len(ys)).
+        """
+        if self.chunked:
+            return self.grid.window(xs, ys)
+        return self.grid[np.ix_(xs, ys)]
+
+    def crc32(self) -> int:
+        """
+        Get checksum of grid. Chunks of a chunked grid that were never changed are skipped.
+        """
+        if self.chunked:
+            return self.grid.crc32()
+        return zlib.crc32(np.ascontiguousarray(self.grid).tobytes())
+
+    @property
+    def special_tiles_dist(self) -> Dict[str, float]:
+        return self._special_tiles_dist
+
+    @special_tiles_dist.setter
+    def special_tiles_dist(self, special_tiles_dist: Dict[str, float]) -> None:
+        self._special_tiles_dist = special_tiles_dist
+        # Cumulative weights are only built when the distribution changes.
+        self._effects = EffectTable.of(special_tiles_dist)
+
+    def _roll_effect(self) -> str:
+        return self._effects.roll(self.rng)
 
     def calc_coords(self, x: int, y: int, dx: int, dy: int) -> Tuple[int, int]:
         # Add change in x and y but loop across board if over board dim size.
@@ -54,53 +147,211 @@ class Board:
         new_y = (y + dy) % self.size
         return (new_x, new_y)
 
-    def find_words(self) -> Iterator[Tuple[str, List[Tuple[int, int]]]]:
+    def wrap_offset(self, dx: int, dy: int) -> Tuple[int, int]:
+        """
+        Get the shortest change in x and y that lands on the same cell as a change.
+        Each is between -size // 2 and size // 2.
+        """
+        half = self.size // 2
+        return ((dx + half) % self.size - half, (dy + half) % self.size - half)
+
+    def letter_mask(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Get mask of cells with letters. Any sentinel code ends a word.
+        """
+        return self.IS_LETTER[codes]
+
+    def _scan_lines(self, axis: int, axis_idxs: np.ndarray) -> List[Run]:
+        """
+        Find all runs of letters in multiple rows/cols at once.
+
+        :param axis: 0 for rows at axis_idxs, 1 for cols at axis_idxs.
+        :param axis_idxs: sorted indices of rows/cols on grid.
+        :return: list of words and their letter positions ordered by row/col.
+        """
+        # Get rows or cols based on if x or y. Each line is a row of lines.
+        if self.chunked:
+            # Chunks not created yet can't have letters.
+            lines = self.grid.lines(axis, axis_idxs)
+        else:
+            lines = self.grid[axis_idxs, :] if axis == 0 else self.grid[:, axis_idxs].T
+        mask = self.letter_mask(lines)
+
+        # Skip any row/col with only default characters.
+        has_letters = mask.any(axis=1)
+        if not has_letters.any():
+            return []
+        lines, mask, axis_idxs = (
+            lines[has_letters],
+            mask[has_letters],
+            axis_idxs[has_letters],
+        )
+
+        # Pad with a non-letter on both ends so runs touching the edge have boundaries.
+        # Then +1 marks the start of a run and -1 the position after its end.
+        padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        bounds = np.diff(padded, axis=1)
+        line_nums, starts = np.nonzero(bounds == 1)
+        _, ends = np.nonzero(bounds == -1)
+
+        # Only words of more than one character.
+        is_word = (ends - starts) > 1
+
+        words = []
+        for line_num, start, end in zip(
+            line_nums[is_word], starts[is_word], ends[is_word]
+        ):
+            word = lines[line_num, start:end].tobytes().decode()
+            axis_idx = int(axis_idxs[line_num])
+            # Store all letter positions. Since all on same row/col, x/y should be all same value.
+            word_pos = [
+                (axis_idx, n) if axis == 0 else (n, axis_idx) for n in range(start, end)
+            ]
+            words.append((word, word_pos))
+        return words
+
+    def _scan_line(self, axis: int, axis_idx: int) -> List[Run]:
+        return self._scan_lines(axis, np.array([axis_idx], dtype=np.intp))
+
+    def run_through(self, x: int, y: int, axis: int) -> Optional[Run]:
+        """
+        Get the run of letters through a position along a row/col.
+
+        :param axis: 0 for row at x, 1 for col at y.
+        :return: word and its letter positions or None if not more than one character.
+        """
+        grid = self.grid
+        is_letter = self.IS_LETTER
+
+        # Walk cell by cell so only cells next to the run are read.
+        def code(n: int) -> int:
+            return grid[x, n] if axis == 0 else grid[n, y]
+
+        idx = y if axis == 0 else x
+        if not is_letter[code(idx)]:
+            return None
+
+        start, end = idx, idx + 1
+        while start > 0 and is_letter[code(start - 1)]:
+            start -= 1
+        while end < self.size and is_letter[code(end)]:
+            end += 1
+        if end - start < 2:
+            return None
+
+        word = bytes(code(n) for n in range(start, end)).decode()
+        word_pos = [(x, n) if axis == 0 else (n, y) for n in range(start, end)]
+        return (word, word_pos)
+
+    def words_if_placed(self, cells: Sequence[Tuple[int, int]], char: str) -> Set[str]:
+        """
+        Get runs through cells if a letter were placed on each of them. ex. to score a move
+        before making it. The grid isn't changed, so chunks aren't marked modified.
+
+        :return: runs of more than one character along each axis.
+        """
+        grid = self.grid
+        is_letter = self.IS_LETTER
+        placed = dict.fromkeys(cells, self.encode(char))
+        words = set()
+        for x, y in placed:
+            for axis in (0, 1):
+
+                def code(n: int) -> int:
+                    cell = (x, n) if axis == 0 else (n, y)
+                    placed_code = placed.get(cell)
+                    return grid[cell] if placed_code is None else placed_code
+
+                idx = y if axis == 0 else x
+                start, end = idx, idx + 1
+                while start > 0 and is_letter[code(start - 1)]:
+                    start -= 1
+                while end < self.size and is_letter[code(end)]:
+                    end += 1
+                if end - start > 1:
+                    words.add(bytes(code(n) for n in range(start, end)).decode())
+        return words
+
+    def letters_around(self, x: int, y: int, axis: int) -> Tuple[str, str]:
+        """
+        Get the letters before and after a position along a row/col, up to the first gap.
+        The position itself is left out, so it's the run a letter placed there would join.
+
+        :param axis: 0 for row at x, 1 for col at y.
+        """
+        grid = self.grid
+        is_letter = self.IS_LETTER
+
+        def code(n: int) -> int:
+            return grid[x, n] if axis == 0 else grid[n, y]
+
+        idx = y if axis == 0 else x
+        start, end = idx, idx + 1
+        while start > 0 and is_letter[code(start - 1)]:
+            start -= 1
+        while end < self.size and is_letter[code(end)]:
+            end += 1
+        before = bytes(code(n) for n in range(start, idx)).decode()
+        after = bytes(code(n) for n in range(idx + 1, end)).decode()
+        return before, after
+
+    def find_words(self) -> Iterator[Run]:
         # For each axis on grid.
         for i in range(0, 2):
-            # For each row/col on grid.
-            for axis_idx in range(self.grid.shape[i]):
-                # Get row or col based on if x or y.
-                axis_vals = self.grid[axis_idx, :] if i == 0 else self.grid[:, axis_idx]
-                # And find any unique characters.
-                unique_chars = np.unique(axis_vals)
-
-                # Skip any row/col with only default characters.
-                if all(char in self.DEFAULT_CHARS for char in unique_chars):
+            if self.chunked:
+                axis_idxs = self.grid.active_lines(i)
+            else:
+                axis_idxs = np.arange(self.size, dtype=np.intp)
+            yield from self._scan_lines(i, axis_idxs)
+
+    def find_new_words(self) -> Iterator[Run]:
+        """
+        Rescan only runs through cells changed since the last call. Requires word tracking.
+        Cost depends on the length of the runs, not the size of the board.
+
+        :return: words through the changed cells and their letter positions.
+        """
+        dirty_cells = self._dirty_cells
+        self._dirty_cells = set()
+        if self._rescan_all:
+            self._rescan_all = False
+            yield from self.find_words()
+            return
+
+        # Changed cells in the same run give the same run.
+        seen = set()
+        for x, y in sorted(dirty_cells):
+            for axis in range(0, 2):
+                if (run := self.run_through(x, y, axis)) is None:
                     continue
+                if (axis, run[1][0]) not in seen:
+                    seen.add((axis, run[1][0]))
+                    yield run
+
+    def replace_grid(
+        self, grid: Union[np.ndarray, ChunkedGrid], *, rescan: bool = True
+    ) -> None:
+        """
+        Replace the whole grid. Every row/col is rescanned on the next find_new_words.
+
+        :param rescan: if False, only cells changed after this are rescanned. For when the
+            words on the new grid are already known, ex. restored from a snapshot.
+        """
+        self.grid = grid
+        self._dirty_cells = set()
+        self._rescan_all = self.track_words and rescan
 
-                words = []
-                word_chars = {}
-                for n_char, char in enumerate(axis_vals):
-                    # On empty space. Stop appending characters to word.
-                    if char in ["", b'?']:
-                        word_len = len(word_chars)
-                        # If word is not one character, add.
-                        if word_len > 1:
-                            # Since all on same row/col, x/y should be all same value.
-                            axis_vals = [axis_idx] * word_len
-                            word = "".join(word_chars.values())
-                            # Store all letter positions.
-                            word_pos = (
-                                zip(axis_vals, word_chars.keys())
-                                if i == 0
-                                else zip(word_chars.keys(), axis_vals)
-                            )
-                            words.append((word, list(word_pos)))
-                        # Reset word char list
-                        word_chars.clear()
-                        continue
-                    if char not in self.DEFAULT_CHARS:
-                        # Append index and character.
-                        word_chars[n_char] = char.decode()
-
-                yield from words
+    def _mark_dirty(self, x: int, y: int) -> None:
+        if self.track_words:
+            self._dirty_cells.add((x, y))
 
     def place_piece(
         self,
         coord_change: Tuple[int, int],
         char: str,
         *,
-        update_player_pos: bool = True
+        update_player_pos: bool = True,
     ):
         dx, dy = coord_change
         current_x, current_y = self.player.position
@@ -109,19 +360,26 @@ class Board:
         new_x, new_y = self.calc_coords(current_x, current_y, dx, dy)
 
         landed_on_tile = self.grid[new_x, new_y]
+        char_code = self.encode(char)
 
-        if landed_on_tile == self.SPECIAL_TILE_CHAR:
+        if landed_on_tile == self.SPECIAL_TILE_CODE:
             # Roll effect
             effect = self._roll_effect()
+            self.effects_triggered[effect] += 1
+            if self.recorder is not None:
+                self.recorder.effect(effect)
 
             # Apply effect and decay rate based on status
-            self.player.status.get(effect) + self.player.status_decay
+            self.player.status.add(effect, self.player.status_decay)
 
             # Erase special tile
-            self.grid[new_x, new_y] = char
+            self.grid[new_x, new_y] = char_code
+            self._mark_dirty(new_x, new_y)
 
-        if landed_on_tile == "" or self.player.status.get("erase").turns != 0:
-            self.grid[new_x, new_y] = char
+        is_erasing = self.player.is_affected("erase")
+        if landed_on_tile == self.EMPTY_CODE or is_erasing:
+            self.grid[new_x, new_y] = char_code
+            self._mark_dirty(new_x, new_y)
 
         if update_player_pos:
             self.player.position = (new_x, new_y)
@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from .profiler import PROFILER
+
+
+class WordCache:
+    """
+    Bounded least-recently-used cache of word scores.
+
+    Both valid and invalid words are stored. Invalid words are stored with a score of 0.
+    Only the word checker may be called from another thread. Everything else is for the
+    thread that owns the game.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[str], bool],
+        letter_scores: Dict[str, int],
+        maxsize: int = 4096,
+        check_many: Optional[Callable[[List[str]], List[bool]]] = None,
+    ) -> None:
+        """
+        :param check: word checker.
+        :param letter_scores: points of each letter.
+        :param maxsize: most words kept.
+        :param check_many: checker of a batch of words. Defaults to calling check on each.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be at least 1: {maxsize}")
+        self.check = check
+        self.check_many = check_many
+        self.letter_scores = letter_scores
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        # Word checkers aren't assumed to be thread safe.
+        self._check_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._scores
+
+    def get(self, word: str) -> Optional[int]:
+        """
+        Get score of a word if cached. Never calls the word checker.
+        """
+        try:
+            word_score = self._scores[word]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(word)
+        return word_score
+
+    def is_word(self, word: str) -> bool:
+        """
+        Call the word checker. Safe to call from a worker thread.
+        """
+        with self._check_lock:
+            return self.check(word)
+
+    def are_words(self, words: List[str]) -> List[bool]:
+        """
+        Call the word checker on a batch of words. Safe to call from a worker thread.
+        """
+        with self._check_lock:
+            if self.check_many is not None:
+                return self.check_many(words)
+            return [self.check(word) for word in words]
+
+    def add(self, word: str, is_word: bool) -> int:
+        """
+        Cache result of the word checker.
+
+        :return: score of word.
+        """
+        if is_word:
+            word_score = sum(self.letter_scores[letter.upper()] for letter in word)
+        else:
+            word_score = 0
+
+        self._scores[word] = word_score
+        # Evict least recently used word.
+        if len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+        return word_score
+
+    def score(self, word: str) -> int:
+        """
+        Get score of a word. Only calls the word checker on a cache miss.
+
+        :param word: word to score.
+        :return: sum of letter scores if word valid, otherwise 0.
+        """
+        if (word_score := self.get(word)) is not None:
+            return word_score
+
+        PROFILER.count("lookups")
+        with PROFILER.timer("dictionary"):
+            is_word = self.is_word(word)
+        return self.add(word, is_word)
+
+    def prefetch(self, words: List[str]) -> None:
+        """
+        Check every word not cached in one batch. Later scores of them are cache hits.
+        """
+        unchecked = list(
+            dict.fromkeys(word for word in words if word not in self._scores)
+        )
+        if not unchecked:
+            return
+        PROFILER.count("lookups", len(unchecked))
+        with PROFILER.timer("dictionary"):
+            is_words = self.are_words(unchecked)
+        for word, is_word in zip(unchecked, is_words):
+            self.add(word, is_word)
+
+    def invalidate(self, word: Optional[str] = None) -> None:
+        """
+        Remove a word from the cache. Clears the whole cache if no word given.
+        """
+        if word is None:
+            self._scores.clear()
+        else:
+            self._scores.pop(word, None)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
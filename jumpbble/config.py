@@ -0,0 +1,157 @@
+import sys
+import json
+import math
+import pathlib
+import traceback
+from bisect import bisect
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, NamedTuple, Tuple
+
+from .player import STATUS_IDX
+
+CFG_DIR = pathlib.Path(__file__).parents[1].joinpath("config")
+# Codes used by the board for empty, special and start cells.
+RESERVED_CHARS = ("\0", "?", "@")
+
+
+class EffectTable(NamedTuple):
+    """
+    Effects of special tiles with cumulative weights so a roll is one bisect.
+    """
+
+    effects: Tuple[str, ...]
+    cum_weights: Tuple[float, ...]
+
+    @classmethod
+    def of(cls, special_tiles_dist: Dict[str, float]) -> "EffectTable":
+        """
+        :param special_tiles_dist: probability of each effect. Doesn't need to sum to 1.
+        :raises ValueError: if an effect isn't a status or the probabilities aren't valid.
+        """
+        if not special_tiles_dist:
+            raise ValueError("No special tile effects")
+        for effect, probability in special_tiles_dist.items():
+            if effect not in STATUS_IDX:
+                raise ValueError(f"Not a valid status effect: {effect}")
+            if not isinstance(probability, (int, float)) or not probability >= 0:
+                raise ValueError(f"Not a valid probability of {effect}: {probability}")
+        cum_weights = tuple(accumulate(float(p) for p in special_tiles_dist.values()))
+        if not 0 < cum_weights[-1] < math.inf:
+            raise ValueError(
+                f"Probabilities must have a finite total: {cum_weights[-1]}"
+            )
+        return cls(tuple(special_tiles_dist), cum_weights)
+
+    def roll(self, rng) -> str:
+        """
+        Roll an effect. Takes the same draw as rng.choices so seeded games don't change.
+
+        :param rng: random.Random of game.
+        """
+        idx = bisect(
+            self.cum_weights,
+            rng.random() * self.cum_weights[-1],
+            0,
+            len(self.effects) - 1,
+        )
+        return self.effects[idx]
+
+
+class Config(NamedTuple):
+    """
+    Validated letters and special tiles with everything derived from them. Shared, so
+    don't modify.
+    """
+
+    letters: Dict[str, Dict[str, int]]
+    letter_scores: Dict[str, int]
+    # Every tile in bag in config order.
+    tiles: Tuple[str, ...]
+    special_tiles_dist: Dict[str, float]
+    effects: EffectTable
+
+    def letter_spaces(self, board_dim: int) -> Dict[str, int]:
+        """
+        Assign letter spaces to letters. If letter is wildcard or a multiple of the length of
+        board, give 0. This is for balance as would always land on same position otherwise.
+        """
+        return {
+            letter: (0 if letter == "*" or i % board_dim == 0 else i)
+            for i, letter in enumerate(self.letters, 1)
+        }
+
+
+def compile_config(
+    letters: Dict[str, Dict[str, int]], special_tiles_dist: Dict[str, float]
+) -> Config:
+    """
+    Validate config and build lookup tables.
+
+    :param letters: letters with number and point value.
+    :param special_tiles_dist: probability of each effect.
+    :raises ValueError: if config isn't valid.
+    """
+    if not letters:
+        raise ValueError("No letters")
+    for letter, mdata in letters.items():
+        if len(letter) != 1 or ord(letter) > 127 or letter in RESERVED_CHARS:
+            raise ValueError(f"Not a valid letter: {letter!r}")
+        for key in ("Number", "Score"):
+            value = mdata.get(key)
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(f"Not a valid {key} of {letter}: {value}")
+    tiles = tuple(
+        letter for letter, mdata in letters.items() for _ in range(mdata["Number"])
+    )
+    if not tiles:
+        raise ValueError("No tiles in bag")
+
+    return Config(
+        letters,
+        {letter: mdata["Score"] for letter, mdata in letters.items()},
+        tiles,
+        special_tiles_dist,
+        EffectTable.of(special_tiles_dist),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_config(cfg_dir: pathlib.Path = CFG_DIR) -> Config:
+    """
+    Load and compile config. Only read once per process.
+
+    :raises OSError: if config can't be read.
+    :raises ValueError: if config isn't valid.
+    """
+    with open(cfg_dir.joinpath("letters.json")) as json_stream:
+        letters = json.load(json_stream)
+    with open(cfg_dir.joinpath("special_tiles.json")) as json_stream:
+        special_tiles_dist = json.load(json_stream)
+    return compile_config(letters, special_tiles_dist)
+
+
+def load_special_tiles() -> Dict[str, float]:
+    """
+    Load special tiles.
+
+    :return: special tiles dictionary where key is effect and value is percent probability.
+    """
+    try:
+        return dict(load_config().special_tiles_dist)
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
+
+
+def load_letters() -> Dict[str, Dict[str, int]]:
+    """
+    Load letters with number and point value.
+
+    :return: all letters and their movement values and score
+    """
+    try:
+        return {letter: dict(mdata) for letter, mdata in load_config().letters.items()}
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,369 @@
+import os
+import abc
+import sys
+import mmap
+import struct
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Header of a compiled word graph: magic, version, number of nodes, edges and words.
+MAGIC = b"JBDG"
+VERSION = 1
+_HEADER = struct.Struct("<4sHxxIII")
+# Batches smaller than this are checked one word at a time, which is faster until the
+# batch is large enough to cover the cost of the array setup.
+_MIN_VECTOR_BATCH = 1 << 14
+
+
+class Dictionary(abc.ABC):
+    """
+    Word checker used by the game. Words are compared ignoring case.
+
+    Subclasses implement check and, if they can tell, has_prefix.
+    """
+
+    # If has_prefix can rule out prefixes. Otherwise it always returns True.
+    prefix_checks = False
+
+    @abc.abstractmethod
+    def check(self, word: str) -> bool:
+        """
+        If a word is in the dictionary.
+        """
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        If a string starts any word. Words are prefixes of themselves.
+        """
+        return True
+
+    def check_many(self, words: List[str]) -> List[bool]:
+        """
+        Check a batch of words.
+        """
+        return [self.check(word) for word in words]
+
+
+class EnchantDictionary(Dictionary):
+    """
+    Spell checker from pyenchant. Accepts common abbreviations and can't check prefixes.
+    """
+
+    def __init__(self, tag: str = "en_US") -> None:
+        import enchant
+
+        self.tag = tag
+        self._dict = enchant.Dict(tag)
+
+    def __reduce__(self):
+        # Spell checkers can't be pickled. Load it again in other processes.
+        return (type(self), (self.tag,))
+
+    def check(self, word: str) -> bool:
+        return self._dict.check(word)
+
+
+class WordList(Dictionary):
+    """
+    Words and their prefixes held in sets.
+    """
+
+    prefix_checks = True
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words: Set[str] = set()
+        self.prefixes: Set[str] = set()
+        for word in words:
+            word = word.strip().upper()
+            if not word:
+                continue
+            self.words.add(word)
+            self.prefixes.update(word[:i] for i in range(1, len(word) + 1))
+
+    @classmethod
+    def from_file(cls, path: str) -> "WordList":
+        """
+        Build from a word list with one word per line.
+        """
+        with open(path) as word_stream:
+            return cls(word_stream)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def check(self, word: str) -> bool:
+        return word.upper() in self.words
+
+    def has_prefix(self, prefix: str) -> bool:
+        return prefix.upper() in self.prefixes
+
+
+class _Node:
+    __slots__ = ("id", "final", "edges")
+
+    def __init__(self, node_id: int) -> None:
+        self.id = node_id
+        self.final = False
+        self.edges: Dict[int, "_Node"] = {}
+
+    def key(self) -> Tuple:
+        # Nodes with the same key accept the same suffixes once their children are merged.
+        return (
+            self.final,
+            tuple((label, child.id) for label, child in self.edges.items()),
+        )
+
+
+def _build_graph(words: List[bytes]) -> _Node:
+    """
+    Build a minimal word graph, where equal suffixes share nodes, from sorted unique words.
+    """
+    ids = iter(range(sys.maxsize))
+    root = _Node(next(ids))
+    merged: Dict[Tuple, _Node] = {}
+    # Edges of the last word that may still be merged, from root down.
+    unchecked: List[Tuple[_Node, int, _Node]] = []
+
+    def merge(down_to: int) -> None:
+        while len(unchecked) > down_to:
+            parent, label, child = unchecked.pop()
+            key = child.key()
+            if (same := merged.get(key)) is not None:
+                parent.edges[label] = same
+            else:
+                merged[key] = child
+
+    previous = b""
+    for word in words:
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        merge(common)
+        node = unchecked[-1][2] if unchecked else root
+        for label in word[common:]:
+            child = _Node(next(ids))
+            node.edges[label] = child
+            unchecked.append((node, label, child))
+            node = child
+        node.final = True
+        previous = word
+    merge(0)
+    return root
+
+
+def compile_words(words: Iterable[str], path: os.PathLike) -> int:
+    """
+    Write words as a compiled word graph for CompiledDictionary.
+
+    Words are stored in upper case. Words that aren't ASCII can't be placed so are skipped.
+
+    :param words: words, ex. lines of a word list.
+    :param path: file to write.
+    :return: number of words written.
+    """
+    unique = set()
+    for word in words:
+        word = word.strip().upper()
+        if word and word.isascii():
+            unique.add(word.encode("ascii"))
+    root = _build_graph(sorted(unique))
+
+    # Number nodes breadth first so root is 0 and each node's edges are contiguous.
+    order = [root]
+    index = {root.id: 0}
+    for node in order:
+        for child in node.edges.values():
+            if child.id not in index:
+                index[child.id] = len(order)
+                order.append(child)
+    n_nodes = len(order)
+    offsets = np.zeros(n_nodes + 1, dtype="<u4")
+    final = np.zeros(n_nodes, dtype=np.uint8)
+    labels, targets = [], []
+    for i, node in enumerate(order):
+        final[i] = node.final
+        for label in sorted(node.edges):
+            labels.append(label)
+            targets.append(index[node.edges[label].id])
+        offsets[i + 1] = len(labels)
+
+    with open(path, "wb") as graph_stream:
+        graph_stream.write(
+            _HEADER.pack(MAGIC, VERSION, n_nodes, len(labels), len(unique))
+        )
+        graph_stream.write(offsets.tobytes())
+        graph_stream.write(np.array(targets, dtype="<u4").tobytes())
+        graph_stream.write(final.tobytes())
+        graph_stream.write(np.array(labels, dtype=np.uint8).tobytes())
+    return len(unique)
+
+
+class CompiledDictionary(Dictionary):
+    """
+    Word graph compiled by compile_words, memory-mapped read-only.
+
+    Nothing is parsed at load and the pages are shared by every process that opens the file.
+    Each check follows one edge per letter. The edges of a node are read into a dict the
+    first time it is reached, so only nodes of words actually checked are ever parsed.
+    """
+
+    prefix_checks = True
+
+    def __init__(self, path: os.PathLike) -> None:
+        """
+        :param path: compiled word graph.
+        :raises ValueError: if file isn't a compiled word graph.
+        """
+        self.path = path
+        with open(path, "rb") as graph_stream:
+            try:
+                self._mmap = mmap.mmap(
+                    graph_stream.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                raise ValueError(f"Not a compiled word graph: {path}") from None
+        try:
+            magic, version, n_nodes, n_edges, n_words = _HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a compiled word graph: {path}")
+        if version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported word graph version: {version}")
+        if len(self._mmap) < _HEADER.size + 5 * (n_nodes + n_edges) + 4:
+            self._mmap.close()
+            raise ValueError(f"Word graph is truncated: {path}")
+        self.n_nodes, self.n_edges, self.n_words = n_nodes, n_edges, n_words
+
+        start = _HEADER.size
+        self._offsets_array = np.frombuffer(
+            self._mmap, dtype="<u4", count=n_nodes + 1, offset=start
+        )
+        start += 4 * (n_nodes + 1)
+        self._targets_array = np.frombuffer(
+            self._mmap, dtype="<u4", count=n_edges, offset=start
+        )
+        start += 4 * n_edges
+        self._final = np.frombuffer(
+            self._mmap, dtype=np.uint8, count=n_nodes, offset=start
+        )
+        start += n_nodes
+        # Edges of a node are read from labels in place when it is first reached.
+        self._labels_start = start
+
+        # Memoryviews index faster than arrays one item at a time.
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._offsets_array).cast("B").cast("I")
+            self._targets = memoryview(self._targets_array).cast("B").cast("I")
+        else:
+            self._offsets = self._offsets_array.tolist()
+            self._targets = self._targets_array.tolist()
+        self._finals = memoryview(self._final)
+        # Child of each letter of nodes reached so far.
+        self._edges: Dict[int, Dict[str, int]] = {}
+        # Sorted (node, label) of each edge for batch checks. Built on first use.
+        self._edge_keys: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.n_words
+
+    def __reduce__(self):
+        # Reopen the file in other processes instead of copying it.
+        return (type(self), (self.path,))
+
+    def _walk(self, word: str) -> int:
+        """
+        Follow the letters of a word from root.
+
+        :return: node reached or -1 if no word starts with it.
+        """
+        word = word.upper()
+        if not word.isascii():
+            return -1
+        edges = self._edges
+        node = 0
+        for label in word:
+            if (children := edges.get(node)) is None:
+                children = edges[node] = self._read_edges(node)
+            if (node := children.get(label, -1)) < 0:
+                return -1
+        return node
+
+    def _read_edges(self, node: int) -> Dict[str, int]:
+        first, last = self._offsets[node], self._offsets[node + 1]
+        labels = self._mmap[self._labels_start + first : self._labels_start + last]
+        return dict(zip(labels.decode("ascii"), self._targets[first:last]))
+
+    def check(self, word: str) -> bool:
+        node = self._walk(word)
+        return node >= 0 and bool(self._finals[node])
+
+    def has_prefix(self, prefix: str) -> bool:
+        # Every node leads to a word, so any path is a prefix.
+        return self._walk(prefix) >= 0
+
+    def check_many(self, words: List[str]) -> List[bool]:
+        """
+        Check a batch of words. Large batches follow one letter of every word at a time.
+        """
+        if len(words) < _MIN_VECTOR_BATCH or not self.n_edges:
+            return [self.check(word) for word in words]
+        if self._edge_keys is None:
+            sources = np.repeat(
+                np.arange(self.n_nodes, dtype=np.int64), np.diff(self._offsets_array)
+            )
+            labels = np.frombuffer(
+                self._mmap,
+                dtype=np.uint8,
+                count=self.n_edges,
+                offset=self._labels_start,
+            )
+            self._edge_keys = sources * 256 + labels
+
+        encoded = [
+            word.upper().encode("ascii") if word.isascii() else b"" for word in words
+        ]
+        lengths = np.array([len(word) for word in encoded])
+        width = int(lengths.max(initial=0))
+        codes = np.frombuffer(
+            b"".join(word.ljust(width, b"\0") for word in encoded), dtype=np.uint8
+        ).reshape(len(words), width)
+        nodes = np.zeros(len(words), dtype=np.int64)
+        # Words not ASCII are encoded empty and never found.
+        alive = np.array([word.isascii() for word in words])
+        for depth in range(width):
+            active = np.flatnonzero(alive & (lengths > depth))
+            keys = nodes[active] * 256 + codes[active, depth]
+            idx = np.searchsorted(self._edge_keys, keys)
+            idx[idx == len(self._edge_keys)] = 0
+            found = self._edge_keys[idx] == keys
+            nodes[active] = np.where(found, self._targets_array[idx], 0)
+            alive[active] = found
+        return (alive & (self._final[nodes] != 0)).tolist()
+
+    def close(self) -> None:
+        self._offsets = self._targets = self._finals = None
+        self._edges = {}
+        self._offsets_array = self._targets_array = self._final = self._edge_keys = None
+        self._mmap.close()
+
+
+def open_dictionary(path: Optional[str] = None) -> Dictionary:
+    """
+    Open a dictionary file.
+
+    :param path: compiled word graph or word list with one word per line. Defaults to
+        enchant en_US.
+    :raises OSError: if file can't be read.
+    """
+    if path is None:
+        return EnchantDictionary()
+    with open(path, "rb") as word_stream:
+        is_compiled = word_stream.read(len(MAGIC)) == MAGIC
+    if is_compiled:
+        return CompiledDictionary(path)
+    return WordList.from_file(path)
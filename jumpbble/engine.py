@@ -0,0 +1,335 @@
+import copy
+import time
+import random
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .actions import Action, Move, SelectTile, SetWildcard
+from .bag import Bag
+from .board import Board, Run
+from .cache import WordCache
+from .config import compile_config, load_config
+from .dictionary import EnchantDictionary
+from .journal import Journal
+from .moves import (
+    ALL_DIRECTIONS,
+    DIAGONAL_DIRECTIONS,
+    DIRECTIONS,
+    JumpMoves,
+    MoveTable,
+)
+from .player import Player
+from .profiler import PROFILER, profiled
+from .words import WordIndex
+
+if TYPE_CHECKING:
+    from .telemetry import Recorder
+
+
+class GameState:
+    """
+    Game rules without any rendering or input handling.
+    """
+
+    BOARD_DIM = 15
+    N_TILES = 7
+    WORD_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        dictionary: Optional[Any] = None,
+        *,
+        letters: Optional[Dict[str, Dict[str, int]]] = None,
+        special_tiles_dist: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        board_dim: Optional[int] = None,
+    ) -> None:
+        """
+        :param dictionary: word checker with a check(word) method, ex. a Dictionary. Defaults
+            to enchant en_US.
+        :param letters: letters with number and point value. Defaults to config.
+        :param special_tiles_dist: probability of each effect. Defaults to config.
+        :param seed: seed of all randomness in game. Must fit in 64 bits. Random if not given.
+        :param board_dim: number of cells per side of board. Defaults to BOARD_DIM.
+        :raises ValueError: if board size or config isn't valid.
+        """
+        self.board_dim = board_dim or self.BOARD_DIM
+        if not 1 < self.board_dim <= 65535:
+            raise ValueError(f"Not a valid board size: {self.board_dim}")
+        # Default config is only read and validated once per process.
+        if letters is None and special_tiles_dist is None:
+            config = load_config()
+        else:
+            default = load_config()
+            config = compile_config(
+                letters or default.letters,
+                special_tiles_dist or default.special_tiles_dist,
+            )
+        self.config = config
+        # Seed is always known so the game can be replayed from its journal.
+        self.seed = random.randrange(2**63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.journal = Journal(self.seed, self.board_dim)
+        # Start in center.
+        self.player = Player(position=(self.board_dim // 2, self.board_dim // 2))
+        self.board = Board(
+            player=self.player,
+            size=self.board_dim,
+            special_tiles_dist=config.special_tiles_dist,
+            track_words=True,
+            rng=self.rng,
+        )
+        # Cells reachable from each position. Only depends on board size.
+        self.moves = MoveTable(self.board_dim)
+        self.letters = config.letters
+        # All letters based on number.
+        self.letters_dist = config.tiles
+        self.letter_spaces = config.letter_spaces(self.board_dim)
+
+        # Initialize bag order from random sample.
+        self.bag = Bag(
+            self.rng.sample(self.letters_dist, len(self.letters_dist)), self.letters
+        )
+        # Give n tiles.
+        self.current_tiles = [self.bag.draw() for _ in range(self.N_TILES)]
+        # Selected tile_index
+        self.selected_tile = 0
+        # Init word checker.
+        if dictionary is None:
+            dictionary = EnchantDictionary()
+        self.dictionary = dictionary
+        # Cache word scores so repeated runs don't hit the dictionary.
+        self.word_cache = WordCache(
+            self.dictionary.check,
+            config.letter_scores,
+            maxsize=self.WORD_CACHE_SIZE,
+            check_many=getattr(self.dictionary, "check_many", None),
+        )
+        # Every word scored. A word only scores once even if erased and made again.
+        self.all_words = set()
+        # Valid words currently on board. Used to highlight them.
+        self.word_index = WordIndex(self.board_dim, self.board.chunked)
+
+        # Number of moves made. Used to check if board changed.
+        self.n_moves = 0
+        # Checks words of moves in the background if set. See validation.WordValidator.
+        self.word_validator = None
+        # Records every move if set. See set_recorder.
+        self.recorder = None
+
+    @property
+    def score(self) -> int:
+        return self.player.score
+
+    @property
+    def is_over(self) -> bool:
+        return len(self.current_tiles) == 0
+
+    @property
+    def current_char(self) -> str:
+        return self.current_tiles[self.selected_tile]
+
+    @property
+    def n_spaces(self) -> int:
+        return self.letter_spaces.get(self.current_char)
+
+    def copy(self) -> "GameState":
+        """
+        Copy game state. The dictionary, word cache and move table are shared.
+        The copy checks words synchronously and isn't recorded.
+        """
+        memo = {
+            id(self.dictionary): self.dictionary,
+            id(self.word_cache): self.word_cache,
+            id(self.moves): self.moves,
+            id(self.word_validator): None,
+            id(self.recorder): None,
+        }
+        return copy.deepcopy(self, memo)
+
+    def set_recorder(self, recorder: Optional["Recorder"]) -> None:
+        """
+        Record every move of game. See telemetry.Recorder.
+        """
+        self.recorder = recorder
+        self.board.recorder = recorder
+
+    def direction_move(self, direction: str) -> Move:
+        """
+        Get move of the selected tile in a direction.
+        """
+        dx, dy = DIRECTIONS[direction]
+        return Move((dx * self.n_spaces, dy * self.n_spaces))
+
+    def can_move_anywhere(self) -> bool:
+        # Jump or wildcard tile.
+        return self.player.is_affected("jump") or self.n_spaces == 0
+
+    def legal_moves(self) -> Sequence[Move]:
+        """
+        Get all moves of the selected tile.
+
+        :return: moves in each allowed direction or to any position on board if can jump.
+            Jumps are made as they're read, so their number doesn't cost memory or time.
+            None while the last move is being scored. See is_legal.
+        """
+        if self.is_over:
+            return []
+        if self.word_validator is not None and self.word_validator.busy:
+            return []
+
+        if self.can_move_anywhere():
+            return JumpMoves(self.player.position, self.board.size)
+        reach = self.moves.get(
+            self.player.position, self.n_spaces, self.get_directions()
+        )
+        return [Move(d_xy) for d_xy in reach.offsets]
+
+    def is_legal(self, action: Action) -> bool:
+        if self.is_over:
+            return False
+        if isinstance(action, SelectTile):
+            return 0 <= action.tile < len(self.current_tiles)
+        if isinstance(action, SetWildcard):
+            is_wildcard = (
+                self.player.is_affected("wildcard") or self.current_char == "*"
+            )
+            return is_wildcard and action.letter in self.letters
+        if isinstance(action, Move):
+            # Scoring the last move can award a jump.
+            if self.word_validator is not None and self.word_validator.busy:
+                return False
+            if self.can_move_anywhere():
+                return True
+            # Allow move if it lands on a cell reachable in an allowed direction.
+            new_coords = self.board.calc_coords(*self.player.position, *action.d_xy)
+            return self.moves.is_reachable(
+                self.player.position, self.n_spaces, self.get_directions(), new_coords
+            )
+        return False
+
+    def step(self, action: Action) -> int:
+        """
+        Apply an action.
+
+        :param action: tile selection, wildcard substitution or move.
+        :return: points gained from action. Always 0 for moves if words are checked by a
+            word validator.
+        """
+        if not self.is_legal(action):
+            raise ValueError(f"Not a legal action: {action}")
+        if isinstance(action, Move):
+            # Any offset to the same cell is legal if can jump. Shortest fits in the journal.
+            action = Move(self.board.wrap_offset(*action.d_xy))
+        self.journal.record(action)
+
+        if isinstance(action, SelectTile):
+            self.selected_tile = action.tile
+            return 0
+        if isinstance(action, SetWildcard):
+            self.current_tiles[self.selected_tile] = action.letter
+            return 0
+
+        return self._exec_move(action.d_xy, self.current_char)
+
+    def get_directions(self) -> Tuple[str, ...]:
+        # If player affected by diagonal, only move diagonally.
+        if self.player.is_affected("diagonal"):
+            return DIAGONAL_DIRECTIONS
+        return ALL_DIRECTIONS
+
+    def _get_score(self, word: str) -> int:
+        return self.word_cache.score(word)
+
+    def _find_runs(self) -> List[Run]:
+        start = time.perf_counter()
+        # Only rows/cols changed by the last move are rescanned.
+        with PROFILER.timer("find_words"):
+            runs = list(self.board.find_new_words())
+        if self.recorder is not None:
+            self.recorder.add_time("scan", time.perf_counter() - start)
+        return runs
+
+    def _update_words(self) -> int:
+        runs = self._find_runs()
+        start = time.perf_counter()
+        scores = [self._get_score(word) for word, _ in runs]
+        if self.recorder is not None:
+            self.recorder.add_time("validate", time.perf_counter() - start)
+        return self._apply_scores(runs, scores)
+
+    def _apply_scores(self, runs: List[Run], scores: List[int]) -> int:
+        """
+        Score runs made by a move. Runs must be applied in the order moves were made.
+
+        :param runs: words through cells changed by a move and their letter positions.
+        :param scores: score of each run. 0 if not a valid word.
+        :return: points gained.
+        """
+        points = 0
+        new_words = []
+        for (word, word_pos), score in zip(runs, scores):
+            # Words broken or extended by the run are replaced.
+            self.word_index.update(word if score != 0 else None, word_pos)
+            if score != 0 and word not in self.all_words:
+                self.all_words.add(word)
+                new_words.append(word)
+                self.player.score += score
+                points += score
+
+                # If valid word, allow player to jump.
+                self.player.status.add("jump", 1)
+        if self.recorder is not None:
+            self.recorder.score(new_words, points)
+        return points
+
+    @profiled("exec_move")
+    def _exec_move(self, d_xy: Tuple[int, int], current_char: str) -> int:
+        if self.recorder is not None:
+            self.recorder.begin_move(
+                self.n_moves, current_char, self.letter_spaces[current_char], d_xy
+            )
+        # Remove placed tile from tiles and replenish tiles.
+        self.current_tiles.pop(self.selected_tile)
+
+        try:
+            if self.player.is_affected("ordered") and self.bag:
+                # Next letter from current character that is left in bag.
+                next_tile = self.bag.next_available(current_char)
+                self.bag.remove(next_tile)
+            else:
+                next_tile = self.bag.draw()
+            self.current_tiles.extend(next_tile)
+        except IndexError:
+            pass
+
+        # Tiles ran out past selected tile. Select last tile.
+        if self.selected_tile >= len(self.current_tiles):
+            self.selected_tile = max(len(self.current_tiles) - 1, 0)
+
+        # Mirror move by multiple change in x and y by -1.
+        if self.player.is_affected("mirror"):
+            mirrored_d_xy = [d_var * -1 for d_var in d_xy]
+            self.board.place_piece(mirrored_d_xy, current_char, update_player_pos=False)
+
+        # Place tile on board.
+        self.board.place_piece(d_xy, current_char)
+
+        # Decay any status effect.
+        self.player.status.decay()
+        if self.recorder is not None:
+            self.recorder.end_move(self.player.position, len(self.bag))
+
+        # Score any words made by move. Validator applies scores once checked.
+        if self.word_validator is None:
+            points = self._update_words()
+        else:
+            self.word_validator.submit(self, self._find_runs())
+            points = 0
+        self.n_moves += 1
+        return points
+
+    def _get_poss_new_coords(self, n_spaces) -> Tuple[Tuple[int, int], ...]:
+        # Looked up in the move table so nothing is recomputed each frame.
+        return self.moves.get(
+            self.player.position, n_spaces, self.get_directions()
+        ).coords
@@ -0,0 +1,132 @@
+import zlib
+import numpy as np
+from typing import Callable, Dict, Iterator, Set, Tuple
+
+ChunkKey = Tuple[int, int]
+
+
+class ChunkedGrid:
+    """
+    Square grid of uint8 codes stored as chunks that are only created when first accessed.
+
+    Supports the indexing of a numpy grid used by the board: grid[x, y] to get or set a cell,
+    and window(xs, ys) to get a block of cells. Memory and time grow with the area accessed,
+    not the area of the grid.
+    """
+
+    CHUNK_SIZE = 64
+
+    def __init__(
+        self, size: int, fill: Callable[[int, int, Tuple[int, int]], np.ndarray]
+    ):
+        """
+        :param size: number of cells per side.
+        :param fill: creates the codes of a chunk from its chunk x, y and shape.
+            Must give the same codes every time.
+        """
+        self.size = size
+        self.shape = (size, size)
+        self.dtype = np.dtype(np.uint8)
+        self.chunks: Dict[ChunkKey, np.ndarray] = {}
+        # Chunks changed since they were filled.
+        self.modified: Set[ChunkKey] = set()
+        self._fill = fill
+
+    def chunk_shape(self, cx: int, cy: int) -> Tuple[int, int]:
+        chunk_size = self.CHUNK_SIZE
+        return (
+            min(chunk_size, self.size - cx * chunk_size),
+            min(chunk_size, self.size - cy * chunk_size),
+        )
+
+    def chunk(self, cx: int, cy: int) -> np.ndarray:
+        """
+        Get chunk, filling it if it doesn't exist yet.
+        """
+        if (chunk := self.chunks.get((cx, cy))) is None:
+            chunk = self._fill(cx, cy, self.chunk_shape(cx, cy))
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def __getitem__(self, key: Tuple[int, int]) -> int:
+        x, y = key
+        cx, x_in = divmod(x, self.CHUNK_SIZE)
+        cy, y_in = divmod(y, self.CHUNK_SIZE)
+        return self.chunk(cx, cy)[x_in, y_in]
+
+    def __setitem__(self, key: Tuple[int, int], code: int) -> None:
+        x, y = key
+        cx, x_in = divmod(x, self.CHUNK_SIZE)
+        cy, y_in = divmod(y, self.CHUNK_SIZE)
+        self.chunk(cx, cy)[x_in, y_in] = code
+        self.modified.add((cx, cy))
+
+    def window(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Get codes of every combination of x and y. ex. the cells in view.
+
+        :param xs: x of each row of window.
+        :param ys: y of each col of window.
+        :return: codes with shape (len(xs), len(ys)).
+        """
+        window = np.empty((len(xs), len(ys)), dtype=np.uint8)
+        x_chunks, x_in = np.divmod(xs, self.CHUNK_SIZE)
+        y_chunks, y_in = np.divmod(ys, self.CHUNK_SIZE)
+        for cx in np.unique(x_chunks).tolist():
+            rows = np.flatnonzero(x_chunks == cx)
+            for cy in np.unique(y_chunks).tolist():
+                cols = np.flatnonzero(y_chunks == cy)
+                window[np.ix_(rows, cols)] = self.chunk(cx, cy)[
+                    np.ix_(x_in[rows], y_in[cols])
+                ]
+        return window
+
+    def lines(self, axis: int, idxs: np.ndarray, fill_value: int = 0) -> np.ndarray:
+        """
+        Get whole rows/cols without creating missing chunks.
+
+        :param axis: 0 for rows at idxs, 1 for cols at idxs.
+        :param fill_value: code of cells in chunks that don't exist yet.
+        :return: codes with shape (len(idxs), size).
+        """
+        lines = np.full((len(idxs), self.size), fill_value, dtype=np.uint8)
+        line_chunks, line_in = np.divmod(idxs, self.CHUNK_SIZE)
+        for (cx, cy), chunk in self.chunks.items():
+            line_chunk, along = (cx, cy) if axis == 0 else (cy, cx)
+            if not (rows := np.flatnonzero(line_chunks == line_chunk)).size:
+                continue
+            start = along * self.CHUNK_SIZE
+            chunk_lines = chunk if axis == 0 else chunk.T
+            lines[rows, start : start + chunk_lines.shape[1]] = chunk_lines[
+                line_in[rows]
+            ]
+        return lines
+
+    def active_lines(self, axis: int) -> np.ndarray:
+        """
+        Get sorted indices of rows/cols through any existing chunk.
+        """
+        line_chunks = sorted({key[axis] for key in self.chunks})
+        idxs = [
+            np.arange(
+                line_chunk * self.CHUNK_SIZE,
+                min((line_chunk + 1) * self.CHUNK_SIZE, self.size),
+            )
+            for line_chunk in line_chunks
+        ]
+        return np.concatenate(idxs) if idxs else np.array([], dtype=np.intp)
+
+    def iter_modified(self) -> Iterator[Tuple[ChunkKey, np.ndarray]]:
+        for key in sorted(self.modified):
+            yield key, self.chunks[key]
+
+    def crc32(self) -> int:
+        """
+        Get checksum of modified chunks. Chunks only filled are the same for every game
+        with the same fill so are skipped.
+        """
+        crc = 0
+        for (cx, cy), chunk in self.iter_modified():
+            crc = zlib.crc32(np.array([cx, cy], dtype=np.uint32).tobytes(), crc)
+            crc = zlib.crc32(np.ascontiguousarray(chunk).tobytes(), crc)
+        return crc
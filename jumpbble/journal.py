@@ -0,0 +1,225 @@
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple, Optional, Tuple
+
+from .actions import Action, Move, SelectTile, SetWildcard
+
+if TYPE_CHECKING:
+    from .engine import GameState
+
+MAGIC = b"JBJL"
+VERSION = 3
+# Magic, version, seed, board size, number of actions, length of actions, flags.
+HEADER = struct.Struct("<4sHqHIIB")
+# Version 2 had no flags.
+HEADER_V2 = struct.Struct("<4sHqHII")
+# Game was changed outside of its actions so can't be replayed.
+FLAG_DEBUG = 1
+# Score, number of moves, CRC32 of grid.
+SUMMARY = struct.Struct("<iII")
+# Opcode and payload of each action.
+SELECT_TILE = struct.Struct("<cB")
+SET_WILDCARD = struct.Struct("<cc")
+MOVE = struct.Struct("<chh")
+OPCODES = {b"S": SELECT_TILE, b"W": SET_WILDCARD, b"M": MOVE}
+
+
+class Summary(NamedTuple):
+    """
+    Final state of a game checked after replay.
+    """
+
+    score: int
+    n_moves: int
+    grid_crc: int
+
+    @classmethod
+    def of(cls, state: "GameState") -> "Summary":
+        return cls(state.player.score, state.n_moves, state.board.crc32())
+
+
+class Journal:
+    """
+    Compact record of every action applied to a game from its seed.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        board_dim: int,
+        actions: bytes = b"",
+        n_actions: int = 0,
+        debug: bool = False,
+    ) -> None:
+        """
+        :param seed: seed the game was created with.
+        :param board_dim: number of cells per side of board.
+        :param actions: encoded actions. Used to restore a journal.
+        :param n_actions: number of encoded actions.
+        :param debug: if game was changed by debug commands. Used to restore a journal.
+        """
+        self.seed = seed
+        self.board_dim = board_dim
+        self.actions = bytearray(actions)
+        self.n_actions = n_actions
+        self.debug = debug
+        self._last_select = None
+
+    def __len__(self) -> int:
+        return self.n_actions
+
+    def record(self, action: Action) -> None:
+        """
+        Append an applied action.
+        """
+        if isinstance(action, SelectTile):
+            # Only the last of consecutive tile selections has any effect.
+            if self._last_select is not None:
+                SELECT_TILE.pack_into(
+                    self.actions, self._last_select, b"S", action.tile
+                )
+                return
+            self._last_select = len(self.actions)
+            self.actions += SELECT_TILE.pack(b"S", action.tile)
+        elif isinstance(action, SetWildcard):
+            self._last_select = None
+            self.actions += SET_WILDCARD.pack(b"W", action.letter.encode())
+        else:
+            self._last_select = None
+            self.actions += MOVE.pack(b"M", *action.d_xy)
+        self.n_actions += 1
+
+    def mark_debug(self) -> None:
+        """
+        Record that the game was changed by a debug command, which isn't an action.
+
+        The journal is still written but the game can no longer be replayed from it.
+        """
+        self.debug = True
+
+    def __iter__(self) -> Iterator[Action]:
+        offset = 0
+        buffer = memoryview(self.actions)
+        while offset < len(buffer):
+            opcode = bytes(buffer[offset : offset + 1])
+            fmt = OPCODES[opcode]
+            _, *payload = fmt.unpack_from(buffer, offset)
+            offset += fmt.size
+            if opcode == b"S":
+                yield SelectTile(payload[0])
+            elif opcode == b"W":
+                yield SetWildcard(payload[0].decode())
+            else:
+                yield Move(tuple(payload))
+
+    def to_bytes(self, summary: Summary) -> bytes:
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.seed,
+            self.board_dim,
+            self.n_actions,
+            len(self.actions),
+            FLAG_DEBUG if self.debug else 0,
+        )
+        return header + bytes(self.actions) + SUMMARY.pack(*summary)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["Journal", Summary]:
+        """
+        Decode a journal and the summary of the game when it was written.
+
+        :raises ValueError: if data isn't a journal.
+        """
+        if len(data) < HEADER_V2.size:
+            raise ValueError("Not a journal")
+        magic, version = struct.unpack_from("<4sH", data)
+        if magic != MAGIC:
+            raise ValueError("Not a journal")
+        if version == VERSION:
+            header = HEADER
+        elif version == 2:
+            header = HEADER_V2
+        else:
+            raise ValueError(f"Unsupported journal version: {version}")
+        if len(data) < header.size:
+            raise ValueError("Not a journal")
+        _, _, seed, board_dim, n_actions, actions_len, *flags = header.unpack_from(data)
+        debug = bool(flags and flags[0] & FLAG_DEBUG)
+        actions_end = header.size + actions_len
+        summary = Summary(*SUMMARY.unpack_from(data, actions_end))
+        journal = cls(
+            seed, board_dim, data[header.size : actions_end], n_actions, debug
+        )
+        return journal, summary
+
+    def save(self, state: "GameState", path: os.PathLike) -> None:
+        """
+        Write journal with the summary of the game it was recorded from.
+        """
+        with open(path, "wb") as journal_stream:
+            journal_stream.write(self.to_bytes(Summary.of(state)))
+
+    @classmethod
+    def load(cls, path: os.PathLike) -> Tuple["Journal", Summary]:
+        with open(path, "rb") as journal_stream:
+            return cls.from_bytes(journal_stream.read())
+
+
+def replay(
+    journal: Journal,
+    dictionary: Optional[Any] = None,
+    *,
+    shared: Optional["GameState"] = None,
+    **config,
+) -> "GameState":
+    """
+    Re-simulate a game headlessly from its journal.
+
+    :param journal: journal of game.
+    :param dictionary: word checker. Defaults to enchant en_US.
+    :param shared: game whose word cache and move table are reused if they match, ex. the
+        last game replayed. Saves checking the same words and moves again in every game.
+        The word cache is only reused if the dictionary is the same object.
+    :param config: letters and special_tiles_dist passed to GameState. Defaults to config.
+    :return: state after every action.
+    :raises ValueError: if an action isn't legal, ex. if rules have changed, or if the game
+        was changed by debug commands.
+    """
+    from .engine import GameState
+
+    if journal.debug:
+        raise ValueError("Games changed by debug commands can't be replayed")
+    state = GameState(
+        dictionary, seed=journal.seed, board_dim=journal.board_dim, **config
+    )
+    if shared is not None:
+        same_scores = shared.word_cache.letter_scores == state.word_cache.letter_scores
+        if shared.dictionary is state.dictionary and same_scores:
+            state.word_cache = shared.word_cache
+        if shared.moves.size == state.moves.size:
+            state.moves = shared.moves
+    for action in journal:
+        state.step(action)
+    return state
+
+
+def verify(
+    journal: Journal,
+    summary: Summary,
+    dictionary: Optional[Any] = None,
+    *,
+    shared: Optional["GameState"] = None,
+    **config,
+) -> Tuple[bool, Summary]:
+    """
+    Replay a game and check its final state matches the summary.
+
+    :param shared: game whose word cache and move table are reused. See replay.
+    :return: if final state matched and the summary of the replayed game.
+    """
+    try:
+        replayed = Summary.of(replay(journal, dictionary, shared=shared, **config))
+    except ValueError:
+        return False, Summary(-1, -1, 0)
+    return replayed == summary, replayed
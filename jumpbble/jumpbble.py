@@ -1,20 +1,29 @@
 import sys
-import json
-import pygame
-import random
-import traceback
+import time
 import pathlib
-import enchant
-from typing import Dict, Tuple, Any, List
-from itertools import chain
-from collections import defaultdict, deque
+from collections import deque
+import numpy as np
+from typing import TYPE_CHECKING, Any, Dict, Tuple, List, Optional, Set
 
-from .board import Board
-from .player import Player
+from . import snapshot
+from .engine import GameState, Move, SelectTile, SetWildcard
+from .lazy import lazy_import
+from .profiler import PROFILER, profiled
+from .render import BoardView, GlyphCache, GridLayout
+from .solver import Hint, Solver
+from .validation import WordValidator
+
+if TYPE_CHECKING:
+    from .advisor import Advisor
+    from .telemetry import Recorder
+
+# Only loaded when a window is opened or text is rendered.
+pygame = lazy_import("pygame")
 
 
 class Jumpbble:
-    BOARD_DIM = 15
+    # Number of cells per side shown. Larger boards scroll around the player.
+    VIEW_DIM = 15
     BOARD_BG_COLOR = (202, 164, 114)
     BOARD_GRID_COLOR = (200, 200, 200)
     BOARD_GRID_PLAYER_COLOR = (255, 0, 0)
@@ -30,77 +39,77 @@ class Jumpbble:
     )
     BOARD_FONT_COLOR = (101, 67, 33)
     BOARD_WORD_COLOR = (0, 100, 0)
+    BOARD_GRID_HINT_COLOR = (255, 0, 255)
+    OVERLAY_BG_COLOR = (0, 0, 0, 190)
+    OVERLAY_FONT_COLOR = (255, 255, 255)
+    # Overlay is refreshed every n frames so it's readable.
+    OVERLAY_REFRESH_FRAMES = 15
+    PROFILE_DUMP_PATH = "jumpbble_profile.json"
+    SAVE_PATH = "jumpbble.sav"
+    JOURNAL_PATH = "jumpbble.jbj"
+    # Seconds the advisor searches for a hint.
+    ADVISOR_BUDGET = 1.0
     WINDOW_X = 450
     WINDOW_Y = 675
-    BOARD_BLOCK_WIDTH = WINDOW_X // BOARD_DIM
 
-    N_TILES = 7
-    STARTING_POS = (7, 7)
-    CFG_DIR = pathlib.Path(__file__).parents[1].joinpath("config")
+    N_TILES = GameState.N_TILES
+    TARGET_FPS = 30
     RES_DIR = pathlib.Path(__file__).parents[1].joinpath("resources")
     BG_MUSIC = RES_DIR.joinpath("audio", "HoliznaCC0_NPC_Theme.mp3")
 
-    def __init__(self) -> None:
-        self.player = Player(position=self.STARTING_POS)
-        self.board = Board(
-            player=self.player,
-            size=self.BOARD_DIM,
-            special_tiles_dist=self._load_special_tiles(),
-        )
-        self.letters = self._load_letters()
-        # Generate all letters based on number.
-        self.letters_dist = list(
-            chain(
-                *[[letter] * mdata["Number"] for letter, mdata in self.letters.items()]
-            )
-        )
-        # Assign letter spaces to letters. If letter is wildcard or the length of board, give 0.
-        # The length of board is for balance as would always land on same position otherwise.
-        self.letter_spaces = {
-            letter: (0 if letter == "*" or i == self.BOARD_DIM else i)
-            for i, letter in enumerate(list(self.letters), 1)
-        }
-
-        # Initialize bag order from random sample.
-        self.bag = deque(random.sample(self.letters_dist, len(self.letters_dist)))
-        # Give n tiles.
-        self.current_tiles = [self.bag.popleft() for _ in range(self.N_TILES)]
-        # Selected tile_index
-        self.selected_tile = 0
-        # Init word checker.
-        self.dictionary = enchant.Dict("en_US")
-        self.all_words = set()
-        self.all_word_pos = set()
+    def __init__(
+        self,
+        fps: int = TARGET_FPS,
+        *,
+        dictionary: Optional[Any] = None,
+        seed: Optional[int] = None,
+        autosave: bool = False,
+        board_dim: Optional[int] = None,
+        advisor: Optional["Advisor"] = None,
+        recorder: Optional["Recorder"] = None,
+    ) -> None:
+        """
+        :param advisor: estimates placements with rollouts when a hint is asked for. Hints
+            only use the solver if not given.
+        :param recorder: records every move and the time spent rendering after it.
+        """
+        # All game rules. This class only handles input and rendering.
+        self.game = GameState(dictionary, seed=seed, board_dim=board_dim)
+        # Only a view of the board around the player is drawn.
+        self.view_dim = min(self.game.board_dim, self.VIEW_DIM)
+        self.block_width = self.WINDOW_X // self.view_dim
+        # Offset of view from player. Reset on every move.
+        self.scroll = (0, 0)
+
+        # Frame pacing. Time used in ms of last frame before sleeping.
+        self.fps = fps
+        self.frame_time_used = 0
+        # What was shown on the last frame in view coords. Only differences are redrawn.
+        self._shown_origin = None
+        self._shown_view = None
+        self._shown_word_mask = None
+        self._shown_position = None
+        self._shown_move_colors = {}
+        self._shown_lines = {}
+        self._shown_line_rects = {}
+
+        # Best placement shown until next move as (move number, position).
+        self.hint = None
+        self.advisor = advisor
+        # Save after every move.
+        self.autosave = autosave
+        self._save_pending = False
+        # Words of moves are checked off the game loop.
+        self.validator = WordValidator()
+        self.game.word_validator = self.validator
+        self.recorder = recorder
+        self.game.set_recorder(recorder)
 
         # Debug stuff.
         self.debug_mode = False
         self.debug_input = ""
-
-    def _load_special_tiles(self) -> Dict[str, float]:
-        """
-        Load special tiles.
-
-        :return: special tiles dictionary where key is effect and value is percent probability.
-        """
-        try:
-            with open(self.CFG_DIR.joinpath("special_tiles.json")) as json_stream:
-                return json.load(json_stream)
-        except Exception:
-            traceback.print_exc()
-            sys.exit(1)
-
-    def _load_letters(self) -> Dict[str, Dict[str, int]]:
-        """
-        Load letters with number and point value.
-
-        :return: all letters and their movement values and score
-        """
-        try:
-            with open(self.CFG_DIR.joinpath("letters.json")) as json_stream:
-                return json.load(json_stream)
-        except Exception:
-            traceback.print_exc()
-            sys.exit(1)
+        self._overlay_font = None
+        self._shown_overlay_rect = None
 
     def _debug_mode(self, event) -> None:
         # Escape to exit.
@@ -111,23 +120,32 @@ class Jumpbble:
         # Enter and execute command.
         if event.key == pygame.K_RETURN:
             print(self.debug_input)
-            if effect := self.player.status.get(self.debug_input):
-                effect + 3
+            if self.debug_input in self.game.player.status:
+                # Not an action so the game can't be replayed from its journal anymore.
+                self.game.journal.mark_debug()
+                self.game.player.status.add(self.debug_input, 3)
+            elif self.debug_input == "frame":
+                print(f"Frame time: {self.frame_time_used} / {1000 // self.fps} ms")
+                print(f"Rolling frame time: {PROFILER.percentiles('frame')}")
+            elif self.debug_input == "dump":
+                PROFILER.dump(self.PROFILE_DUMP_PATH)
+                print(f"Profile written to {self.PROFILE_DUMP_PATH}")
+            elif self.debug_input == "reset":
+                PROFILER.reset()
+            elif self.debug_input == "save":
+                self.save()
+                print(f"Saved to {self.SAVE_PATH}")
+            elif self.debug_input == "load":
+                try:
+                    self.load()
+                except (OSError, ValueError) as e:
+                    print(f"Unable to load: {e}")
+            elif self.debug_input == "new":
+                self.reset()
         # Allow editing
         elif event.key == pygame.K_BACKSPACE:
             self.debug_input = self.debug_input[:-1]
             print(self.debug_input)
-        # Allow jumping to any position.
-        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-            x_px, y_px = pygame.mouse.get_pos()
-            current_x, current_y = self.player.position
-            clicked_x, clicked_y = (
-                x_px // self.BOARD_BLOCK_WIDTH,
-                y_px // self.BOARD_BLOCK_WIDTH,
-            )
-            d_xy = (clicked_x - current_x, clicked_y - current_y)
-
-            self._exec_move(d_xy, self.current_tiles[self.selected_tile])
         else:
             # Add input.
             self.debug_input += event.unicode
@@ -137,27 +155,29 @@ class Jumpbble:
         pygame.init()
         screen = pygame.display.set_mode([self.WINDOW_X, self.WINDOW_Y])
         pygame.display.set_caption("Jumpbble")
-        # Setup music
-        pygame.mixer.init()
-        pygame.mixer.music.load(self.BG_MUSIC)
-        pygame.mixer.music.play(-1)
-
-        BOARD_ELEMS = self._get_grid_elem()
-        BOARD_CHAR_FONT = pygame.font.SysFont("Arial", 25)
-        UI_CHAR_FONT = pygame.font.SysFont("Arial", 25)
+        self._start_music()
+
+        BOARD_ELEMS = GridLayout(self.view_dim, self.block_width)
+        BOARD_CHAR_FONT = GlyphCache(pygame.font.SysFont("Arial", 25))
+        UI_CHAR_FONT = GlyphCache(pygame.font.SysFont("Arial", 25))
         # UI_STATS_FONT = pygame.font.SysFont("Arial", 20)
 
-        self.MOVEMENT_KEYS = {
-            pygame.K_w: lambda n_space: (0, n_space * -1),
-            pygame.K_a: lambda n_space: (n_space * -1, 0),
-            pygame.K_s: lambda n_space: (0, n_space),
-            pygame.K_d: lambda n_space: (n_space, 0),
-            pygame.K_q: lambda n_space: (n_space * -1, n_space * -1),
-            pygame.K_e: lambda n_space: (n_space, n_space * -1),
-            pygame.K_z: lambda n_space: (n_space * -1, n_space),
-            pygame.K_x: lambda n_space: (n_space, n_space),
+        MOVEMENT_KEYS = {
+            pygame.K_w: "up",
+            pygame.K_a: "left",
+            pygame.K_s: "down",
+            pygame.K_d: "right",
+            pygame.K_q: "up_left",
+            pygame.K_e: "up_right",
+            pygame.K_z: "down_left",
+            pygame.K_x: "down_right",
+        }
+        SCROLL_KEYS = {
+            pygame.K_UP: (0, -1),
+            pygame.K_LEFT: (-1, 0),
+            pygame.K_DOWN: (0, 1),
+            pygame.K_RIGHT: (1, 0),
         }
-        self.MOVEMENT_DIAG_KEYS = (pygame.K_q, pygame.K_e, pygame.K_z, pygame.K_x)
         TILE_KEYS = {
             key: i
             for i, key in enumerate(
@@ -173,202 +193,408 @@ class Jumpbble:
             )
         }
 
-        current_char = self.current_tiles[self.selected_tile]
-        n_spaces = self.letter_spaces.get(current_char)
-        # Get possible coords that player can land on to render.
-        possible_new_coords = self._get_poss_new_coords(n_spaces)
+        def handle_event(event) -> bool:
+            """
+            Handle an input event.
+
+            :return: if no more events should be handled this frame.
+            """
+            game = self.game
+            if game.is_over:
+                return False
+
+            # Cycle through letters
+            if event.type == pygame.MOUSEBUTTONUP and event.button in (4, 5):
+                scroll = -1 if event.button == 4 else 1
+                self._try_step(SelectTile(game.selected_tile + scroll))
+
+            # Enable placing on grid by mouse-click.
+            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                d_xy = self._get_clicked_d_xy()
+                # Allow clicking if jump, wildcard tile or move within possible_new_coords.
+                self._try_step(Move(d_xy))
+
+            if event.type == pygame.KEYDOWN:
+                # Toggle between tiles.
+                if self.debug_mode:
+                    self._debug_mode(event)
+                    return True
+
+                if event.key == pygame.K_ESCAPE and self.debug_mode is False:
+                    print("In debug mode.")
+                    self.debug_mode = True
+                    # Keeps profiling after debug mode exits to catch any stutter.
+                    PROFILER.enabled = True
+                    return True
+
+                # Select best tile and show where to place it.
+                if event.key == pygame.K_TAB:
+                    self._show_hint()
+                    return True
+
+                # Look around large boards.
+                if scroll := SCROLL_KEYS.get(event.key):
+                    self.scroll = (
+                        self.scroll[0] + scroll[0],
+                        self.scroll[1] + scroll[1],
+                    )
+                    return True
+
+                if event.key in TILE_KEYS:
+                    self._try_step(SelectTile(TILE_KEYS[event.key]))
+
+                # If wildcard effect or tile, allow any letter.
+                is_wildcard = game.player.is_affected("wildcard")
+                if is_wildcard or game.current_char == "*":
+                    self._try_step(SetWildcard(str(event.unicode).upper()))
+                    return True
+
+                # For movement.
+                if direction := MOVEMENT_KEYS.get(event.key):
+                    # Ignore input if not diagonal movement key.
+                    if direction not in game.get_directions():
+                        return False
+                    self._try_step(game.direction_move(direction))
+            return False
+
+        clock = pygame.time.Clock()
+        # State shown on last frame. Frame is only rebuilt if this changes.
+        frame_state = None
+        # Input not handled yet.
+        input_events = deque()
 
         while True:
-            screen.fill(self.BOARD_BG_COLOR)
-            self._render_ui(screen)
-            self._render_board(screen, BOARD_ELEMS, BOARD_CHAR_FONT)
-            self._render_curr_chars(screen, UI_CHAR_FONT)
-            self._render_stats(screen, UI_CHAR_FONT)
-
-            # Game over.
-            if len(self.current_tiles) == 0:
+            # Score moves whose words were checked in the background, in the order made.
+            self.validator.apply_ready()
+            if self._save_pending and not self.validator.busy:
+                self._save_pending = False
+                self.save()
+            if self.advisor is not None and self.advisor.searching:
+                self._poll_advisor()
+            # Game can be replaced by reset.
+            game = self.game
+            # Game over once last move is scored.
+            if game.is_over and not self.validator.busy:
                 self._render_game_over(screen)
+                self.save_journal()
+                self.close()
                 pygame.quit()
                 sys.exit(0)
-            try:
-                current_char = self.current_tiles[self.selected_tile]
-                n_spaces = self.letter_spaces.get(current_char)
-                possible_new_coords = self._get_poss_new_coords(n_spaces)
-            except (IndexError, KeyError):
-                continue
-
-            # Render colors. If blind, disable.
-            if self.player.is_affected("blind") is False:
-                for rgb, (poss_x, poss_y) in zip(
-                    self.BOARD_GRID_POSSIBLE_MOVE_COLOR, possible_new_coords
-                ):
-                    self._render_block(
-                        screen,
-                        BOARD_ELEMS,
-                        poss_x,
-                        poss_y,
-                        char=None,
-                        char_font=BOARD_CHAR_FONT,
-                        block_color=rgb,
-                    )
 
-            for event in pygame.event.get():
-                # Update score after each event.
-                for word, word_pos in self.board.find_words():
-                    score = self._get_score(word)
-                    if score != 0:
-                        # Add positions of words to render.
-                        for pos in word_pos:
-                            self.all_word_pos.add(pos)
-
-                        if word not in self.all_words:
-                            self.all_words.add(word)
-                            self.player.score += score
-
-                            # If valid word, allow player to jump.
-                            self.player.status.get("jump") + 1
-
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # Cycle through letters
-                if event.type == pygame.MOUSEBUTTONUP and event.button == 4:
-                    if self.selected_tile >= 1:
-                        self.selected_tile -= 1
-                if event.type == pygame.MOUSEBUTTONUP and event.button == 5:
-                    if self.selected_tile < self.N_TILES - 1:
-                        self.selected_tile += 1
-
-                # Enable placing on grid by mouse-click.
-                if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                    x_px, y_px = pygame.mouse.get_pos()
-                    current_x, current_y = self.player.position
-                    clicked_x, clicked_y = (
-                        x_px // self.BOARD_BLOCK_WIDTH,
-                        y_px // self.BOARD_BLOCK_WIDTH,
-                    )
-                    d_xy = (clicked_x - current_x, clicked_y - current_y)
-
-                    # Jump or wildcard tile.
-                    if any([self.player.is_affected("jump"), n_spaces == 0]):
-                        self._exec_move(d_xy, current_char)
-                    # Allow clicking if move within possible_new_coords.
-                    elif (clicked_x, clicked_y) in possible_new_coords:
-                        self._exec_move(d_xy, current_char)
-
-                if event.type == pygame.KEYDOWN:
-                    # Toggle between tiles.
-                    if self.debug_mode:
-                        self._debug_mode(event)
+            if (new_frame_state := self._get_frame_state()) != frame_state:
+                # Get possible coords that player can land on to render.
+                possible_new_coords = game._get_poss_new_coords(game.n_spaces)
+                render_start = time.perf_counter()
+                dirty_rects = self._render_frame(
+                    screen,
+                    BOARD_ELEMS,
+                    BOARD_CHAR_FONT,
+                    UI_CHAR_FONT,
+                    possible_new_coords,
+                    full=frame_state is None,
+                )
+                frame_state = new_frame_state
+                # Only push changed areas to display.
+                with PROFILER.timer("display"):
+                    pygame.display.update(dirty_rects)
+                if self.recorder is not None:
+                    self.recorder.add_time("render", time.perf_counter() - render_start)
+
+            with PROFILER.timer("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.save_journal()
+                        self.close()
+                        pygame.quit()
+                        sys.exit()
+
+                    # Redraw if window contents were lost.
+                    if event.type == pygame.VIDEOEXPOSE:
+                        frame_state = None
+
+                    input_events.append(event)
+
+                # Input waits until the last move is scored, since scoring can change which
+                # moves are legal. Events are kept, so nothing waits on the dictionary.
+                while input_events and not self.validator.busy:
+                    if handle_event(input_events.popleft()):
                         break
 
-                    if event.key == pygame.K_ESCAPE and self.debug_mode is False:
-                        print("In debug mode.")
-                        self.debug_mode = True
-                        break
+            # Sleep for rest of frame.
+            PROFILER.end_frame()
+            clock.tick(self.fps)
+            self.frame_time_used = clock.get_rawtime()
+            PROFILER.start_frame()
 
-                    if event.key in TILE_KEYS:
-                        self.selected_tile = TILE_KEYS[event.key]
-
-                    # If wildcard effect or tile, allow any letter.
-                    if self.player.is_affected("wildcard") or current_char == '*':
-                        wildcard = str(event.unicode).upper()
-                        if wildcard in self.letters:
-                            self.current_tiles[self.selected_tile] = wildcard
-                            break
-                        else:
-                            break
-
-                    current_char = self.current_tiles[self.selected_tile]
-                    n_spaces = self.letter_spaces.get(current_char)
-                    possible_new_coords = self._get_poss_new_coords(n_spaces)
-
-                    # For movement.
-                    if event.key in self.MOVEMENT_KEYS:
-                        # Ignore input if not diagonal movement key.
-                        if all(
-                            [
-                                self.player.is_affected("diagonal"),
-                                event.key not in self.MOVEMENT_DIAG_KEYS,
-                            ]
-                        ):
-                            continue
-                        if coord_change_func := self.MOVEMENT_KEYS.get(event.key):
-                            d_xy = coord_change_func(n_spaces)
-
-                        self._exec_move(d_xy, current_char)
-
-            pygame.display.update()
-
-    def _get_score(self, word: str) -> int:
-        if self.dictionary.check(word):
-            word_score = sum(
-                self.letters[letter.upper()]["Score"] for letter in list(word)
-            )
-            return word_score
-        else:
-            return 0
-
-    def _next_letter(self, char: str) -> str:
-        letter_list = list(self.letters)
-        idx = (letter_list.index(char) + 1) % len(self.letters)
-        return letter_list[idx]
+    def _start_music(self) -> None:
+        # Audio is only loaded once a window is open. Play without music if there's no device.
+        try:
+            pygame.mixer.init()
+            pygame.mixer.music.load(self.BG_MUSIC)
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            print(f"Unable to play music: {e}")
+
+    def _show_hint(self) -> None:
+        # Solver needs the words of the last move. Only waits if asked for a hint mid-check.
+        self.validator.wait()
+        if self.advisor is not None:
+            # Best immediate placement is shown while rollouts refine it.
+            self.advisor.start(self.game, self.ADVISOR_BUDGET)
+            if estimates := self.advisor.estimates():
+                self._set_hint(estimates[0].hint, select=False)
+            return
+        if not (hints := Solver(self.game).best(1)):
+            return
+        self._set_hint(hints[0])
+
+    def _set_hint(self, hint: Hint, *, select: bool = True) -> None:
+        """
+        :param select: select tile and any wildcard letter of hint. The move is left to the
+            player. Hints that can't be made from the rack anymore are dropped.
+        """
+        if select:
+            selected = self.game.selected_tile
+            for action in hint.actions(self.game)[:-1]:
+                if not self.game.is_legal(action):
+                    # Rack changed after hint was found.
+                    if self.game.selected_tile != selected:
+                        self.game.step(SelectTile(selected))
+                    self.hint = None
+                    return
+                self.game.step(action)
+        position = self.game.board.calc_coords(
+            *self.game.player.position, *hint.move.d_xy
+        )
+        self.hint = (self.game.n_moves, position)
+
+    def _poll_advisor(self) -> None:
+        # Never waits, so the hint improves over frames.
+        estimates = self.advisor.poll()
+        if self.hint is None or self.hint[0] != self.game.n_moves:
+            # Player moved before the search finished.
+            self.advisor.cancel()
+        elif estimates:
+            self._set_hint(estimates[0].hint, select=not self.advisor.searching)
+
+    def _try_step(self, action) -> None:
+        # Ignore any illegal input.
+        if self.game.is_legal(action):
+            if self.advisor is not None:
+                # Search was of the rack and selection before the action.
+                self.advisor.cancel()
+            self.game.step(action)
+            if isinstance(action, Move):
+                self.scroll = (0, 0)
+                # Saved once move is scored.
+                self._save_pending = self.autosave
+
+    def _get_clicked_d_xy(self) -> Tuple[int, int]:
+        x_px, y_px = pygame.mouse.get_pos()
+        current_x, current_y = self.game.player.position
+        origin_x, origin_y = self._get_view_origin()
+        clicked_x, clicked_y = (
+            origin_x + x_px // self.block_width,
+            origin_y + y_px // self.block_width,
+        )
+        d_x, d_y = (clicked_x - current_x, clicked_y - current_y)
+        size = self.game.board_dim
+        if size <= self.view_dim:
+            return (d_x, d_y)
+        # Shortest way around board so moves stay small on large boards.
+        return (
+            (d_x + size // 2) % size - size // 2,
+            (d_y + size // 2) % size - size // 2,
+        )
 
-    def _exec_move(self, d_xy: Tuple[int, int], current_char: str):
-        # Remove placed tile from tiles and replenish tiles.
-        self.current_tiles.pop(self.selected_tile)
+    def _get_view_origin(self) -> Tuple[int, int]:
+        """
+        Get board coords of the top left cell of view.
+        """
+        size = self.game.board_dim
+        if size <= self.view_dim:
+            return (0, 0)
+        x, y = self.game.player.position
+        return (
+            (x - self.view_dim // 2 + self.scroll[0]) % size,
+            (y - self.view_dim // 2 + self.scroll[1]) % size,
+        )
 
-        try:
-            if self.player.is_affected("ordered"):
-                next_letter = self._next_letter(current_char)
-                # Keep iterating until the next letter found from current character.
-                while next_letter not in self.bag:
-                    next_letter = self._next_letter(next_letter)
-
-                # Find index of next letter and remove it.
-                self.bag.remove(next_letter)
-                next_tile = next_letter
-            else:
-                next_tile = self.bag.popleft()
-            self.current_tiles.extend(next_tile)
-        except IndexError:
-            pass
-
-        # Mirror move by multiple change in x and y by -1.
-        if self.player.is_affected("mirror"):
-            mirrored_d_xy = [d_var * -1 for d_var in d_xy]
-            self.board.place_piece(mirrored_d_xy, current_char, update_player_pos=False)
-
-        # Place tile on board.
-        self.board.place_piece(d_xy, current_char)
-
-        # Decay any status effect.
-        for _, status in self.player.status.items():
-            status - 1
-
-    def _get_poss_new_coords(self, n_spaces) -> List[int]:
-        coords = []
-        for key, coord_change_func in self.MOVEMENT_KEYS.items():
-            # If player affected by diagonal, only move diagonally.
-            if all(
-                [
-                    self.player.is_affected("diagonal"),
-                    key not in self.MOVEMENT_DIAG_KEYS,
-                ]
-            ):
-                continue
+    def _to_view(self, origin, coords) -> Optional[Tuple[int, int]]:
+        """
+        Get view coords of board coords or None if not in view.
+        """
+        size = self.game.board_dim
+        x, y = ((coords[0] - origin[0]) % size, (coords[1] - origin[1]) % size)
+        if x < self.view_dim and y < self.view_dim:
+            return (x, y)
+        return None
 
-            coords.append(
-                self.board.calc_coords(
-                    *coord_change_func(n_spaces), *self.player.position
-                )
-            )
-        return coords
+    def _get_frame_state(self) -> Tuple:
+        """
+        Get everything shown on screen that can change between frames.
+        The board only changes when a move is made or its words are checked.
+        """
+        return (
+            self.game.n_moves,
+            self.validator.n_applied,
+            self.game.selected_tile,
+            tuple(self.game.current_tiles),
+            self.game.player.status.to_array().tobytes(),
+            self.game.player.score,
+            self.debug_mode,
+            self.hint,
+            self.scroll,
+            PROFILER.frames // self.OVERLAY_REFRESH_FRAMES if self.debug_mode else None,
+        )
 
     def _render_game_over(self, screen):
         pass
 
+    @profiled("render_frame")
+    def _render_frame(
+        self,
+        screen,
+        board_elems,
+        board_char_font,
+        ui_char_font,
+        possible_new_coords,
+        *,
+        full: bool = False,
+    ) -> List["pygame.Rect"]:
+        """
+        Repaint everything that changed since the last rendered frame.
+
+        :param full: repaint whole window.
+        :return: rects of window that were repainted.
+        """
+        # Render colors. If blind, disable.
+        move_colors = {}
+        if self.game.player.is_affected("blind") is False:
+            move_colors = dict(
+                zip(possible_new_coords, self.BOARD_GRID_POSSIBLE_MOVE_COLOR)
+            )
+        if self.hint is not None and self.hint[0] == self.game.n_moves:
+            move_colors[self.hint[1]] = self.BOARD_GRID_HINT_COLOR
+        view = self._get_view(move_colors)
+        lines = {**self._get_curr_chars_lines(), **self._get_stats_lines()}
+        overlay = self._get_overlay() if self.debug_mode else None
+
+        if full:
+            screen.fill(self.BOARD_BG_COLOR)
+            self._render_ui(screen)
+            self._render_board(screen, board_elems, board_char_font, view)
+            self._render_lines(screen, ui_char_font, lines)
+            dirty_rects = [screen.get_rect()]
+        else:
+            cells = self._get_dirty_cells(view)
+            # Board under old and new overlay is redrawn before overlay is drawn on top.
+            for rect in (self._shown_overlay_rect, overlay and overlay.get_rect()):
+                if rect is not None:
+                    cells.update(self._get_cells_under(board_elems, rect))
+            self._render_board(screen, board_elems, board_char_font, view, cells=cells)
+            dirty_rects = [board_elems.rects[x][y] for x, y in cells]
+            dirty_rects.extend(self._render_changed_lines(screen, ui_char_font, lines))
+
+        if overlay is not None:
+            screen.blit(overlay, (0, 0))
+            dirty_rects.append(overlay.get_rect())
+
+        # Store what is shown to compare against next frame.
+        self._shown_origin = view.origin
+        self._shown_view = view.codes
+        self._shown_word_mask = view.word_mask
+        self._shown_position = view.position
+        self._shown_move_colors = view.move_colors
+        self._shown_overlay_rect = overlay and overlay.get_rect()
+        self._shown_lines = {
+            slot: (text, ui_char_font.text(slot, text, self.BOARD_FONT_COLOR))
+            for slot, (text, _) in lines.items()
+        }
+        self._shown_line_rects = {
+            slot: surface.get_rect(topleft=lines[slot][1])
+            for slot, (_, surface) in self._shown_lines.items()
+        }
+        return dirty_rects
+
+    def _get_overlay(self) -> "pygame.Surface":
+        """
+        Render rolling percentiles of profiled stages on a translucent background.
+        """
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.SysFont("Courier", 14)
+        line_surfaces = [
+            self._overlay_font.render(line, True, self.OVERLAY_FONT_COLOR)
+            for line in PROFILER.overlay_lines()
+        ]
+        width = max(surface.get_width() for surface in line_surfaces) + 10
+        height = sum(surface.get_height() for surface in line_surfaces) + 10
+        overlay = pygame.Surface(
+            (min(width, self.WINDOW_X), min(height, self.WINDOW_X)), pygame.SRCALPHA
+        )
+        overlay.fill(self.OVERLAY_BG_COLOR)
+        y_px = 5
+        for surface in line_surfaces:
+            overlay.blit(surface, (5, y_px))
+            y_px += surface.get_height()
+        return overlay
+
+    def _get_cells_under(self, board_elems, rect) -> Set[Tuple[int, int]]:
+        n_x = min(-(-rect.right // self.block_width), self.view_dim)
+        n_y = min(-(-rect.bottom // self.block_width), self.view_dim)
+        return {(x, y) for x in range(n_x) for y in range(n_y)}
+
+    def _get_view(self, move_colors) -> BoardView:
+        """
+        Get cells in view. Only the view is read so cost doesn't grow with the board.
+
+        :param move_colors: highlight of board coords.
+        """
+        origin = self._get_view_origin()
+        size = self.game.board_dim
+        xs = (origin[0] + np.arange(self.view_dim)) % size
+        ys = (origin[1] + np.arange(self.view_dim)) % size
+        codes = self.game.board.window(xs, ys)
+        word_mask = self.game.word_index.window(xs, ys)
+        view_move_colors = {}
+        for coords, color in move_colors.items():
+            if (view_coords := self._to_view(origin, coords)) is not None:
+                view_move_colors[view_coords] = color
+        return BoardView(
+            origin,
+            codes,
+            word_mask,
+            self._to_view(origin, self.game.player.position),
+            view_move_colors,
+        )
+
+    def _get_dirty_cells(self, view: BoardView) -> Set[Tuple[int, int]]:
+        # View moved so every cell can have changed.
+        if view.origin != self._shown_origin:
+            return set(np.ndindex(view.codes.shape))
+        # Placed or erased tiles.
+        cells = {
+            (x, y) for x, y in np.argwhere(view.codes != self._shown_view).tolist()
+        }
+        # New or removed green tiles.
+        cells.update(
+            (x, y)
+            for x, y in np.argwhere(view.word_mask != self._shown_word_mask).tolist()
+        )
+        # Player highlight.
+        if view.position != self._shown_position:
+            cells.update(
+                coords
+                for coords in (view.position, self._shown_position)
+                if coords is not None
+            )
+        # Possible move highlights.
+        move_colors = view.move_colors
+        for coord in move_colors.keys() | self._shown_move_colors.keys():
+            if move_colors.get(coord) != self._shown_move_colors.get(coord):
+                cells.add(coord)
+        return cells
+
     def _render_ui(self, screen):
         x_ui_start_pos, y_ui_start_pos = [5, self.WINDOW_X + 5]
         # Draw UI bbox.
@@ -380,112 +606,175 @@ class Jumpbble:
         )
         pygame.draw.rect(screen, self.BOARD_FONT_COLOR, ui_rect, 2)
 
-    def _render_stats(self, screen, char_font):
+    def _render_lines(self, screen, char_font, lines, clip=None):
+        for slot, (text, pos) in lines.items():
+            surface = char_font.text(slot, text, self.BOARD_FONT_COLOR)
+            if clip is None or clip.colliderect(surface.get_rect(topleft=pos)):
+                screen.blit(surface, pos)
+
+    @profiled("render_lines")
+    def _render_changed_lines(self, screen, char_font, lines) -> List["pygame.Rect"]:
+        dirty_rects = []
+        for slot in [*lines, *(self._shown_lines.keys() - lines.keys())]:
+            shown_text, _ = self._shown_lines.get(slot, (None, None))
+            text, pos = lines.get(slot, (None, None))
+            if text == shown_text:
+                continue
+            # Area of old text needs to be cleared and area of new text drawn.
+            if shown_text is not None:
+                dirty_rects.append(self._shown_line_rects[slot])
+            if text is not None:
+                surface = char_font.text(slot, text, self.BOARD_FONT_COLOR)
+                dirty_rects.append(surface.get_rect(topleft=pos))
+
+        # Lines can overlap so redraw any line within a cleared area.
+        for rect in dirty_rects:
+            screen.set_clip(rect)
+            screen.fill(self.BOARD_BG_COLOR)
+            self._render_ui(screen)
+            self._render_lines(screen, char_font, lines, clip=rect)
+        screen.set_clip(None)
+        return dirty_rects
+
+    def _get_stats_lines(self) -> Dict[Tuple[str, int], Tuple[str, Tuple[int, int]]]:
         x_stat_start_pos, y_stat_start_pos = (200, self.WINDOW_X)
         current_effects = [
-            f"{status_name}: {status.turns}"
-            for status_name, status in self.player.status.items()
-            if status.turns != 0
+            f"{status_name}: {turns}"
+            for status_name, turns in self.game.player.status.as_dict().items()
+            if turns != 0
         ]
 
         stat_texts = [
-            f"Level: {self.player.level}",
-            f"Tiles Left: {len(self.bag)}",
-            f"Score: {self.player.score}",
-            f"Words: {len(self.all_words)}",
+            f"Level: {self.game.player.level}",
+            f"Tiles Left: {len(self.game.bag)}",
+            f"Score: {self.game.player.score}",
+            f"Words: {len(self.game.all_words)}",
             "Status:",
         ]
+        lines = {}
         for i, stat_text in enumerate(stat_texts, 1):
-            screen.blit(
-                char_font.render(stat_text, True, self.BOARD_FONT_COLOR),
+            lines[("stat", i)] = (
+                stat_text,
                 (x_stat_start_pos, y_stat_start_pos + (25 * i)),
             )
             if i == len(stat_texts):
                 for n_effect, effect in enumerate(current_effects, 1):
-                    effect = effect.capitalize()
-                    screen.blit(
-                        char_font.render(effect, True, self.BOARD_FONT_COLOR),
+                    lines[("effect", n_effect)] = (
+                        effect.capitalize(),
                         (
                             x_stat_start_pos + 25,
                             y_stat_start_pos + (25 * i) + (25 * n_effect),
                         ),
                     )
+        return lines
 
-    def _render_curr_chars(self, screen, char_font):
-
+    def _get_curr_chars_lines(
+        self,
+    ) -> Dict[Tuple[str, int], Tuple[str, Tuple[int, int]]]:
         x_curr_char_start_pos, y_curr_char_start_pos = (30, self.WINDOW_X)
 
-        for i, char in enumerate(self.current_tiles, 1):
-            curr_char_opt_text = f"{i} - {char} ({self.letter_spaces.get(char)})"
+        lines = {}
+        for i, char in enumerate(self.game.current_tiles, 1):
+            curr_char_opt_text = f"{i} - {char} ({self.game.letter_spaces.get(char)})"
             # Show selected char by adding '<'.
-            if i == (self.selected_tile + 1):
+            if i == (self.game.selected_tile + 1):
                 curr_char_opt_text = f"{curr_char_opt_text} <"
-            screen.blit(
-                char_font.render(curr_char_opt_text, True, self.BOARD_FONT_COLOR),
+            lines[("tile", i)] = (
+                curr_char_opt_text,
                 (x_curr_char_start_pos, y_curr_char_start_pos + (25 * i)),
             )
+        return lines
 
-    def _get_grid_elem(self) -> Dict[Tuple[int, int], Dict[str, Any]]:
-        ui_grid = defaultdict(dict)
-        for x in range(0, self.WINDOW_X, self.BOARD_BLOCK_WIDTH):
-            for y in range(0, self.WINDOW_X, self.BOARD_BLOCK_WIDTH):
-                rect = pygame.Rect(x, y, self.BOARD_BLOCK_WIDTH, self.BOARD_BLOCK_WIDTH)
-                x_coord, y_coord = (
-                    x // self.BOARD_BLOCK_WIDTH,
-                    y // self.BOARD_BLOCK_WIDTH,
-                )
-                ui_grid[(x_coord, y_coord)]["rect"] = rect
-                ui_grid[(x_coord, y_coord)]["px_coord"] = (x, y)
-        return ui_grid
-
-    def _render_block(self, screen, board_elems, x, y, char, char_font, block_color):
-        rect = board_elems[(x, y)]["rect"]
-        x_px_pos, y_px_pos = board_elems[(x, y)]["px_coord"]
-
-        if char is None:
-            # Render character in grid.
-            screen.blit(
-                char_font.render(char, True, self.BOARD_FONT_COLOR),
-                (x_px_pos, y_px_pos),
+    def _render_block(self, screen, board_elems, x, y, char_font, view):
+        rect = board_elems.rects[x][y]
+        board_char = self.game.board.decode(view.codes[x, y])
+
+        screen.fill(self.BOARD_BG_COLOR, rect)
+
+        # Render character in grid. Empty tiles have nothing to draw.
+        if board_char != self.game.board.EMPTY_CHAR:
+            # Format character so fit within grid.
+            if board_char == self.game.board.SPECIAL_TILE_CHAR:
+                char_pos = board_elems.special_char_pos[x][y]
+            else:
+                char_pos = board_elems.char_pos[x][y]
+            font_color = (
+                self.BOARD_WORD_COLOR if view.word_mask[x, y] else self.BOARD_FONT_COLOR
+            )
+            # Crop character to block so blocks can be redrawn independently.
+            crop = pygame.Rect(
+                0, 0, rect.right - char_pos[0], rect.bottom - char_pos[1]
+            )
+            screen.blit(char_font.glyph(board_char, font_color), char_pos, crop)
+
+        # Set border color for current tile player is on or possible move.
+        block_color = view.move_colors.get((x, y))
+        if block_color is None:
+            block_color = (
+                self.BOARD_GRID_PLAYER_COLOR
+                if (x, y) == view.position
+                else self.BOARD_GRID_COLOR
             )
 
         pygame.draw.rect(screen, block_color, rect, 2)
 
-    def _render_board(self, screen, board_elems, char_font):
-        for x in range(self.board.grid.shape[0]):
-            for y in range(self.board.grid.shape[1]):
-                rect = board_elems[(x, y)]["rect"]
-                x_px_pos, y_px_pos = board_elems[(x, y)]["px_coord"]
-
-                board_char = self.board.grid[x, y]
-
-                # Set border color for current tile player is on.
-                if (x, y) == self.player.position:
-                    block_color = self.BOARD_GRID_PLAYER_COLOR
-                else:
-                    block_color = self.BOARD_GRID_COLOR
-
-                # Format character so fit within grid.
-                if board_char == self.board.SPECIAL_TILE_CHAR:
-                    char_pos = (x_px_pos + 6, y_px_pos + 5)
-                else:
-                    char_pos = (x_px_pos + 3, y_px_pos + 3)
-
-                # Render character in grid.
-                font_color = (
-                    self.BOARD_WORD_COLOR
-                    if (x, y) in self.all_word_pos
-                    else self.BOARD_FONT_COLOR
-                )
-                screen.blit(char_font.render(board_char, True, font_color), char_pos)
+    @profiled("render_board")
+    def _render_board(self, screen, board_elems, char_font, view, cells=None):
+        """
+        Draw cells of view.
 
-                pygame.draw.rect(screen, block_color, rect, 2)
+        :param cells: view coords of cells to draw. Defaults to all.
+        """
+        if cells is None:
+            cells = np.ndindex(view.codes.shape)
+        for x, y in cells:
+            self._render_block(screen, board_elems, x, y, char_font, view)
 
-    def reset(self):
-        pass
+    def reset(self) -> None:
+        """
+        Start a new game with the same dictionary.
+        """
+        self.validator.clear()
+        if self.advisor is not None:
+            self.advisor.cancel()
+        self.game = GameState(self.game.dictionary, board_dim=self.game.board_dim)
+        self.game.word_validator = self.validator
+        self.game.set_recorder(self.recorder)
+        self.hint = None
+        self.scroll = (0, 0)
+
+    def load(self, path: Optional[str] = None) -> None:
+        """
+        Restore game from a snapshot. Defaults to SAVE_PATH.
+        """
+        # Scores of moves before loading don't apply to the loaded game.
+        self.validator.clear()
+        if self.advisor is not None:
+            self.advisor.cancel()
+        snapshot.load(self.game, path or self.SAVE_PATH)
+        self.hint = None
+        self.scroll = (0, 0)
+
+    def close(self) -> None:
+        """
+        Stop background word checks and any advisor workers. Writes any records left.
+        """
+        self.validator.close()
+        if self.advisor is not None:
+            self.advisor.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
-    def load(self):
-        pass
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write game to a snapshot. Defaults to SAVE_PATH.
+        """
+        self.validator.wait()
+        snapshot.save(self.game, path or self.SAVE_PATH)
 
-    def save(self):
-        pass
+    def save_journal(self, path: Optional[str] = None) -> None:
+        """
+        Write journal of every action of game. Defaults to JOURNAL_PATH.
+        """
+        self.validator.wait()
+        self.game.journal.save(self.game, path or self.JOURNAL_PATH)
@@ -0,0 +1,117 @@
+import json
+import time
+import random
+import asyncio
+import statistics
+from typing import Any, Dict, List
+
+from .moves import DIRECTIONS
+from .server import encode_message
+
+
+class _Client:
+    """
+    Session of one simulated player. Times each command from send to reply.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.latencies: List[float] = []
+        self.n_errors = 0
+
+    async def send(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+        line = await self.reader.readline()
+        self.latencies.append(time.perf_counter() - start)
+        if not line:
+            raise ConnectionError("Server closed session")
+        reply = json.loads(line)
+        if reply["op"] == "error":
+            self.n_errors += 1
+        return reply
+
+
+def _random_command(update: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """
+    Get a random command that is legal in the state of an update.
+    """
+    if rng.random() < 0.2 and len(update["tiles"]) > 1:
+        return {"op": "select", "tile": rng.randrange(len(update["tiles"]))}
+    if update["anywhere"]:
+        # Shortest offsets to every cell, as a player would jump.
+        size = update["board_dim"]
+        half = size // 2
+        return {
+            "op": "move",
+            "d_xy": [rng.randrange(size) - half, rng.randrange(size) - half],
+        }
+    dx, dy = DIRECTIONS[rng.choice(update["directions"])]
+    n_spaces = update["spaces"]
+    return {"op": "move", "d_xy": [dx * n_spaces, dy * n_spaces]}
+
+
+async def _play(path: str, n_commands: int, seed: int) -> _Client:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(path)
+    client = _Client(reader, writer)
+    try:
+        update = await client.send({"op": "new", "seed": seed})
+        for _ in range(n_commands):
+            if update["op"] == "error":
+                raise ConnectionError(update["error"])
+            if update["over"]:
+                command = {"op": "new", "seed": rng.randrange(2**63)}
+            else:
+                command = _random_command(update, rng)
+            if (reply := await client.send(command))["op"] == "update":
+                update = reply
+    finally:
+        writer.close()
+    return client
+
+
+async def run_load(
+    path: str, n_sessions: int, n_commands: int, *, seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Play random games in many sessions at once against a server.
+
+    :param path: path of server's unix socket.
+    :param n_sessions: number of concurrent sessions.
+    :param n_commands: number of commands sent by each session.
+    :param seed: seed of first session. Session n is seeded with seed + n.
+    :return: throughput and latency percentiles in ms.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_play(path, n_commands, seed + n) for n in range(n_sessions)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    clients = [result for result in results if isinstance(result, _Client)]
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    report = {
+        "sessions": n_sessions,
+        "failed_sessions": n_sessions - len(clients),
+        "commands": len(latencies),
+        "errors": sum(client.n_errors for client in clients),
+        "elapsed": elapsed,
+        "commands_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+    }
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        report.update(
+            {
+                "p50_ms": cuts[49] * 1000,
+                "p95_ms": cuts[94] * 1000,
+                "p99_ms": cuts[98] * 1000,
+                "max_ms": latencies[-1] * 1000,
+            }
+        )
+    return report
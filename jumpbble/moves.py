@@ -0,0 +1,170 @@
+import numpy as np
+from collections import OrderedDict
+from collections import abc
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .actions import Move
+
+Coords = Tuple[int, int]
+
+# Unit change in x and y for each direction. Diagonal directions are last.
+DIRECTIONS = {
+    "up": (0, -1),
+    "left": (-1, 0),
+    "down": (0, 1),
+    "right": (1, 0),
+    "up_left": (-1, -1),
+    "up_right": (1, -1),
+    "down_left": (-1, 1),
+    "down_right": (1, 1),
+}
+ALL_DIRECTIONS = tuple(DIRECTIONS)
+DIAGONAL_DIRECTIONS = ("up_left", "up_right", "down_left", "down_right")
+
+
+class Reach:
+    """
+    Cells a player can move to, in the order of the directions they were computed for.
+    """
+
+    __slots__ = ("offsets", "coords", "members", "_cells")
+
+    def __init__(self, offsets: Tuple[Coords, ...], coords: Tuple[Coords, ...]) -> None:
+        """
+        :param offsets: change in x and y of each move. Not wrapped.
+        :param coords: wrapped board coords of each move.
+        """
+        self.offsets = offsets
+        self.coords = coords
+        # For O(1) membership checks. ex. if a clicked cell can be moved to.
+        self.members: FrozenSet[Coords] = frozenset(coords)
+        self._cells: Optional[np.ndarray] = None
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        Coords as a read-only array of shape (directions, 2). Built on first use.
+        """
+        if self._cells is None:
+            cells = np.array(self.coords, dtype=np.intp).reshape(-1, 2)
+            cells.setflags(write=False)
+            self._cells = cells
+        return self._cells
+
+
+class JumpMoves(abc.Sequence):
+    """
+    Moves from a position to every cell of a board, by x then y. Each is made when read, so
+    holding them costs nothing however large the board.
+    """
+
+    __slots__ = ("position", "size")
+
+    def __init__(self, position: Coords, size: int) -> None:
+        self.position = position
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size * self.size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Move, List[Move]]:
+        if isinstance(index, slice):
+            return [self._move(i) for i in range(len(self))[index]]
+        # Bounds and negative indices as a list would.
+        return self._move(range(len(self))[index])
+
+    def _move(self, i: int) -> Move:
+        x, y = divmod(i, self.size)
+        return Move((x - self.position[0], y - self.position[1]))
+
+    def __iter__(self) -> Iterator[Move]:
+        for i in range(len(self)):
+            yield self._move(i)
+
+    def __contains__(self, move: object) -> bool:
+        if not isinstance(move, Move):
+            return False
+        return all(
+            0 <= coord + d < self.size for coord, d in zip(self.position, move.d_xy)
+        )
+
+
+class MoveTable:
+    """
+    Cells reachable by a move from each position on a board that wraps around its edges.
+
+    Each (position, n_spaces, directions) is computed once on first use and kept in a bounded
+    least-recently-used table. Shared by the engine, solver and anything else that needs to
+    know where a player can move.
+    """
+
+    MAXSIZE = 16384
+
+    def __init__(self, size: int, maxsize: int = MAXSIZE) -> None:
+        """
+        :param size: number of cells per side of board.
+        :param maxsize: most positions kept.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Table size must be at least 1: {maxsize}")
+        self.size = size
+        self.maxsize = maxsize
+        self._offsets: Dict[Tuple[int, Tuple[str, ...]], Tuple[Coords, ...]] = {}
+        self._reach: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._reach)
+
+    def offsets(self, n_spaces: int, directions: Sequence[str]) -> Tuple[Coords, ...]:
+        """
+        Get change in x and y of a move in each direction. Doesn't depend on position.
+        """
+        key = (n_spaces, tuple(directions))
+        if (offsets := self._offsets.get(key)) is None:
+            offsets = tuple(
+                (dx * n_spaces, dy * n_spaces)
+                for dx, dy in (DIRECTIONS[name] for name in key[1])
+            )
+            self._offsets[key] = offsets
+        return offsets
+
+    def get(self, position: Coords, n_spaces: int, directions: Sequence[str]) -> Reach:
+        """
+        Get every cell reachable from a position.
+
+        :param position: board coords moved from.
+        :param n_spaces: number of spaces moved.
+        :param directions: names of directions allowed. ex. ALL_DIRECTIONS
+        """
+        directions = tuple(directions)
+        key = (position, n_spaces, directions)
+        try:
+            reach = self._reach[key]
+        except KeyError:
+            pass
+        else:
+            self._reach.move_to_end(key)
+            return reach
+
+        # Few directions so plain ints are faster than building arrays first.
+        offsets = self.offsets(n_spaces, directions)
+        x, y = position
+        size = self.size
+        reach = Reach(
+            offsets, tuple(((x + dx) % size, (y + dy) % size) for dx, dy in offsets)
+        )
+
+        self._reach[key] = reach
+        # Evict least recently used position.
+        if len(self._reach) > self.maxsize:
+            self._reach.popitem(last=False)
+        return reach
+
+    def is_reachable(
+        self,
+        position: Coords,
+        n_spaces: int,
+        directions: Sequence[str],
+        coords: Coords,
+    ) -> bool:
+        return coords in self.get(position, n_spaces, directions).members
@@ -1,13 +1,38 @@
+import numpy as np
+from typing import Dict, Iterator, Tuple
+
+# Order of statuses in status arrays. Also the bit of each status in active masks.
+STATUS_NAMES = ("mirror", "diagonal", "ordered", "wildcard", "jump", "blind", "erase")
+STATUS_IDX = {name: i for i, name in enumerate(STATUS_NAMES)}
+STATUS_BITS = {name: 1 << i for i, name in enumerate(STATUS_NAMES)}
+_BIT_VALUES = np.array([1 << i for i in range(len(STATUS_NAMES))], dtype=np.int64)
+
+
 class Status:
-    def __init__(self, turns: int) -> None:
-        self.turns = turns
+    """
+    View of the turns left of one status. Changes are written to the player's statuses.
+    """
+
+    __slots__ = ("_statuses", "idx")
+
+    def __init__(self, statuses: "Statuses", idx: int) -> None:
+        self._statuses = statuses
+        self.idx = idx
+
+    @property
+    def name(self) -> str:
+        return STATUS_NAMES[self.idx]
+
+    @property
+    def turns(self) -> int:
+        return int(self._statuses._turns[self.idx])
 
-    def __add__(self, n_turns):
-        self.turns += n_turns
+    @turns.setter
+    def turns(self, turns: int) -> None:
+        self._statuses.set(self.name, turns)
 
-    def __sub__(self, n_turns):
-        if self.turns > 0:
-            self.turns -= n_turns
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(turns={self.turns})"
 
 
 class Diagonal(Status):
@@ -15,8 +40,7 @@ class Diagonal(Status):
     Must place pieces diagonally.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Ordered(Status):
@@ -24,8 +48,7 @@ class Ordered(Status):
     Letters become ordered.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Wildcard(Status):
@@ -33,8 +56,7 @@ class Wildcard(Status):
     Allows selecting any piece from bag.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Jump(Status):
@@ -42,8 +64,7 @@ class Jump(Status):
     Ignore tile value and place on any position on board.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Blind(Status):
@@ -51,8 +72,7 @@ class Blind(Status):
     Disables viewing piece.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Erase(Status):
@@ -60,8 +80,7 @@ class Erase(Status):
     Piece placement erases pre-existing pieces.
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
 
 
 class Mirror(Status):
@@ -69,8 +88,114 @@ class Mirror(Status):
     Piece placement is mirrored. This ignores tile availabililty
     """
 
-    def __init__(self, turns: int) -> None:
-        super().__init__(turns)
+    __slots__ = ()
+
+
+_STATUS_TYPES = {
+    "mirror": Mirror,
+    "diagonal": Diagonal,
+    "ordered": Ordered,
+    "wildcard": Wildcard,
+    "jump": Jump,
+    "blind": Blind,
+    "erase": Erase,
+}
+
+
+class Statuses:
+    """
+    Turns left of every status in one array, in the order of STATUS_NAMES.
+
+    Reads like a dict of Status views by name. A bitmask of active statuses is kept up to
+    date so checking a status is one bit test.
+    """
+
+    __slots__ = ("_turns", "active", "_expires_in", "_views")
+
+    def __init__(self) -> None:
+        self._turns = np.zeros(len(STATUS_NAMES), dtype=np.int32)
+        # Bit of each status with turns left. See STATUS_BITS.
+        self.active = 0
+        # Decays until the first status with turns left could run out. 0 if none.
+        self._expires_in = 0
+        self._views = tuple(
+            _STATUS_TYPES[name](self, i) for i, name in enumerate(STATUS_NAMES)
+        )
+
+    def __len__(self) -> int:
+        return len(STATUS_NAMES)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STATUS_NAMES)
+
+    def __contains__(self, name: str) -> bool:
+        return name in STATUS_IDX
+
+    def __getitem__(self, name: str) -> Status:
+        return self._views[STATUS_IDX[name]]
+
+    def get(self, name: str, default=None):
+        if (idx := STATUS_IDX.get(name)) is None:
+            return default
+        return self._views[idx]
+
+    def items(self) -> Iterator[Tuple[str, Status]]:
+        return zip(STATUS_NAMES, self._views)
+
+    def values(self) -> Tuple[Status, ...]:
+        return self._views
+
+    def _update_active(self) -> None:
+        turns = self._turns
+        self.active = int((turns != 0) @ _BIT_VALUES)
+        positive = turns[turns > 0]
+        self._expires_in = int(positive.min()) if positive.size else 0
+
+    def set(self, name: str, turns: int) -> None:
+        self._turns[STATUS_IDX[name]] = turns
+        self._update_active()
+
+    def add(self, name: str, n_turns: int) -> None:
+        """
+        Add turns to a status. ex. when an effect is rolled.
+        """
+        idx = STATUS_IDX[name]
+        turns = int(self._turns[idx]) + n_turns
+        self._turns[idx] = turns
+        if turns > 0 and n_turns >= 0:
+            # Can only run out later than before. Checking early is harmless.
+            self.active |= 1 << idx
+            self._expires_in = min(self._expires_in or turns, turns)
+        else:
+            self._update_active()
+
+    def decay(self) -> None:
+        """
+        Take a turn off every status with turns left.
+        """
+        if self._expires_in:
+            turns = self._turns
+            np.subtract(turns, turns > 0, out=turns, casting="unsafe")
+            self._expires_in -= 1
+            # Active statuses only change when one runs out.
+            if not self._expires_in:
+                self._update_active()
+
+    def to_array(self) -> np.ndarray:
+        """
+        Get a copy of the turns of every status.
+        """
+        return self._turns.copy()
+
+    def load(self, turns: np.ndarray) -> None:
+        """
+        Set the turns of every status. ex. from a snapshot.
+        """
+        self._turns[:] = turns
+        self._update_active()
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(zip(STATUS_NAMES, self._turns.tolist()))
 
 
 class Player:
@@ -79,25 +204,17 @@ class Player:
         self.status_decay = 3
         self.experience = 0
         self.position = position
-        self.status = {
-            "mirror": Mirror(0),
-            "diagonal": Diagonal(0),
-            "ordered": Ordered(0),
-            "wildcard": Wildcard(0),
-            "jump": Jump(0),
-            "blind": Blind(0),
-            "erase": Erase(0),
-        }
+        self.status = Statuses()
 
     @property
     def level(self):
         return self.score // 10
 
     def is_affected(self, status: str) -> bool:
-        if status_effect := self.status.get(status):
-            if status_effect.turns != 0:
-                return True
-            else:
-                return False
-        else:
-            print(f"Not a valid status effect: {status}")
+        """
+        :raises ValueError: if status doesn't exist.
+        """
+        try:
+            return self.status.active & STATUS_BITS[status] != 0
+        except KeyError:
+            raise ValueError(f"Not a valid status effect: {status}") from None
@@ -0,0 +1,191 @@
+import gc
+import sys
+import json
+import time
+import functools
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        self.profiler._frame[self.name] += elapsed_ms
+        self.profiler._frame_calls[self.name] += 1
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """
+    Timers and counters of hot paths summed per frame.
+
+    Keeps the last window of frames to give rolling percentiles. Does nothing until enabled.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window: int = 300) -> None:
+        """
+        :param window: number of frames kept.
+        """
+        self.enabled = False
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.window)
+        )
+        self.totals: Dict[str, float] = defaultdict(float)
+        self._frame: Dict[str, float] = defaultdict(float)
+        self._frame_calls: Dict[str, int] = defaultdict(int)
+        self._frame_start = time.perf_counter()
+        self._blocks_start = sys.getallocatedblocks()
+        self._gc_start = self._gc_collections()
+
+    @staticmethod
+    def _gc_collections() -> int:
+        return sum(gen["collections"] for gen in gc.get_stats())
+
+    def timer(self, name: str):
+        """
+        Time a block. Time is added to the current frame.
+
+        :param name: name of stage.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Add to a counter of the current frame.
+        """
+        if self.enabled:
+            self._frame[name] += n
+
+    def start_frame(self) -> None:
+        self._frame_start = time.perf_counter()
+        self._blocks_start = sys.getallocatedblocks()
+        self._gc_start = self._gc_collections()
+
+    def end_frame(self) -> None:
+        """
+        Store timers and counters of the frame.
+        Frame time is time since start_frame, excluding any sleep after.
+        """
+        if not self.enabled:
+            return
+        frame = self._frame
+        frame["frame"] = (time.perf_counter() - self._frame_start) * 1000
+        # Net blocks allocated and collections during frame.
+        frame["alloc_blocks"] = sys.getallocatedblocks() - self._blocks_start
+        frame["gc"] = self._gc_collections() - self._gc_start
+        for name in self.samples.keys() | frame.keys():
+            value = frame.get(name, 0.0)
+            self.samples[name].append(value)
+            self.totals[name] += value
+        for name, calls in self._frame_calls.items():
+            self.totals[f"{name}_calls"] += calls
+
+        self.frames += 1
+        self._frame = defaultdict(float)
+        self._frame_calls = defaultdict(int)
+
+    def percentiles(self, name: str) -> Dict[str, float]:
+        """
+        Get rolling percentiles of a timer or counter per frame.
+        """
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return {f"p{p}": 0.0 for p in self.PERCENTILES}
+        return {
+            f"p{p}": samples[min(len(samples) - 1, len(samples) * p // 100)]
+            for p in self.PERCENTILES
+        }
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get percentiles, max and mean per frame of each timer and counter.
+        """
+        report = {}
+        for name, samples in sorted(self.samples.items()):
+            report[name] = {
+                **self.percentiles(name),
+                "max": max(samples, default=0.0),
+                "mean": sum(samples) / len(samples) if samples else 0.0,
+            }
+        return report
+
+    def overlay_lines(self) -> List[str]:
+        """
+        Get lines of text summarizing the report. Times are in ms.
+        """
+        lines = [f"{'stage':<14}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, stats in self.report().items():
+            lines.append(
+                f"{name:<14}{stats['p50']:>7.1f}{stats['p95']:>7.1f}{stats['p99']:>7.1f}"
+            )
+        return lines
+
+    def dump(self, path: str) -> None:
+        """
+        Write report, totals and samples of the window to a JSON file.
+        """
+        with open(path, "w") as json_stream:
+            json.dump(
+                {
+                    "frames": self.frames,
+                    "window": self.window,
+                    "report": self.report(),
+                    "totals": dict(self.totals),
+                    "samples": {name: list(s) for name, s in self.samples.items()},
+                },
+                json_stream,
+                indent=4,
+            )
+
+
+# Shared by the engine and client. Enabled by debug mode.
+PROFILER = Profiler()
+
+
+def profiled(name: str) -> Callable:
+    """
+    Time every call of a function with the shared profiler.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _Timer(PROFILER, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
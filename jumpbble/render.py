@@ -0,0 +1,108 @@
+import numpy as np
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from .lazy import lazy_import
+
+# Only loaded when a window is opened or text is rendered.
+pygame = lazy_import("pygame")
+
+Color = Tuple[int, int, int]
+
+
+class BoardView(NamedTuple):
+    """
+    Cells of board in view. Everything except origin is in view coords.
+    """
+
+    # Board coords of top left cell.
+    origin: Tuple[int, int]
+    codes: np.ndarray
+    # If each cell is part of a valid word.
+    word_mask: np.ndarray
+    # None if player isn't in view.
+    position: Optional[Tuple[int, int]]
+    move_colors: Dict[Tuple[int, int], Color]
+
+
+class GlyphCache:
+    """
+    Cache of rendered text surfaces for a single font.
+    """
+
+    def __init__(self, font: "pygame.font.Font") -> None:
+        self.font = font
+        self._glyphs: Dict[Tuple[str, Color], pygame.Surface] = {}
+        self._texts: Dict[Hashable, Tuple[str, Color, pygame.Surface]] = {}
+
+    def glyph(self, char: str, color: Color) -> "pygame.Surface":
+        """
+        Get surface of a character. Each character and color is only rendered once.
+        """
+        key = (char, color)
+        if (surface := self._glyphs.get(key)) is None:
+            surface = self.font.render(char, True, color)
+            self._glyphs[key] = surface
+        return surface
+
+    def text(self, slot: Hashable, text: str, color: Color) -> "pygame.Surface":
+        """
+        Get surface of a line of text. Kept until the text in the slot changes.
+
+        :param slot: key of where text is drawn. ex. ("stat", 1)
+        :param text: text to render.
+        :param color: font color.
+        :return: rendered text.
+        """
+        cached = self._texts.get(slot)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return cached[2]
+
+        surface = self.font.render(text, True, color)
+        self._texts[slot] = (text, color, surface)
+        return surface
+
+    def clear(self) -> None:
+        self._glyphs.clear()
+        self._texts.clear()
+
+
+class GridLayout:
+    """
+    Precomputed rects and pixel positions of each block in view.
+    Indexed by view coordinates. ex. rects[x][y]
+    """
+
+    CHAR_OFFSET = (3, 3)
+    SPECIAL_CHAR_OFFSET = (6, 5)
+
+    def __init__(self, board_dim: int, block_width: int) -> None:
+        self.board_dim = board_dim
+        self.block_width = block_width
+        self.rects: List[List[pygame.Rect]] = []
+        self.px_coords: List[List[Tuple[int, int]]] = []
+        self.char_pos: List[List[Tuple[int, int]]] = []
+        self.special_char_pos: List[List[Tuple[int, int]]] = []
+
+        for x in range(board_dim):
+            x_px = x * block_width
+            y_pxs = [y * block_width for y in range(board_dim)]
+            self.rects.append(
+                [pygame.Rect(x_px, y_px, block_width, block_width) for y_px in y_pxs]
+            )
+            self.px_coords.append([(x_px, y_px) for y_px in y_pxs])
+            # Format character so fit within grid.
+            self.char_pos.append(
+                [
+                    (x_px + self.CHAR_OFFSET[0], y_px + self.CHAR_OFFSET[1])
+                    for y_px in y_pxs
+                ]
+            )
+            self.special_char_pos.append(
+                [
+                    (
+                        x_px + self.SPECIAL_CHAR_OFFSET[0],
+                        y_px + self.SPECIAL_CHAR_OFFSET[1],
+                    )
+                    for y_px in y_pxs
+                ]
+            )
@@ -0,0 +1,253 @@
+import os
+import time
+import random
+import multiprocessing
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .dictionary import open_dictionary
+from .engine import Action, GameState, Move, SelectTile
+from .journal import Journal, Summary, verify
+from .solver import Solver
+from .telemetry import Recorder
+
+# Returns actions of a turn. May change the selected tile while searching.
+Policy = Callable[[GameState, random.Random], List[Action]]
+
+# Dictionary of each worker process. Loaded once per process.
+_DICTIONARY = None
+# Word cache and move table of each worker process, shared by every journal it replays.
+_REPLAY_SHARED: Optional[GameState] = None
+
+
+def move_points(state: GameState, move: Move) -> int:
+    """
+    Get points of new words made through the target position of a move with the selected tile.
+    The board is left unchanged. Effects and mirrored placement are ignored.
+    """
+    board = state.board
+    x, y = board.calc_coords(*state.player.position, *move.d_xy)
+    landed_on_tile = board.grid[x, y]
+    if landed_on_tile not in (
+        board.EMPTY_CODE,
+        board.SPECIAL_TILE_CODE,
+    ) and not state.player.is_affected("erase"):
+        return 0
+
+    new_words = board.words_if_placed([(x, y)], state.current_char) - state.all_words
+    return sum(state._get_score(word) for word in new_words)
+
+
+def random_policy(state: GameState, rng: random.Random) -> List[Action]:
+    """
+    Place a random tile on a random legal position.
+    """
+    tile = rng.randrange(len(state.current_tiles))
+    state.step(SelectTile(tile))
+    return [SelectTile(tile), rng.choice(state.legal_moves())]
+
+
+def greedy_policy(state: GameState, rng: random.Random) -> List[Action]:
+    """
+    Place the tile and position that makes the most points this turn. Ties are random.
+    """
+    best_points, best_actions = -1, []
+    for tile in range(len(state.current_tiles)):
+        state.step(SelectTile(tile))
+        for move in state.legal_moves():
+            points = move_points(state, move)
+            if points > best_points:
+                best_points, best_actions = points, [(tile, move)]
+            elif points == best_points:
+                best_actions.append((tile, move))
+
+    tile, move = rng.choice(best_actions)
+    return [SelectTile(tile), move]
+
+
+def solver_policy(state: GameState, rng: random.Random) -> List[Action]:
+    """
+    Place the best tile found by the solver, including any wildcard letter.
+    """
+    hint = Solver(state).best(1)[0]
+    return hint.actions(state)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "solver": solver_policy,
+}
+
+
+def play_game(
+    policy: Policy,
+    seed: int,
+    dictionary: Optional[Any] = None,
+    telemetry_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Play a complete game headlessly.
+
+    :param policy: function that returns the actions of a turn.
+    :param seed: seed of game and policy.
+    :param dictionary: word checker. Defaults to enchant en_US.
+    :param telemetry_path: directory to record every move to. Not recorded if not given.
+    :return: results of game. The journal is encoded as bytes.
+    """
+    state = GameState(dictionary, seed=seed)
+    rng = random.Random(f"policy-{seed}")
+    recorder = Recorder(telemetry_path) if telemetry_path else None
+    state.set_recorder(recorder)
+
+    start = time.perf_counter()
+    while not state.is_over:
+        for action in policy(state, rng):
+            state.step(action)
+    if recorder is not None:
+        recorder.close()
+
+    return {
+        "seed": seed,
+        "score": state.player.score,
+        "words": sorted(state.all_words),
+        "effects": dict(state.board.effects_triggered),
+        "tiles_left": len(state.bag),
+        "moves": state.n_moves,
+        "time": time.perf_counter() - start,
+        "journal": state.journal.to_bytes(Summary.of(state)),
+    }
+
+
+class BatchReport:
+    """
+    Aggregate results of games as they complete.
+    """
+
+    def __init__(self) -> None:
+        self.n_games = 0
+        self.total_score = 0
+        self.min_score = None
+        self.max_score = None
+        self.total_words = 0
+        self.total_moves = 0
+        self.total_tiles_left = 0
+        self.effects = Counter()
+        self.start = time.perf_counter()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        score = result["score"]
+        self.n_games += 1
+        self.total_score += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.total_words += len(result["words"])
+        self.total_moves += result["moves"]
+        self.total_tiles_left += result["tiles_left"]
+        self.effects.update(result["effects"])
+
+    def summary(self) -> Dict[str, Any]:
+        n_games = max(self.n_games, 1)
+        elapsed = time.perf_counter() - self.start
+        return {
+            "games": self.n_games,
+            "mean_score": self.total_score / n_games,
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "mean_words": self.total_words / n_games,
+            "mean_moves": self.total_moves / n_games,
+            "mean_tiles_left": self.total_tiles_left / n_games,
+            "effects": dict(self.effects),
+            "elapsed": elapsed,
+            "games_per_sec": self.n_games / elapsed if elapsed else 0.0,
+        }
+
+
+def _init_worker(words_path: Optional[str]) -> None:
+    global _DICTIONARY
+    _DICTIONARY = open_dictionary(words_path)
+
+
+def _play_worker(args) -> Dict[str, Any]:
+    policy_name, seed, telemetry_dir = args
+    telemetry_path = (
+        os.path.join(telemetry_dir, f"game-{seed}") if telemetry_dir else None
+    )
+    result = play_game(POLICIES[policy_name], seed, _DICTIONARY, telemetry_path)
+    result["policy"] = policy_name
+    return result
+
+
+def run_games(
+    n_games: int,
+    policy_name: str = "random",
+    *,
+    seed: int = 0,
+    processes: Optional[int] = None,
+    words_path: Optional[str] = None,
+    telemetry_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Play games across a process pool. Game n is seeded with seed + n.
+
+    :param n_games: number of games.
+    :param policy_name: name of policy in POLICIES.
+    :param seed: seed of first game.
+    :param processes: number of worker processes. Defaults to number of cores.
+    :param words_path: compiled word graph or word list used as dictionary. Defaults to
+        enchant en_US.
+    :param telemetry_dir: directory to record moves of games to. Game of seed n is recorded
+        to game-n in it.
+    :return: results of each game in order of completion.
+    """
+    if policy_name not in POLICIES:
+        raise ValueError(f"Not a valid policy: {policy_name}")
+
+    processes = processes or multiprocessing.cpu_count()
+    tasks = [(policy_name, seed + n, telemetry_dir) for n in range(n_games)]
+    # Small chunks keep workers busy while still streaming results.
+    chunksize = max(1, min(16, n_games // (processes * 4)))
+
+    with multiprocessing.Pool(
+        processes, initializer=_init_worker, initargs=(words_path,)
+    ) as pool:
+        yield from pool.imap_unordered(_play_worker, tasks, chunksize=chunksize)
+
+
+def _verify_worker(path: str) -> Dict[str, Any]:
+    global _REPLAY_SHARED
+    journal, summary = Journal.load(path)
+    start = time.perf_counter()
+    if _REPLAY_SHARED is None:
+        _REPLAY_SHARED = GameState(_DICTIONARY, board_dim=journal.board_dim)
+    ok, replayed = verify(journal, summary, _DICTIONARY, shared=_REPLAY_SHARED)
+    return {
+        "path": path,
+        "ok": ok,
+        "expected": summary._asdict(),
+        "replayed": replayed._asdict(),
+        "time": time.perf_counter() - start,
+    }
+
+
+def verify_journals(
+    paths: List[str],
+    *,
+    processes: Optional[int] = None,
+    words_path: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Replay journals across a process pool and check each final state.
+
+    :param paths: journal files.
+    :param processes: number of worker processes. Defaults to number of cores.
+    :param words_path: compiled word graph or word list used as dictionary. Defaults to
+        enchant en_US.
+    :return: result of each journal in order of completion.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    chunksize = max(1, min(16, len(paths) // (processes * 4)))
+    with multiprocessing.Pool(
+        processes, initializer=_init_worker, initargs=(words_path,)
+    ) as pool:
+        yield from pool.imap_unordered(_verify_worker, paths, chunksize=chunksize)
@@ -0,0 +1,340 @@
+import json
+import time
+import asyncio
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from .actions import Action, Move, SelectTile, SetWildcard
+from .dictionary import open_dictionary
+from .engine import GameState
+
+# Longest command accepted. Longer lines close the connection.
+MAX_LINE = 4096
+# Largest change in x or y of a move. Boards are at most 65535 cells per side.
+MAX_OFFSET = 65535
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Encode a message as one line of JSON.
+    """
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def parse_action(message: Dict[str, Any]) -> Action:
+    """
+    Get action of a command.
+
+    :raises ValueError: if command isn't an action or is malformed.
+    """
+    op = message.get("op")
+    if op not in ("move", "select", "wildcard"):
+        raise ValueError(f"Unknown command: {op}")
+    try:
+        if op == "move":
+            dx, dy = message["d_xy"]
+            action = Move((int(dx), int(dy)))
+        elif op == "select":
+            action = SelectTile(int(message["tile"]))
+        else:
+            action = SetWildcard(str(message["letter"]).upper())
+    except (KeyError, TypeError, ValueError, OverflowError):
+        # Infinite offsets overflow.
+        raise ValueError(f"Malformed {op} command") from None
+    if op == "move" and max(map(abs, action.d_xy)) > MAX_OFFSET:
+        raise ValueError(f"Move is further than {MAX_OFFSET} cells: {action.d_xy}")
+    return action
+
+
+class Session:
+    """
+    Headless game of one connection and what it has cost the server.
+    """
+
+    __slots__ = (
+        "id",
+        "state",
+        "writer",
+        "created",
+        "last_active",
+        "cpu_time",
+        "n_commands",
+    )
+
+    def __init__(self, session_id: int, state: GameState, writer: asyncio.StreamWriter):
+        self.id = session_id
+        self.state = state
+        self.writer = writer
+        self.created = self.last_active = time.monotonic()
+        # Seconds of CPU spent on commands of session.
+        self.cpu_time = 0.0
+        self.n_commands = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "score": self.state.score,
+            "moves": self.state.n_moves,
+            "commands": self.n_commands,
+            "cpu_time": self.cpu_time,
+            "idle": time.monotonic() - self.last_active,
+        }
+
+
+class GameServer:
+    """
+    Many headless games served from one process over a local socket.
+
+    Each connection is a session with its own game. Commands and replies are lines of JSON.
+    A session's commands are handled one at a time and the next isn't read until the reply
+    is sent, so clients that send faster than they read are slowed down by their socket
+    instead of queueing work on the server.
+
+    Commands:
+    * {"op": "new", "seed": 1}: start a new game. Seed is optional.
+    * {"op": "move", "d_xy": [dx, dy]}, {"op": "select", "tile": 0},
+      {"op": "wildcard", "letter": "A"}: apply an action. Replies with an update holding
+      the board cells changed, the score and the new rack.
+    * {"op": "view", "x": 0, "y": 0, "size": 15}: get letters of a square of the board.
+    * {"op": "stats"}: get server stats.
+    """
+
+    def __init__(
+        self,
+        dictionary: Optional[Any] = None,
+        *,
+        board_dim: Optional[int] = None,
+        max_sessions: int = 1024,
+        idle_timeout: float = 300.0,
+    ) -> None:
+        """
+        :param dictionary: word checker shared by every session. Defaults to enchant en_US.
+        :param board_dim: number of cells per side of each board. Defaults to BOARD_DIM.
+        :param max_sessions: most sessions at once. Connections over it are refused.
+        :param idle_timeout: seconds without a command before a session is evicted.
+        """
+        if max_sessions < 1:
+            raise ValueError(f"Must allow at least 1 session: {max_sessions}")
+        if idle_timeout <= 0:
+            raise ValueError(f"Idle timeout must be positive: {idle_timeout}")
+        self.dictionary = open_dictionary() if dictionary is None else dictionary
+        self.board_dim = board_dim
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions: Dict[int, Session] = {}
+        self.n_sessions = 0
+        self.n_refused = 0
+        self.n_evicted = 0
+        self.n_commands = 0
+        # CPU of sessions that have ended.
+        self.closed_cpu_time = 0.0
+        # Word scores don't depend on the game, so every session shares one cache.
+        self._word_cache = None
+        # Nor do the cells reachable from each position, since every board has one size.
+        self._moves = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def new_game(self, seed: Optional[int] = None) -> GameState:
+        state = GameState(self.dictionary, seed=seed, board_dim=self.board_dim)
+        if self._word_cache is None:
+            self._word_cache = state.word_cache
+        state.word_cache = self._word_cache
+        if self._moves is None:
+            self._moves = state.moves
+        state.moves = self._moves
+        return state
+
+    def stats(self) -> Dict[str, Any]:
+        sessions = [session.stats() for session in self.sessions.values()]
+        cpu_time = self.closed_cpu_time + sum(
+            session["cpu_time"] for session in sessions
+        )
+        sessions.sort(key=lambda session: session["cpu_time"], reverse=True)
+        return {
+            "sessions": len(sessions),
+            "total_sessions": self.n_sessions,
+            "refused": self.n_refused,
+            "evicted": self.n_evicted,
+            "commands": self.n_commands,
+            "cpu_time": cpu_time,
+            # Sessions that have cost the most.
+            "top_sessions": sessions[:10],
+        }
+
+    async def start(self, path: str) -> None:
+        """
+        Listen on a unix socket.
+
+        :param path: path of socket. Replaced if it exists.
+        """
+        self._server = await asyncio.start_unix_server(
+            self._handle, path, limit=MAX_LINE
+        )
+        self._sweeper = asyncio.create_task(self._evict_idle())
+
+    async def serve_forever(self, path: str) -> None:
+        await self.start(path)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.writer.close()
+
+    async def _evict_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_timeout / 4)
+            deadline = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+                if session.last_active < deadline:
+                    self.n_evicted += 1
+                    self._end(session)
+                    session.writer.write(encode_message({"op": "evicted"}))
+                    session.writer.close()
+
+    def _end(self, session: Session) -> None:
+        if self.sessions.pop(session.id, None) is not None:
+            self.closed_cpu_time += session.cpu_time
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if len(self.sessions) >= self.max_sessions:
+            self.n_refused += 1
+            writer.write(encode_message({"op": "error", "error": "Server is full"}))
+            writer.close()
+            return
+
+        self.n_sessions += 1
+        session = Session(self.n_sessions, self.new_game(), writer)
+        self.sessions[session.id] = session
+        try:
+            while session.id in self.sessions:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(
+                        encode_message({"op": "error", "error": "Line too long"})
+                    )
+                    break
+                if not line:
+                    break
+
+                start = time.thread_time()
+                reply = self._command(session, line)
+                session.cpu_time += time.thread_time() - start
+                session.n_commands += 1
+                session.last_active = time.monotonic()
+                self.n_commands += 1
+
+                writer.write(encode_message(reply))
+                # Wait while the client isn't reading its replies.
+                await writer.drain()
+                # Let other sessions run even if this one has more commands buffered.
+                await asyncio.sleep(0)
+        except ConnectionError:
+            pass
+        finally:
+            self._end(session)
+            writer.close()
+
+    def _command(self, session: Session, line: bytes) -> Dict[str, Any]:
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("Command must be an object")
+            op = message.get("op")
+            if op == "new":
+                seed = message.get("seed")
+                session.state = self.new_game(None if seed is None else int(seed))
+                return self._update(session.state, [], 0)
+            if op == "view":
+                return self._view(
+                    session.state,
+                    int(message.get("x", 0)),
+                    int(message.get("y", 0)),
+                    int(message.get("size", GameState.BOARD_DIM)),
+                )
+            if op == "stats":
+                return {"op": "stats", **self.stats()}
+            return self._step(session.state, parse_action(message))
+        except (ValueError, TypeError, OverflowError) as err:
+            return {"op": "error", "error": str(err)}
+
+    def _step(self, state: GameState, action: Action) -> Dict[str, Any]:
+        # Only the landing cell and its mirror can change.
+        cells: List[Tuple[int, int]] = []
+        if isinstance(action, Move):
+            position = state.player.position
+            cells.append(state.board.calc_coords(*position, *action.d_xy))
+            if state.player.is_affected("mirror"):
+                cells.append(
+                    state.board.calc_coords(*position, -action.d_xy[0], -action.d_xy[1])
+                )
+        before = [state.board.grid[cell] for cell in cells]
+        points = state.step(action)
+        changed = [
+            cell for cell, code in zip(cells, before) if state.board.grid[cell] != code
+        ]
+        return self._update(state, changed, points)
+
+    @staticmethod
+    def _update(
+        state: GameState, changed: List[Tuple[int, int]], points: int
+    ) -> Dict[str, Any]:
+        return {
+            "op": "update",
+            "board_dim": state.board_dim,
+            "cells": [[x, y, state.board.char_at(x, y)] for x, y in changed],
+            "points": points,
+            "score": state.score,
+            "position": list(state.player.position),
+            "tiles": state.current_tiles,
+            "selected": state.selected_tile,
+            "spaces": None if state.is_over else state.n_spaces,
+            "directions": list(state.get_directions()),
+            "anywhere": not state.is_over and state.can_move_anywhere(),
+            "status": {
+                name: turns
+                for name, turns in state.player.status.as_dict().items()
+                if turns
+            },
+            "over": state.is_over,
+        }
+
+    @staticmethod
+    def _view(state: GameState, x: int, y: int, size: int) -> Dict[str, Any]:
+        board = state.board
+        if not 0 < size <= 256:
+            raise ValueError(f"Not a valid view size: {size}")
+        offsets = np.arange(size)
+        codes = board.window((x + offsets) % board.size, (y + offsets) % board.size)
+        # Rows of cells along x. Empty cells are spaces.
+        rows = np.where(codes == board.EMPTY_CODE, ord(" "), codes).astype(np.uint8).T
+        return {
+            "op": "view",
+            "x": x,
+            "y": y,
+            "rows": [row.tobytes().decode("ascii") for row in rows],
+        }
+
+
+def run_server(path: str, words_path: Optional[str] = None, **kwargs) -> None:
+    """
+    Serve games until interrupted.
+
+    :param path: path of unix socket.
+    :param words_path: compiled word graph or word list. Defaults to enchant en_US.
+    :param kwargs: passed to GameServer.
+    """
+    server = GameServer(open_dictionary(words_path), **kwargs)
+    try:
+        asyncio.run(server.serve_forever(path))
+    except KeyboardInterrupt:
+        pass
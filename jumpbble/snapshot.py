@@ -0,0 +1,276 @@
+import os
+import struct
+from collections import Counter
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .bag import Bag
+from .board import Board
+from .engine import GameState
+from .grid import ChunkedGrid
+from .journal import Journal, Summary
+from .player import STATUS_IDX
+from .words import WordIndex
+
+MAGIC = b"JBBL"
+VERSION = 4
+# Magic, version, board size, if chunked, grid offset, state offset, state length.
+HEADER = struct.Struct("<4sHH?III")
+# Grid starts aligned so it can be memory-mapped.
+GRID_OFFSET = 64
+# Seed of chunk special tiles, number of chunks. Followed by chunk x, y then the chunks.
+CHUNKS = struct.Struct("<QI")
+# Score, experience, status decay, position x and y, selected tile, number of moves.
+PLAYER = struct.Struct("<iiiHHHI")
+RNG_STATE_LEN = 625
+# Version, state words, has gauss, gauss.
+RNG = struct.Struct(f"<B{RNG_STATE_LEN}I?d")
+LENGTH = struct.Struct("<I")
+
+
+class _Reader:
+    def __init__(self, buffer: bytes) -> None:
+        self.buffer = memoryview(buffer)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        values = fmt.unpack_from(self.buffer, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def bytes(self) -> bytes:
+        (length,) = self.unpack(LENGTH)
+        data = self.buffer[self.offset : self.offset + length].tobytes()
+        self.offset += length
+        return data
+
+    def array(self, dtype: type) -> np.ndarray:
+        return np.frombuffer(self.bytes(), dtype=dtype)
+
+
+def _pack_bytes(data: bytes) -> bytes:
+    return LENGTH.pack(len(data)) + data
+
+
+def _pack_names(names: List[str]) -> bytes:
+    return _pack_bytes(",".join(names).encode())
+
+
+def _unpack_names(reader: _Reader) -> List[str]:
+    names = reader.bytes().decode()
+    return names.split(",") if names else []
+
+
+def dumps_state(state: GameState) -> bytes:
+    """
+    Encode everything in a game state except the grid.
+    """
+    player = state.player
+    rng_version, rng_words, gauss = state.rng.getstate()
+    effects = state.board.effects_triggered
+    # Words on board as their text and the x, y and axis of their first cell.
+    board_words, board_word_starts = state.word_index.starts()
+    return b"".join(
+        (
+            PLAYER.pack(
+                player.score,
+                player.experience,
+                player.status_decay,
+                *player.position,
+                state.selected_tile,
+                state.n_moves,
+            ),
+            _pack_names(list(player.status)),
+            _pack_bytes(player.status.to_array().astype(np.int32).tobytes()),
+            _pack_bytes("".join(state.bag.order).encode()),
+            _pack_bytes(bytes(state.bag.taken)),
+            _pack_bytes("".join(state.current_tiles).encode()),
+            _pack_bytes("\n".join(sorted(state.all_words)).encode()),
+            _pack_bytes("\n".join(board_words).encode()),
+            _pack_bytes(board_word_starts.tobytes()),
+            _pack_names(list(effects)),
+            _pack_bytes(np.array(list(effects.values()), dtype=np.int32).tobytes()),
+            RNG.pack(rng_version, *rng_words, gauss is not None, gauss or 0.0),
+            _pack_bytes(state.journal.to_bytes(Summary.of(state))),
+        )
+    )
+
+
+def _dumps_grid(board: Board) -> bytes:
+    if not board.chunked:
+        return np.ascontiguousarray(board.grid, dtype=np.uint8).tobytes()
+
+    # Only changed chunks are stored. The rest are filled again from the seed.
+    chunk_size = board.grid.CHUNK_SIZE
+    keys, chunks = [], []
+    for key, chunk in board.grid.iter_modified():
+        keys.append(key)
+        # Pad chunks on the edge of the board to full size.
+        padded = np.zeros((chunk_size, chunk_size), dtype=np.uint8)
+        padded[: chunk.shape[0], : chunk.shape[1]] = chunk
+        chunks.append(padded.tobytes())
+    return b"".join(
+        (
+            CHUNKS.pack(board.chunk_seed, len(keys)),
+            np.array(keys, dtype=np.uint16).reshape(-1, 2).tobytes(),
+            *chunks,
+        )
+    )
+
+
+def _load_grid(
+    board: Board,
+    path: os.PathLike,
+    snapshot_stream: BinaryIO,
+    grid_offset: int,
+    chunked: bool,
+) -> Tuple[Union[np.ndarray, ChunkedGrid], Optional[int]]:
+    """
+    :return: grid and seed of its chunk special tiles if chunked.
+    """
+    snapshot_stream.seek(grid_offset)
+    if not chunked:
+        # Dense grids are small enough that reading costs less than memory-mapping.
+        shape = (board.size, board.size)
+        grid = np.frombuffer(snapshot_stream.read(shape[0] * shape[1]), np.uint8)
+        return grid.reshape(shape).copy(), None
+
+    chunk_seed, n_chunks = CHUNKS.unpack(snapshot_stream.read(CHUNKS.size))
+    keys = np.frombuffer(snapshot_stream.read(4 * n_chunks), dtype=np.uint16)
+    grid = ChunkedGrid(board.size, board._fill_chunk)
+    if not n_chunks:
+        return grid, chunk_seed
+    chunk_size = grid.CHUNK_SIZE
+    chunks = np.memmap(
+        path,
+        dtype=np.uint8,
+        mode="c",
+        offset=grid_offset + CHUNKS.size + keys.nbytes,
+        shape=(n_chunks, chunk_size, chunk_size),
+    ).view(np.ndarray)
+    for (cx, cy), chunk in zip(keys.reshape(-1, 2).tolist(), chunks):
+        width, height = grid.chunk_shape(cx, cy)
+        grid.chunks[(cx, cy)] = chunk[:width, :height]
+        grid.modified.add((cx, cy))
+    return grid, chunk_seed
+
+
+def save(state: GameState, path: os.PathLike) -> None:
+    """
+    Write a snapshot of a game. The file is replaced atomically.
+
+    :param state: game to save.
+    :param path: file to write.
+    """
+    board = state.board
+    grid = _dumps_grid(board)
+    state_bytes = dumps_state(state)
+    state_offset = GRID_OFFSET + len(grid)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        board.size,
+        board.chunked,
+        GRID_OFFSET,
+        state_offset,
+        len(state_bytes),
+    )
+
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "wb") as snapshot_stream:
+        snapshot_stream.write(header.ljust(GRID_OFFSET, b"\0"))
+        snapshot_stream.write(grid)
+        snapshot_stream.write(state_bytes)
+    os.replace(tmp_path, path)
+
+
+def load(state: GameState, path: os.PathLike) -> None:
+    """
+    Restore a snapshot into a game. The dictionary, word cache and config of the game are kept.
+
+    :param state: game to restore into. Must have the same board size and letters as saved.
+    :param path: file to read.
+    :raises ValueError: if the file isn't a snapshot or doesn't match the game.
+    """
+    with open(path, "rb") as snapshot_stream:
+        header = snapshot_stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Not a snapshot: {path}")
+        (
+            magic,
+            version,
+            size,
+            chunked,
+            grid_offset,
+            state_offset,
+            state_len,
+        ) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"Not a snapshot: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        if size != state.board.size:
+            raise ValueError(
+                f"Board size {size} doesn't match game: {state.board.size}"
+            )
+        grid, chunk_seed = _load_grid(
+            state.board, path, snapshot_stream, grid_offset, chunked
+        )
+        snapshot_stream.seek(state_offset)
+        reader = _Reader(snapshot_stream.read(state_len))
+
+    score, experience, status_decay, x, y, selected_tile, n_moves = reader.unpack(
+        PLAYER
+    )
+    status_names = _unpack_names(reader)
+    status_turns = reader.array(np.int32)
+    bag_order = reader.bytes().decode()
+    bag_taken = reader.bytes()
+    rack = reader.bytes().decode()
+    words = reader.bytes().decode()
+    board_words = reader.bytes().decode()
+    board_word_starts = reader.array(np.uint16).reshape(-1, 3)
+    effect_names = _unpack_names(reader)
+    effect_counts = reader.array(np.int32)
+    rng_values = reader.unpack(RNG)
+    journal, _ = Journal.from_bytes(reader.bytes())
+
+    if not set(bag_order + rack) <= set(state.letters):
+        raise ValueError("Letters in snapshot don't match game")
+
+    player = state.player
+    player.score = score
+    player.experience = experience
+    player.status_decay = status_decay
+    player.position = (x, y)
+    turns = player.status.to_array()
+    for name, n_turns in zip(status_names, status_turns.tolist()):
+        turns[STATUS_IDX[name]] = n_turns
+    player.status.load(turns)
+
+    state.board.chunked = chunked
+    if chunked:
+        state.board.chunk_seed = chunk_seed
+    # Words on the grid are restored with the word index below. Only cells changed after
+    # loading are rescanned.
+    state.board.replace_grid(grid, rescan=False)
+    state.board.effects_triggered = Counter(
+        dict(zip(effect_names, effect_counts.tolist()))
+    )
+
+    state.bag = Bag(bag_order, state.letters, bag_taken)
+    state.current_tiles = list(rack)
+    state.selected_tile = selected_tile
+    state.all_words = set(words.split("\n")) if words else set()
+    # Built when first used.
+    state.word_index = WordIndex.restore(
+        size, chunked, board_words.split("\n") if board_words else [], board_word_starts
+    )
+    state.n_moves = n_moves
+
+    rng_version, *rng_words, has_gauss, gauss = rng_values
+    state.rng.setstate((rng_version, tuple(rng_words), gauss if has_gauss else None))
+    # Journal continues from the saved game so it can still be replayed.
+    state.seed = journal.seed
+    state.journal = journal
@@ -0,0 +1,215 @@
+import heapq
+import numpy as np
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .dictionary import Dictionary
+from .engine import Action, GameState, Move, SelectTile, SetWildcard
+
+
+class Hint(NamedTuple):
+    """
+    Placement of a tile and the points of the new words it makes.
+    """
+
+    points: int
+    tile: int
+    letter: str
+    move: Move
+
+    def actions(self, state: GameState) -> List[Action]:
+        """
+        Get actions to make placement from state.
+        """
+        actions = [SelectTile(self.tile)]
+        if state.current_tiles[self.tile] != self.letter:
+            actions.append(SetWildcard(self.letter))
+        actions.append(self.move)
+        return actions
+
+
+class Solver:
+    """
+    Find the best placements of the tiles in the rack.
+    """
+
+    # Jump placements are only searched this far from the player on larger boards.
+    JUMP_RADIUS = 32
+
+    def __init__(self, state: GameState, prefix_index: Optional[Dictionary] = None):
+        """
+        :param state: game state to solve. Only changed temporarily while solving.
+        :param prefix_index: dictionary that can check prefixes. Letters that can't continue
+            a word on a cell are skipped without placing or scoring them. Defaults to the
+            game's dictionary if it can.
+        """
+        self.state = state
+        if prefix_index is None and getattr(state.dictionary, "prefix_checks", False):
+            prefix_index = state.dictionary
+        self.prefix_index = prefix_index
+        # Letters before each cell searched in each run through it. Same for every letter
+        # placed on it, so only found once per search.
+        self._befores: Dict[Tuple[int, int], List[str]] = {}
+
+    def _can_start_word(self, letter: str, cell: Tuple[int, int]) -> bool:
+        """
+        Check if a letter on a cell continues a prefix of a word in some run through it.
+        """
+        if (befores := self._befores.get(cell)) is None:
+            befores = []
+            for axis in (0, 1):
+                before, after = self.state.board.letters_around(*cell, axis)
+                if before or after:
+                    befores.append(before)
+            self._befores[cell] = befores
+        return any(self.prefix_index.has_prefix(before + letter) for before in befores)
+
+    def _candidate_letters(self, tile: int) -> List[str]:
+        char = self.state.current_tiles[tile]
+        # Wildcard allows any letter.
+        if self.state.player.is_affected("wildcard") or char == "*":
+            return [letter for letter in self.state.letters if letter != "*"] + [char]
+        return [char]
+
+    def _targets(self, letter: str) -> List[Tuple[int, int]]:
+        """
+        Get change in x and y of each position a letter can be placed on.
+        """
+        state = self.state
+        n_spaces = state.letter_spaces.get(letter)
+        if state.player.is_affected("jump") or n_spaces == 0:
+            current_x, current_y = state.player.position
+            xs, ys = self._window()
+            return [(x - current_x, y - current_y) for x in xs for y in ys]
+        reach = state.moves.get(state.player.position, n_spaces, state.get_directions())
+        return list(reach.offsets)
+
+    def _window(self) -> Tuple[List[int], List[int]]:
+        """
+        Get x and y of cells searched around the player. The whole board if small enough.
+        """
+        state = self.state
+        size = state.board.size
+        # Also covers the furthest any letter moves.
+        radius = max(self.JUMP_RADIUS, *state.letter_spaces.values()) + 1
+        if size <= 2 * radius + 1:
+            return list(range(size)), list(range(size))
+        x, y = state.player.position
+        offsets = range(-radius, radius + 1)
+        return [(x + dx) % size for dx in offsets], [(y + dy) % size for dy in offsets]
+
+    def _near_letters(self) -> Set[Tuple[int, int]]:
+        """
+        Get positions in window next to a letter. Placing anywhere else can't make a word.
+        """
+        xs, ys = self._window()
+        board = self.state.board
+        mask = board.letter_mask(board.window(np.array(xs), np.array(ys)))
+        near = np.zeros_like(mask)
+        near[1:, :] |= mask[:-1, :]
+        near[:-1, :] |= mask[1:, :]
+        near[:, 1:] |= mask[:, :-1]
+        near[:, :-1] |= mask[:, 1:]
+        return {(xs[i], ys[j]) for i, j in np.argwhere(near).tolist()}
+
+    def _placement_points(
+        self, letter: str, cells: List[Tuple[int, int]], near: Set[Tuple[int, int]]
+    ) -> int:
+        """
+        Get points of new words made by placing a letter on cells.
+        The special tile effect isn't known so is ignored.
+        """
+        board = self.state.board
+        erasing = self.state.player.is_affected("erase")
+        placed = []
+        for cell in cells:
+            landed_on_tile = board.grid[cell]
+            if erasing or landed_on_tile in (board.EMPTY_CODE, board.SPECIAL_TILE_CODE):
+                placed.append((cell, landed_on_tile))
+        if not any(cell in near for cell, _ in placed):
+            return 0
+        # Mirrored cells can join each other's runs so are never pruned.
+        if self.prefix_index is not None and len(placed) == 1:
+            if not self._can_start_word(letter, placed[0][0]):
+                return 0
+
+        new_words = board.words_if_placed([cell for cell, _ in placed], letter)
+        return sum(
+            self.state._get_score(word) for word in new_words - self.state.all_words
+        )
+
+    def placements(self, tiles: Optional[Iterable[int]] = None) -> List[Hint]:
+        """
+        Enumerate all legal placements of tiles in the rack.
+
+        :param tiles: indices of tiles to place. Defaults to all tiles.
+        :return: every placement with its points.
+        """
+        state = self.state
+        if state.is_over:
+            return []
+        board = state.board
+        near = self._near_letters()
+        self._befores.clear()
+        mirrored = state.player.is_affected("mirror")
+        current_x, current_y = state.player.position
+
+        hints = []
+        seen = set()
+        for tile in range(len(state.current_tiles)) if tiles is None else tiles:
+            for letter in self._candidate_letters(tile):
+                # Same letter in another tile gives same placements.
+                if letter in seen:
+                    continue
+                seen.add(letter)
+                for d_xy in self._targets(letter):
+                    cells = [board.calc_coords(current_x, current_y, *d_xy)]
+                    if mirrored:
+                        cells.insert(
+                            0,
+                            board.calc_coords(current_x, current_y, -d_xy[0], -d_xy[1]),
+                        )
+                    points = self._placement_points(letter, cells, near)
+                    hints.append(Hint(points, tile, letter, Move(d_xy)))
+        return hints
+
+    def best(self, k: int = 1, *, depth: int = 1, beam: int = 8) -> List[Hint]:
+        """
+        Get the best placements.
+
+        :param k: number of placements.
+        :param depth: number of moves to look ahead. Later moves only use tiles already in rack.
+        :param beam: number of best placements searched further at each extra move.
+        :return: placements ordered by points including best points of later moves.
+        """
+        hints = self.placements()
+        if depth > 1:
+            # Refilled tile is added to end of rack and isn't known yet.
+            n_known = len(self.state.current_tiles) - 1
+            searched = heapq.nlargest(max(k, beam), hints, key=lambda hint: hint.points)
+            hints = []
+            for hint in searched:
+                future = self._future_points(hint, n_known, depth - 1, beam)
+                hints.append(hint._replace(points=hint.points + future))
+        return heapq.nlargest(k, hints, key=lambda hint: hint.points)
+
+    def _future_points(self, hint: Hint, n_known: int, depth: int, beam: int) -> int:
+        """
+        Get best points of later moves after a placement.
+
+        :param n_known: number of tiles at start of rack known after placement.
+        """
+        next_state = self.state.copy()
+        for action in hint.actions(next_state):
+            next_state.step(action)
+        if next_state.is_over or n_known <= 0:
+            return 0
+
+        solver = Solver(next_state, self.prefix_index)
+        hints = solver.placements(range(min(n_known, len(next_state.current_tiles))))
+        if not hints or depth <= 1:
+            return max((next_hint.points for next_hint in hints), default=0)
+        best_points = 0
+        for next_hint in heapq.nlargest(beam, hints, key=lambda hint: hint.points):
+            future = solver._future_points(next_hint, n_known - 1, depth - 1, beam)
+            best_points = max(best_points, next_hint.points + future)
+        return best_points
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import concurrent.futures
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .player import STATUS_IDX, STATUS_NAMES
+
+VERSION = 1
+# Column of each record and its type.
+FIELDS = (
+    ("move", np.uint32),
+    # Seconds since recording started when the move was made.
+    ("time", np.float64),
+    ("tile", np.uint8),
+    ("n_spaces", np.uint16),
+    ("dx", np.int32),
+    ("dy", np.int32),
+    # Position after move.
+    ("x", np.uint16),
+    ("y", np.uint16),
+    # Index of effect rolled in STATUS_NAMES. -1 if none.
+    ("effect", np.int8),
+    ("n_words", np.uint16),
+    ("points", np.int32),
+    ("bag_size", np.uint32),
+    ("scan_ms", np.float32),
+    ("validate_ms", np.float32),
+    ("render_ms", np.float32),
+)
+RECORD = np.dtype(list(FIELDS))
+_FIELD_IDX = {name: i for i, (name, _) in enumerate(FIELDS)}
+_STAGE_IDX = {
+    stage: _FIELD_IDX[f"{stage}_ms"] for stage in ("scan", "validate", "render")
+}
+_X, _Y, _EFFECT, _N_WORDS, _POINTS, _BAG_SIZE = (
+    _FIELD_IDX[name] for name in ("x", "y", "effect", "n_words", "points", "bag_size")
+)
+_META = "meta.json"
+_WORDS = "words.npy"
+
+
+def _chunk_dir(path: str, chunk: int) -> str:
+    return os.path.join(path, f"chunk-{chunk:06d}")
+
+
+class Recorder:
+    """
+    Record every move of a game to a directory of columnar chunks.
+
+    Records are kept in a preallocated buffer and written a chunk at a time on a background
+    thread, so memory stays bounded however long the game is. Each chunk is a directory with
+    one .npy file per column.
+
+    Only the last move's record is still changing. Timings and scores are added to it until
+    the next move starts.
+    """
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, path: os.PathLike, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        :param path: directory to write. Created if missing. Existing chunks are replaced.
+        :param chunk_size: records per chunk.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1: {chunk_size}")
+        self.path = os.fspath(path)
+        os.makedirs(self.path, exist_ok=True)
+        if os.path.exists(meta_path := os.path.join(self.path, _META)):
+            os.remove(meta_path)
+        self.chunk_size = chunk_size
+        self.start = time.perf_counter()
+        # Filled buffer is written while the other fills.
+        self._buffers = [np.zeros(chunk_size, dtype=RECORD) for _ in range(2)]
+        self._buffer = self._buffers[0]
+        self._n = 0
+        self._words: List[str] = []
+        # Record of the move in progress.
+        self._row: Optional[list] = None
+        self._row_words: List[str] = []
+        self._chunk_rows: List[int] = []
+        self._writer = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="telemetry"
+        )
+        self._writing: Optional[concurrent.futures.Future] = None
+
+    def __len__(self) -> int:
+        return sum(self._chunk_rows) + self._n + (self._row is not None)
+
+    def begin_move(
+        self, move: int, tile: str, n_spaces: int, d_xy: Sequence[int]
+    ) -> None:
+        """
+        Start the record of a move. Ends the record of the last move.
+
+        :param move: number of moves made before.
+        :param tile: letter placed.
+        :param n_spaces: number of spaces tile moves.
+        :param d_xy: change in x and y of move.
+        """
+        if self._row is not None:
+            self._commit()
+        # In order of FIELDS.
+        self._row = [
+            move,
+            time.perf_counter() - self.start,
+            ord(tile),
+            n_spaces,
+            d_xy[0],
+            d_xy[1],
+            0,
+            0,
+            -1,
+            0,
+            0,
+            0,
+            0.0,
+            0.0,
+            0.0,
+        ]
+
+    def end_move(self, position: Tuple[int, int], bag_size: int) -> None:
+        """
+        :param position: position of player after move.
+        :param bag_size: tiles left in bag after refill.
+        """
+        row = self._row
+        row[_X], row[_Y] = position
+        row[_BAG_SIZE] = bag_size
+
+    def effect(self, effect: str) -> None:
+        if self._row is not None:
+            self._row[_EFFECT] = STATUS_IDX[effect]
+
+    def score(self, words: List[str], points: int) -> None:
+        """
+        Add words scored by the move and their points.
+        """
+        if self._row is None:
+            return
+        self._row[_N_WORDS] += len(words)
+        self._row[_POINTS] += points
+        self._row_words.extend(words)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        Add time spent on the last move.
+
+        :param stage: scan, validate or render.
+        """
+        if self._row is not None:
+            self._row[_STAGE_IDX[stage]] += seconds * 1000
+
+    def _commit(self) -> None:
+        self._buffer[self._n] = tuple(self._row)
+        self._words.extend(self._row_words)
+        self._row_words.clear()
+        self._row = None
+        self._n += 1
+        if self._n == self.chunk_size:
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        if self._n == 0:
+            return
+        # At most one chunk is written at once so only two buffers are ever needed.
+        if self._writing is not None:
+            self._writing.result()
+        chunk = len(self._chunk_rows)
+        self._chunk_rows.append(self._n)
+        self._writing = self._writer.submit(
+            self._write_chunk,
+            chunk,
+            self._buffer[: self._n],
+            self._words,
+            list(self._chunk_rows),
+        )
+        self._buffer = self._buffers[(chunk + 1) % 2]
+        self._n = 0
+        self._words = []
+
+    def _write_chunk(
+        self, chunk: int, records: np.ndarray, words: List[str], chunk_rows: List[int]
+    ) -> None:
+        chunk_dir = _chunk_dir(self.path, chunk)
+        os.makedirs(chunk_dir, exist_ok=True)
+        for name, _ in FIELDS:
+            np.save(os.path.join(chunk_dir, f"{name}.npy"), records[name])
+        words_blob = "".join(f"{word}\n" for word in words).encode()
+        np.save(
+            os.path.join(chunk_dir, _WORDS), np.frombuffer(words_blob, dtype=np.uint8)
+        )
+        # Chunks only count once listed, so a partial chunk is never read.
+        meta = {
+            "version": VERSION,
+            "fields": [[name, np.dtype(dtype).str] for name, dtype in FIELDS],
+            "effects": list(STATUS_NAMES),
+            "chunk_rows": chunk_rows,
+        }
+        tmp_path = os.path.join(self.path, f"{_META}.tmp")
+        with open(tmp_path, "w") as meta_stream:
+            json.dump(meta, meta_stream)
+        os.replace(tmp_path, os.path.join(self.path, _META))
+
+    def flush(self) -> None:
+        """
+        Write every record, including the move in progress, and wait until written.
+        """
+        if self._row is not None:
+            self._commit()
+        self._flush_buffer()
+        if self._writing is not None:
+            self._writing.result()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.shutdown()
+
+
+class Telemetry:
+    """
+    Records written by a Recorder. Columns of each chunk are memory-mapped when first read.
+    """
+
+    def __init__(self, path: os.PathLike) -> None:
+        """
+        :raises OSError: if path has no records.
+        :raises ValueError: if records were written by another version.
+        """
+        self.path = os.fspath(path)
+        with open(os.path.join(self.path, _META)) as meta_stream:
+            meta = json.load(meta_stream)
+        if meta["version"] != VERSION:
+            raise ValueError(f"Unsupported telemetry version: {meta['version']}")
+        self.fields = [name for name, _ in meta["fields"]]
+        self.effects: List[str] = meta["effects"]
+        self.chunk_rows: List[int] = meta["chunk_rows"]
+        self._chunks: Dict[int, Dict[str, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return sum(self.chunk_rows)
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self.chunk_rows)
+
+    def chunk(self, chunk: int) -> Dict[str, np.ndarray]:
+        """
+        Get read-only columns of a chunk by name.
+        """
+        if (columns := self._chunks.get(chunk)) is None:
+            chunk_dir = _chunk_dir(self.path, chunk)
+            columns = {
+                name: np.load(os.path.join(chunk_dir, f"{name}.npy"), mmap_mode="r")
+                for name in self.fields
+            }
+            self._chunks[chunk] = columns
+        return columns
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column of every record. Copied unless there is one chunk.
+        """
+        if name not in self.fields:
+            raise ValueError(f"Not a telemetry field: {name}")
+        parts = [self.chunk(chunk)[name] for chunk in range(self.n_chunks)]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=RECORD[name])
+
+    def words(self) -> Iterator[List[str]]:
+        """
+        Iterate over the words scored by each record.
+        """
+        for chunk in range(self.n_chunks):
+            # Empty arrays can't be memory-mapped.
+            blob = np.load(os.path.join(_chunk_dir(self.path, chunk), _WORDS))
+            chunk_words = blob.tobytes().decode().split("\n")
+            start = 0
+            for n_words in self.chunk(chunk)["n_words"].tolist():
+                yield chunk_words[start : start + n_words]
+                start += n_words
@@ -0,0 +1,120 @@
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Deque, List, NamedTuple, Optional, Tuple
+
+from .board import Run
+from .cache import WordCache
+from .profiler import PROFILER
+
+if TYPE_CHECKING:
+    from .engine import GameState
+
+
+class _PendingMove(NamedTuple):
+    state: "GameState"
+    runs: List[Run]
+    # Score of each run if cached when submitted.
+    scores: List[Optional[int]]
+    # Checks of words that weren't cached, in order of runs, and seconds they took.
+    checks: Optional[Future]
+
+
+def _check(word_cache: WordCache, words: List[str]) -> Tuple[List[bool], float]:
+    start = time.perf_counter()
+    return word_cache.are_words(words), time.perf_counter() - start
+
+
+class WordValidator:
+    """
+    Check words of moves on a worker thread so the game loop never waits on the dictionary.
+
+    Moves are scored in the order they were made once all their words are checked. Until then
+    the game must not make another move, since the jump award can change which moves are legal.
+    """
+
+    def __init__(self) -> None:
+        # One worker so checks finish in the order they were submitted.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="words")
+        self._pending: Deque[_PendingMove] = deque()
+        # Moves scored so far. Scoring can change highlights without changing the score.
+        self.n_applied = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def busy(self) -> bool:
+        """
+        If any move hasn't been scored yet.
+        """
+        return bool(self._pending)
+
+    def submit(self, state: "GameState", runs: List[Run]) -> None:
+        """
+        Check words of a move. Cached words aren't checked again.
+
+        :param state: game the move was made in.
+        :param runs: words through cells changed by the move and their letter positions.
+        """
+        word_cache = state.word_cache
+        scores = [word_cache.get(word) for word, _ in runs]
+        unchecked = [word for (word, _), score in zip(runs, scores) if score is None]
+        checks = None
+        if unchecked:
+            PROFILER.count("lookups", len(unchecked))
+            checks = self._executor.submit(_check, word_cache, unchecked)
+        self._pending.append(_PendingMove(state, runs, scores, checks))
+
+    def _apply(self, move: _PendingMove) -> int:
+        scores = move.scores
+        if move.checks is not None:
+            is_words, seconds = move.checks.result()
+            if move.state.recorder is not None:
+                move.state.recorder.add_time("validate", seconds)
+            is_words = iter(is_words)
+            scores = [
+                move.state.word_cache.add(word, next(is_words))
+                if score is None
+                else score
+                for (word, _), score in zip(move.runs, scores)
+            ]
+        self.n_applied += 1
+        return move.state._apply_scores(move.runs, scores)
+
+    def apply_ready(self) -> int:
+        """
+        Score moves whose words have all been checked. Never waits.
+
+        :return: points gained.
+        """
+        points = 0
+        while self._pending and (
+            self._pending[0].checks is None or self._pending[0].checks.done()
+        ):
+            points += self._apply(self._pending.popleft())
+        return points
+
+    def wait(self) -> int:
+        """
+        Score every move, waiting for any checks left. ex. before saving.
+
+        :return: points gained.
+        """
+        points = 0
+        while self._pending:
+            points += self._apply(self._pending.popleft())
+        return points
+
+    def clear(self) -> None:
+        """
+        Drop moves not scored yet. ex. when the game is replaced.
+        """
+        for move in self._pending:
+            if move.checks is not None:
+                move.checks.cancel()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,341 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .board import Board
+from .cache import WordCache
+from .config import compile_config, load_config
+from .dictionary import EnchantDictionary
+from .engine import GameState
+from .moves import DIAGONAL_DIRECTIONS, DIRECTIONS
+from .player import STATUS_IDX, STATUS_NAMES
+
+
+# Unit change in x and y for each direction. Diagonal directions are last.
+DIRECTION_DELTAS = np.array(list(DIRECTIONS.values()))
+N_DIAGONAL_DIRECTIONS = len(DIAGONAL_DIRECTIONS)
+
+
+class BatchSimulator:
+    """
+    Simulate many games at once. Each part of game state is an array with one row per game.
+
+    Wildcard substitution isn't simulated. A wildcard tile is placed as is.
+    """
+
+    N_TILES = GameState.N_TILES
+    STATUS_DECAY = 3
+    SPECIAL_TILES_PERC = Board.SPECIAL_TILES_PERC
+
+    def __init__(
+        self,
+        n_games: int,
+        dictionary: Optional[Any] = None,
+        *,
+        letters: Optional[Dict[str, Dict[str, int]]] = None,
+        special_tiles_dist: Optional[Dict[str, float]] = None,
+        size: int = GameState.BOARD_DIM,
+        seed: Optional[int] = None,
+        word_cache_size: int = 65536,
+    ) -> None:
+        """
+        :param n_games: number of games.
+        :param dictionary: word checker with a check(word) method. Defaults to enchant en_US.
+        :param letters: letters with number and point value. Defaults to config.
+        :param special_tiles_dist: probability of each effect. Defaults to config.
+        :param size: length of board side.
+        :param seed: seed of all games.
+        """
+        self.n_games = n_games
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        if letters is None and special_tiles_dist is None:
+            config = load_config()
+        else:
+            config = compile_config(
+                letters or load_config().letters,
+                special_tiles_dist or load_config().special_tiles_dist,
+            )
+        letters = config.letters
+
+        if dictionary is None:
+            dictionary = EnchantDictionary()
+        self.word_cache = WordCache(
+            dictionary.check,
+            config.letter_scores,
+            maxsize=word_cache_size,
+            check_many=getattr(dictionary, "check_many", None),
+        )
+
+        # Lookup tables by letter index and by letter code.
+        self.letter_codes = np.array(
+            [ord(letter) for letter in letters], dtype=np.uint8
+        )
+        self.code_to_idx = np.full(256, -1, dtype=np.intp)
+        self.code_to_idx[self.letter_codes] = np.arange(len(letters))
+        self.spaces_by_code = np.zeros(256, dtype=np.intp)
+        for letter, n_spaces in config.letter_spaces(size).items():
+            self.spaces_by_code[ord(letter)] = n_spaces
+        letters_dist = np.repeat(
+            self.letter_codes, [mdata["Number"] for mdata in letters.values()]
+        )
+
+        # Effects as cumulative probabilities to roll many at once.
+        self.effect_status_idx = np.array(
+            [STATUS_IDX[effect] for effect in config.effects.effects], dtype=np.intp
+        )
+        self.effect_cum_weights = np.array(config.effects.cum_weights)
+
+        # Boards.
+        self.start_pos = (size // 2, size // 2)
+        self.grid = self._init_boards()
+        self.position = np.tile(np.array(self.start_pos, dtype=np.intp), (n_games, 1))
+
+        # Bags. Shuffled letters with which have been taken and remaining count of each letter.
+        order = np.argsort(self.rng.random((n_games, len(letters_dist))), axis=1)
+        self.bag = letters_dist[order]
+        self.bag_taken = np.zeros(self.bag.shape, dtype=bool)
+        self.bag_counts = np.tile(
+            np.array([mdata["Number"] for mdata in letters.values()]), (n_games, 1)
+        )
+
+        # Racks. Tiles fill from the left. Empty slots are 0.
+        self.rack = np.zeros((n_games, self.N_TILES), dtype=np.uint8)
+        self.rack_len = np.zeros(n_games, dtype=np.intp)
+        for _ in range(self.N_TILES):
+            all_games = np.arange(n_games)
+            drawn = self._draw(all_games, np.zeros(n_games, dtype=bool), None)
+            self.rack[all_games, self.rack_len] = drawn
+            self.rack_len += drawn != 0
+
+        self.status = np.zeros((n_games, len(STATUS_NAMES)), dtype=np.int16)
+        self.score = np.zeros(n_games, dtype=np.int64)
+        self.n_moves = np.zeros(n_games, dtype=np.int64)
+        self.words: List[Set[str]] = [set() for _ in range(n_games)]
+
+    @property
+    def done(self) -> np.ndarray:
+        return self.rack_len == 0
+
+    @property
+    def bag_left(self) -> np.ndarray:
+        return self.bag_counts.sum(axis=1)
+
+    def _init_boards(self) -> np.ndarray:
+        n_cells = self.size * self.size
+        n_special_tiles = int(n_cells * self.SPECIAL_TILES_PERC)
+        grid = np.zeros((self.n_games, n_cells), dtype=np.uint8)
+
+        # Lowest random keys are special tiles. Don't allow starting tile.
+        keys = self.rng.random((self.n_games, n_cells))
+        start_idx = np.ravel_multi_index(self.start_pos, (self.size, self.size))
+        keys[:, start_idx] = np.inf
+        special_tiles = np.argpartition(keys, n_special_tiles, axis=1)[
+            :, :n_special_tiles
+        ]
+        np.put_along_axis(grid, special_tiles, Board.SPECIAL_TILE_CODE, axis=1)
+        grid[:, start_idx] = Board.STARTING_POS_CODE
+        return grid.reshape(self.n_games, self.size, self.size)
+
+    def _draw(
+        self, games: np.ndarray, ordered: np.ndarray, after: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """
+        Take the next tile from the bags of games.
+
+        :param games: indices of games.
+        :param ordered: which games take the next available letter after the placed one.
+        :param after: letter codes of placed tiles.
+        :return: letter codes drawn. 0 if bag empty.
+        """
+        drawn = np.zeros(len(games), dtype=np.uint8)
+        has_tiles = self.bag_counts[games].sum(axis=1) > 0
+        untaken = ~self.bag_taken[games]
+
+        # Next tile in bag.
+        bag_idx = np.argmax(untaken, axis=1)
+
+        # Next available letter in letter order after placed letter.
+        ordered = ordered & has_tiles
+        if ordered.any():
+            o_games = games[ordered]
+            n_letters = len(self.letter_codes)
+            letter_order = (
+                self.code_to_idx[after[ordered]][:, None] + 1 + np.arange(n_letters)
+            ) % n_letters
+            available = (
+                np.take_along_axis(self.bag_counts[o_games], letter_order, 1) > 0
+            )
+            next_letter = letter_order[np.arange(len(o_games)), np.argmax(available, 1)]
+            is_letter = self.bag[o_games] == self.letter_codes[next_letter][:, None]
+            bag_idx[ordered] = np.argmax(is_letter & untaken[ordered], axis=1)
+
+        games, bag_idx = games[has_tiles], bag_idx[has_tiles]
+        drawn[has_tiles] = self.bag[games, bag_idx]
+        self.bag_taken[games, bag_idx] = True
+        self.bag_counts[games, self.code_to_idx[drawn[has_tiles]]] -= 1
+        return drawn
+
+    def _place(
+        self, games: np.ndarray, x: np.ndarray, y: np.ndarray, chars: np.ndarray
+    ) -> np.ndarray:
+        """
+        Place tiles on boards and trigger any special tiles.
+
+        :return: mask of placements that changed the board.
+        """
+        landed_on_tile = self.grid[games, x, y]
+
+        # Roll effects and apply decay rate.
+        special = landed_on_tile == Board.SPECIAL_TILE_CODE
+        if special.any():
+            rolls = self.rng.random(special.sum()) * self.effect_cum_weights[-1]
+            effect = np.searchsorted(self.effect_cum_weights, rolls, side="right")
+            self.status[
+                games[special], self.effect_status_idx[effect]
+            ] += self.STATUS_DECAY
+
+        erasing = self.status[games, STATUS_IDX["erase"]] > 0
+        written = special | erasing | (landed_on_tile == Board.EMPTY_CODE)
+        self.grid[games[written], x[written], y[written]] = chars[written]
+        return written
+
+    def _runs_through(
+        self, games: np.ndarray, x: np.ndarray, y: np.ndarray
+    ) -> List[Tuple[int, str]]:
+        """
+        Find words through positions along both rows and cols.
+
+        :return: game index and word for each run of more than one character.
+        """
+        runs = []
+        positions = np.arange(self.size)
+        for lines, idx in ((self.grid[games, x, :], y), (self.grid[games, :, y], x)):
+            not_letter = np.isin(lines, Board.DEFAULT_CODES)
+            # Run is between last non-letter before position and first non-letter after it.
+            before = not_letter & (positions < idx[:, None])
+            after = not_letter & (positions > idx[:, None])
+            starts = np.where(before, positions, -1).max(axis=1) + 1
+            ends = np.where(after, positions, self.size).min(axis=1)
+            is_word = ~not_letter[np.arange(len(games)), idx] & (ends - starts > 1)
+
+            for n in np.flatnonzero(is_word):
+                word = lines[n, starts[n] : ends[n]].tobytes().decode()
+                runs.append((int(games[n]), word))
+        return runs
+
+    def legal_mask(self) -> np.ndarray:
+        """
+        Get which directions each game can move in.
+
+        :return: mask of shape (games, directions).
+        """
+        mask = np.ones((self.n_games, len(DIRECTION_DELTAS)), dtype=bool)
+        diagonal = self.status[:, STATUS_IDX["diagonal"]] > 0
+        mask[diagonal, :-N_DIAGONAL_DIRECTIONS] = False
+        return mask
+
+    def sample_random_actions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Choose a random tile and a random legal move for every game.
+
+        :return: tile indices and change in x and y.
+        """
+        rack_len = np.maximum(self.rack_len, 1)
+        tiles = (self.rng.random(self.n_games) * rack_len).astype(np.intp)
+        chars = self.rack[np.arange(self.n_games), tiles]
+        n_spaces = self.spaces_by_code[chars]
+
+        # Random direction from allowed directions.
+        mask = self.legal_mask()
+        keys = np.where(mask, self.rng.random(mask.shape), -1)
+        d_xy = DIRECTION_DELTAS[np.argmax(keys, axis=1)] * n_spaces[:, None]
+
+        # Jump or wildcard tile can go anywhere.
+        anywhere = (self.status[:, STATUS_IDX["jump"]] > 0) | (n_spaces == 0)
+        if anywhere.any():
+            d_xy[anywhere] = self.rng.integers(
+                -self.size + 1, self.size, size=(anywhere.sum(), 2)
+            )
+        return tiles, d_xy
+
+    def step(self, tiles: np.ndarray, d_xy: np.ndarray) -> np.ndarray:
+        """
+        Place a tile in every game that isn't over.
+
+        :param tiles: index of tile in rack of each game.
+        :param d_xy: change in x and y of each game.
+        :return: points gained by each game.
+        """
+        points = np.zeros(self.n_games, dtype=np.int64)
+        games = np.flatnonzero(~self.done)
+        if len(games) == 0:
+            return points
+        tiles, d_xy = np.asarray(tiles)[games], np.asarray(d_xy)[games]
+        if (tiles >= self.rack_len[games]).any():
+            raise ValueError("Selected tile outside of rack.")
+        chars = self.rack[games, tiles]
+
+        # Remove placed tile from rack and shift tiles after it left.
+        slots = np.arange(self.N_TILES)
+        src = np.minimum(slots + (slots >= tiles[:, None]), self.N_TILES - 1)
+        rack = np.take_along_axis(self.rack[games], src, axis=1)
+        rack[:, -1] = 0
+        rack_len = self.rack_len[games] - 1
+
+        # Replenish tiles.
+        ordered = self.status[games, STATUS_IDX["ordered"]] > 0
+        drawn = self._draw(games, ordered, chars)
+        rack[np.arange(len(games)), rack_len] = np.where(
+            drawn != 0, drawn, rack[np.arange(len(games)), rack_len]
+        )
+        self.rack[games] = rack
+        self.rack_len[games] = rack_len + (drawn != 0)
+
+        # Mirror move by multiple change in x and y by -1.
+        x, y = self.position[games, 0], self.position[games, 1]
+        placed = []
+        mirrored = self.status[games, STATUS_IDX["mirror"]] > 0
+        if mirrored.any():
+            m_games = games[mirrored]
+            m_x = (x[mirrored] - d_xy[mirrored, 0]) % self.size
+            m_y = (y[mirrored] - d_xy[mirrored, 1]) % self.size
+            written = self._place(m_games, m_x, m_y, chars[mirrored])
+            placed.append((m_games[written], m_x[written], m_y[written]))
+
+        # Place tile on board.
+        new_x, new_y = (x + d_xy[:, 0]) % self.size, (y + d_xy[:, 1]) % self.size
+        written = self._place(games, new_x, new_y, chars)
+        placed.append((games[written], new_x[written], new_y[written]))
+        self.position[games, 0], self.position[games, 1] = new_x, new_y
+
+        # Decay any status effect.
+        status = self.status[games]
+        self.status[games] = np.where(status > 0, status - 1, status)
+        self.n_moves[games] += 1
+
+        # Score words made through placed tiles.
+        jump_idx = STATUS_IDX["jump"]
+        runs = self._runs_through(*map(np.concatenate, zip(*placed)))
+        self.word_cache.prefetch([word for _, word in runs])
+        for game, word in runs:
+            if word in self.words[game] or (score := self.word_cache.score(word)) == 0:
+                continue
+            self.words[game].add(word)
+            points[game] += score
+            # If valid word, allow player to jump.
+            self.status[game, jump_idx] += 1
+
+        self.score += points
+        return points
+
+    def run_random(self, max_steps: Optional[int] = None) -> np.ndarray:
+        """
+        Play all games to the end with random moves.
+
+        :return: final scores.
+        """
+        n_steps = 0
+        while not self.done.all() and (max_steps is None or n_steps < max_steps):
+            self.step(*self.sample_random_actions())
+            n_steps += 1
+        return self.score
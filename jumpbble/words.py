@@ -0,0 +1,169 @@
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .grid import ChunkedGrid
+
+Coords = Tuple[int, int]
+# Axis and first cell of a word. Words along the same axis never overlap.
+WordKey = Tuple[int, Coords]
+
+
+def _zeros(cx: int, cy: int, shape: Tuple[int, int]) -> np.ndarray:
+    return np.zeros(shape, dtype=np.uint8)
+
+
+class WordIndex:
+    """
+    Valid words on the board, indexed by cell and by word.
+
+    Placing or erasing a letter only touches the words through the changed run, so updates
+    cost the length of the affected words, not the size of the board.
+    """
+
+    def __init__(self, size: int, chunked: bool = False) -> None:
+        """
+        :param size: number of cells per side of board.
+        :param chunked: store highlight mask as chunks. Used for large boards.
+        """
+        self.size = size
+        self.chunked = chunked
+        # Word and its cells by key.
+        self._words: Dict[WordKey, Tuple[str, Tuple[Coords, ...]]] = {}
+        # Key of word through each cell along each axis.
+        self._by_cell: Dict[Tuple[int, Coords], WordKey] = {}
+        # Number of words through each cell. Cells in any word are highlighted.
+        self.mask: Union[np.ndarray, ChunkedGrid] = (
+            ChunkedGrid(size, _zeros)
+            if chunked
+            else np.zeros((size, size), dtype=np.uint8)
+        )
+        # Words and starts restored but not added yet. See restore.
+        self._pending: Optional[Tuple[List[str], np.ndarray]] = None
+
+    @classmethod
+    def restore(
+        cls, size: int, chunked: bool, words: List[str], starts: np.ndarray
+    ) -> "WordIndex":
+        """
+        Get index of words saved with starts. Words are only added when the index is first
+        used, so a restored game costs nothing extra until its words change or are drawn.
+
+        :param words: words on board.
+        :param starts: x, y and axis of the first cell of each word.
+        """
+        index = cls(size, chunked)
+        if words:
+            index._pending = (words, starts)
+        return index
+
+    def _build(self) -> None:
+        words, starts = self._pending
+        self._pending = None
+        for word, (x, y, axis) in zip(words, starts.tolist()):
+            cells = [(x, y + n) if axis == 0 else (x + n, y) for n in range(len(word))]
+            self.add(word, cells)
+
+    @property
+    def words(self) -> Dict[WordKey, Tuple[str, Tuple[Coords, ...]]]:
+        """
+        Word and its cells by key.
+        """
+        if self._pending is not None:
+            self._build()
+        return self._words
+
+    def starts(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Get words and the x, y and axis of their first cell. ex. to save them.
+        """
+        if self._pending is not None:
+            return self._pending
+        words, starts = [], []
+        for (axis, (x, y)), (word, _) in self._words.items():
+            words.append(word)
+            starts.append((x, y, axis))
+        return words, np.array(starts, dtype=np.uint16).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        if self._pending is not None:
+            return len(self._pending[0])
+        return len(self._words)
+
+    def __iter__(self) -> Iterator[Tuple[str, Tuple[Coords, ...]]]:
+        """
+        Iterate over words and their cells.
+        """
+        return iter(self.words.values())
+
+    @staticmethod
+    def _axis(cells: Sequence[Coords]) -> int:
+        # Words along a row keep the same x.
+        return 0 if cells[0][0] == cells[1][0] else 1
+
+    def words_at(self, x: int, y: int) -> Iterator[str]:
+        """
+        Get words through a cell. At most one along each axis.
+        """
+        if self._pending is not None:
+            self._build()
+        for axis in (0, 1):
+            if (key := self._by_cell.get((axis, (x, y)))) is not None:
+                yield self.words[key][0]
+
+    def is_highlighted(self, x: int, y: int) -> bool:
+        if self._pending is not None:
+            self._build()
+        return self.mask[x, y] != 0
+
+    def window(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Get highlight mask of every combination of x and y. ex. the cells in view.
+
+        :return: bools with shape (len(xs), len(ys)).
+        """
+        if self._pending is not None:
+            self._build()
+        if self.chunked:
+            return self.mask.window(xs, ys) != 0
+        return self.mask[np.ix_(xs, ys)] != 0
+
+    def add(self, word: str, cells: Sequence[Coords]) -> None:
+        """
+        Add a word. Must not overlap a word along the same axis.
+
+        :param word: word on board.
+        :param cells: cells of each letter in order. More than one.
+        """
+        if self._pending is not None:
+            self._build()
+        axis = self._axis(cells)
+        cells = tuple(cells)
+        key = (axis, cells[0])
+        self._words[key] = (word, cells)
+        for cell in cells:
+            self._by_cell[(axis, cell)] = key
+            self.mask[cell] += 1
+
+    def remove(self, key: WordKey) -> None:
+        if self._pending is not None:
+            self._build()
+        axis = key[0]
+        _, cells = self._words.pop(key)
+        for cell in cells:
+            del self._by_cell[(axis, cell)]
+            self.mask[cell] -= 1
+
+    def update(self, word: Optional[str], cells: Sequence[Coords]) -> None:
+        """
+        Replace any words a run of letters has broken or extended by the run.
+
+        :param word: run if it's a valid word or None.
+        :param cells: cells of each letter in run.
+        """
+        if self._pending is not None:
+            self._build()
+        axis = self._axis(cells)
+        for key in {self._by_cell.get((axis, cell)) for cell in cells} - {None}:
+            self.remove(key)
+        if word is not None:
+            self.add(word, cells)
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+
+from jumpbble.loadgen import run_load
+from jumpbble.server import run_server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and latency of a Jumpbble server."
+    )
+    parser.add_argument(
+        "-S", "--socket", default="jumpbble.sock", help="Path of server's unix socket."
+    )
+    parser.add_argument(
+        "-n", "--sessions", type=int, default=100, help="Number of concurrent sessions."
+    )
+    parser.add_argument(
+        "-c", "--commands", type=int, default=200, help="Commands sent by each session."
+    )
+    parser.add_argument(
+        "-s", "--seed", type=int, default=0, help="Seed of first session."
+    )
+    parser.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start a server in another process for the run.",
+    )
+    parser.add_argument(
+        "-w",
+        "--words",
+        default=None,
+        help="Word list or compiled word graph of spawned server.",
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = multiprocessing.Process(
+            target=run_server,
+            args=(args.socket, args.words),
+            kwargs={"max_sessions": max(args.sessions, 1)},
+            daemon=True,
+        )
+        server.start()
+        # Wait for socket.
+        deadline = time.monotonic() + 30
+        while not os.path.exists(args.socket):
+            if not server.is_alive() or time.monotonic() > deadline:
+                sys.exit("Server didn't start")
+            time.sleep(0.05)
+    try:
+        report = asyncio.run(
+            run_load(args.socket, args.sessions, args.commands, seed=args.seed)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+            os.remove(args.socket)
+
+    json.dump(report, sys.stdout, indent=4)
+    print()
+
+
+if __name__ == "__main__":
+    main()
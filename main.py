@@ -1,8 +1,38 @@
+import argparse
+
+from jumpbble.advisor import Advisor
+from jumpbble.dictionary import open_dictionary
 from jumpbble.jumpbble import Jumpbble
+from jumpbble.telemetry import Recorder
 
 
 def main():
-    game = Jumpbble()
+    parser = argparse.ArgumentParser(description="Play Jumpbble.")
+    parser.add_argument(
+        "--board-size", type=int, default=None, help="Number of cells per side."
+    )
+    parser.add_argument(
+        "-w",
+        "--words",
+        default=None,
+        help="Compiled word graph or word list to use instead of enchant.",
+    )
+    parser.add_argument(
+        "--advisor",
+        action="store_true",
+        help="Hints estimate placements with rollouts in other processes.",
+    )
+    parser.add_argument(
+        "--telemetry", default=None, help="Directory to record every move to."
+    )
+    args = parser.parse_args()
+    dictionary = open_dictionary(args.words)
+    game = Jumpbble(
+        dictionary=dictionary,
+        board_dim=args.board_size,
+        advisor=Advisor(dictionary) if args.advisor else None,
+        recorder=Recorder(args.telemetry) if args.telemetry else None,
+    )
     game.start()
 
 
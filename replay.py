@@ -0,0 +1,46 @@
+import sys
+import time
+import argparse
+
+from jumpbble.selfplay import verify_journals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay Jumpbble journals and check their final states."
+    )
+    parser.add_argument("journals", nargs="+", help="Journal files.")
+    parser.add_argument(
+        "-j", "--processes", type=int, default=None, help="Number of processes."
+    )
+    parser.add_argument(
+        "-w",
+        "--words",
+        default=None,
+        help="Compiled word graph or word list to use instead of enchant.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_games, n_mismatched = 0, 0
+    for result in verify_journals(
+        args.journals, processes=args.processes, words_path=args.words
+    ):
+        n_games += 1
+        if not result["ok"]:
+            n_mismatched += 1
+            print(
+                f"Mismatch {result['path']}: "
+                f"expected {result['expected']}, replayed {result['replayed']}"
+            )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {n_games} games in {elapsed:.2f} s "
+        f"({n_games / elapsed:.0f} games/s). {n_mismatched} mismatched."
+    )
+    if n_mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
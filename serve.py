@@ -0,0 +1,42 @@
+import argparse
+
+from jumpbble.server import run_server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve many Jumpbble games from one process."
+    )
+    parser.add_argument(
+        "-S", "--socket", default="jumpbble.sock", help="Path of unix socket."
+    )
+    parser.add_argument(
+        "-w",
+        "--words",
+        default=None,
+        help="Compiled word graph or word list to use instead of enchant.",
+    )
+    parser.add_argument(
+        "--board-size", type=int, default=None, help="Number of cells per side."
+    )
+    parser.add_argument(
+        "--max-sessions", type=int, default=1024, help="Most sessions at once."
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds without a command before a session is evicted.",
+    )
+    args = parser.parse_args()
+    run_server(
+        args.socket,
+        args.words,
+        board_dim=args.board_size,
+        max_sessions=args.max_sessions,
+        idle_timeout=args.idle_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
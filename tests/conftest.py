@@ -0,0 +1,13 @@
+import pytest
+
+from jumpbble.dictionary import WordList
+
+WORDS = (
+    "AT ACT ART ARC AN AS BE CAR CAT DO DOG END GO HE IF IN IS IT ME NET NO OF ON ONE "
+    "OR RAT RED TAG TAR TEA TEN TO WE ZA EAT"
+).split()
+
+
+@pytest.fixture
+def dictionary() -> WordList:
+    return WordList(WORDS)
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from jumpbble.bag import Bag
+
+ALPHABET = "ABCDEFGH"
+
+
+def _next_available(left, letter):
+    # Reference: scan alphabet after letter, wrapping around.
+    start = ALPHABET.index(letter) + 1
+    for i in range(len(ALPHABET)):
+        candidate = ALPHABET[(start + i) % len(ALPHABET)]
+        if candidate in left:
+            return candidate
+    raise IndexError
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bag_matches_list_of_tiles(seed):
+    rng = random.Random(seed)
+    tiles = [rng.choice(ALPHABET[:-2]) for _ in range(60)]
+    bag, left = Bag(tiles, ALPHABET), list(tiles)
+
+    while left:
+        letter = rng.choice(ALPHABET)
+        assert bag.next_available(letter) == _next_available(left, letter)
+        if rng.random() < 0.5:
+            assert bag.draw() == left.pop(0)
+        else:
+            removed = _next_available(left, letter)
+            bag.remove(removed)
+            left.remove(removed)
+        assert list(bag) == left
+        assert len(bag) == len(left)
+        assert all(bag.count(letter) == left.count(letter) for letter in ALPHABET)
+
+    with pytest.raises(IndexError):
+        bag.draw()
+    with pytest.raises(IndexError):
+        bag.next_available("A")
+
+
+def test_only_letter_left_is_its_own_next():
+    bag = Bag("AB", ALPHABET)
+    bag.remove("B")
+    assert bag.next_available("A") == "A"
+    with pytest.raises(ValueError):
+        bag.remove("B")
+
+
+def test_restored_bag_continues_like_original():
+    tiles = "CABBAGEHEAD"
+    bag = Bag(tiles, ALPHABET)
+    bag.draw()
+    bag.remove("E")
+    restored = Bag(bag.order, ALPHABET, bytes(bag.taken))
+    assert list(restored) == list(bag)
+    assert [restored.next_available(letter) for letter in ALPHABET] == [
+        bag.next_available(letter) for letter in ALPHABET
+    ]
+    assert [restored.draw() for _ in range(len(restored))] == [
+        bag.draw() for _ in range(len(bag))
+    ]
@@ -0,0 +1,76 @@
+import random
+
+import numpy as np
+import pytest
+
+from jumpbble.board import Board
+from jumpbble.config import load_special_tiles
+from jumpbble.player import Player
+
+
+def _board(size: int, chunked: bool, seed: int = 0) -> Board:
+    player = Player(position=(size // 2, size // 2))
+    return Board(
+        player,
+        size,
+        load_special_tiles(),
+        track_words=True,
+        rng=random.Random(seed),
+        chunked=chunked,
+    )
+
+
+def _cells(board: Board) -> np.ndarray:
+    indices = np.arange(board.size)
+    return board.window(indices, indices)
+
+
+def _runs(runs):
+    return {(word, tuple(cells)) for word, cells in runs}
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_new_words_match_full_scan(chunked, seed):
+    # Small board so runs often reach the edges.
+    board = _board(12, chunked, seed)
+    rng = random.Random(seed)
+    list(board.find_new_words())
+    for _ in range(150):
+        before = _cells(board)
+        board.place_piece((rng.randint(-3, 3), rng.randint(-3, 3)), rng.choice("ATE"))
+        changed = {tuple(cell) for cell in np.argwhere(_cells(board) != before)}
+
+        landed = board.player.position
+        all_runs = _runs(board.find_words())
+        new_runs = _runs(board.find_new_words())
+        # Every run through a changed cell and nothing but runs through the placed cell,
+        # which can be rewritten with the same letter while erasing.
+        assert {run for run in all_runs if changed.intersection(run[1])} <= new_runs
+        assert new_runs <= {run for run in all_runs if landed in run[1]}
+
+
+def test_runs_touching_edges_are_found():
+    board = _board(8, False)
+    board.grid[0, :] = 0
+    board.grid[0, :3] = np.frombuffer(b"CAT", dtype=np.uint8)
+    board.grid[0, 5:] = np.frombuffer(b"DOG", dtype=np.uint8)
+    board.grid[5:, 7] = np.frombuffer(b"TEA", dtype=np.uint8)
+    found = _runs(board.find_words())
+    assert ("CAT", ((0, 0), (0, 1), (0, 2))) in found
+    assert ("DOG", ((0, 5), (0, 6), (0, 7))) in found
+    assert ("TEA", ((5, 7), (6, 7), (7, 7))) in found
+    assert board.run_through(0, 7, 0) == ("DOG", [(0, 5), (0, 6), (0, 7)])
+    assert board.run_through(7, 7, 1) == ("TEA", [(5, 7), (6, 7), (7, 7)])
+
+
+def test_replaced_grid_is_rescanned_unless_told_not_to():
+    board = _board(12, False)
+    grid = board.grid.copy()
+    grid[3, 3:6] = np.frombuffer(b"CAT", dtype=np.uint8)
+    board.replace_grid(grid)
+    assert _runs(board.find_new_words()) == _runs(board.find_words())
+    assert not list(board.find_new_words())
+
+    board.replace_grid(grid.copy(), rescan=False)
+    assert not list(board.find_new_words())
@@ -0,0 +1,73 @@
+import pytest
+
+from jumpbble.cache import WordCache
+
+LETTER_SCORES = {"A": 1, "C": 3, "D": 2, "G": 2, "O": 1, "T": 1}
+
+
+class _Checker:
+    def __init__(self, words) -> None:
+        self.words = set(words)
+        self.checked = []
+
+    def check(self, word: str) -> bool:
+        self.checked.append(word)
+        return word in self.words
+
+    def check_many(self, words):
+        self.checked.extend(words)
+        return [word in self.words for word in words]
+
+
+def test_least_recently_used_word_is_evicted():
+    checker = _Checker(["CAT", "DOG", "TAG"])
+    cache = WordCache(checker.check, LETTER_SCORES, maxsize=2)
+    assert cache.score("CAT") == 5
+    assert cache.score("DOG") == 5
+    # Using CAT makes DOG the least recently used.
+    assert cache.score("CAT") == 5
+    assert cache.score("TAG") == 4
+    assert "CAT" in cache and "TAG" in cache
+    assert "DOG" not in cache
+    assert len(cache) == 2
+
+    assert cache.score("DOG") == 5
+    assert "CAT" not in cache
+    assert checker.checked == ["CAT", "DOG", "TAG", "DOG"]
+
+
+def test_invalid_words_are_cached_as_zero():
+    checker = _Checker([])
+    cache = WordCache(checker.check, LETTER_SCORES)
+    assert cache.score("CTA") == 0
+    assert cache.score("CTA") == 0
+    assert checker.checked == ["CTA"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get("TCA") is None
+
+
+def test_prefetch_checks_uncached_words_once():
+    checker = _Checker(["CAT", "DOG"])
+    cache = WordCache(
+        checker.check, LETTER_SCORES, maxsize=8, check_many=checker.check_many
+    )
+    cache.score("CAT")
+    cache.prefetch(["CAT", "DOG", "GOD", "DOG"])
+    assert checker.checked == ["CAT", "DOG", "GOD"]
+    assert [cache.get(word) for word in ("DOG", "GOD")] == [5, 0]
+
+
+def test_invalidate():
+    checker = _Checker(["CAT", "DOG"])
+    cache = WordCache(checker.check, LETTER_SCORES)
+    cache.score("CAT")
+    cache.score("DOG")
+    cache.invalidate("CAT")
+    assert "CAT" not in cache and "DOG" in cache
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        WordCache(str.isupper, LETTER_SCORES, maxsize=0)
@@ -0,0 +1,83 @@
+import threading
+
+from jumpbble.dictionary import WordList
+from jumpbble.engine import Move, SelectTile, SetWildcard
+from jumpbble.jumpbble import Jumpbble
+from jumpbble.solver import Hint
+
+from conftest import WORDS
+
+
+class _Advisor:
+    searching = True
+
+    def __init__(self) -> None:
+        self.n_cancels = 0
+
+    def cancel(self) -> None:
+        self.n_cancels += 1
+        self.searching = False
+
+    def close(self) -> None:
+        self.cancel()
+
+
+def _client_with_wildcard(dictionary, **kwargs):
+    # Seed 1 starts with a wildcard tile.
+    client = Jumpbble(dictionary=dictionary, seed=1, **kwargs)
+    return client, client.game.current_tiles.index("*")
+
+
+def test_stale_hint_is_dropped(dictionary):
+    client, tile = _client_with_wildcard(dictionary)
+    game = client.game
+    client._try_step(SelectTile(tile))
+    client._try_step(SetWildcard("Q"))
+    tiles = list(game.current_tiles)
+
+    # Found while the tile was still a wildcard.
+    client._set_hint(Hint(5, tile, "C", Move((3, 0))))
+
+    assert client.hint is None
+    assert game.current_tiles == tiles
+    assert game.selected_tile == tile
+    client.close()
+
+
+def test_selection_cancels_advisor(dictionary):
+    advisor = _Advisor()
+    client, tile = _client_with_wildcard(dictionary, advisor=advisor)
+    client._try_step(SelectTile(tile))
+    assert advisor.n_cancels == 1
+    client._try_step(SetWildcard("Q"))
+    assert advisor.n_cancels == 2
+    client.close()
+
+
+class _SlowWords(WordList):
+    def __init__(self, words) -> None:
+        super().__init__(words)
+        self.release = threading.Event()
+
+    def check(self, word: str) -> bool:
+        self.release.wait(5)
+        return super().check(word)
+
+
+def test_checked_words_redraw_without_new_points():
+    dictionary = _SlowWords(WORDS)
+    client = Jumpbble(dictionary=dictionary, seed=3)
+    game = client.game
+    # Words already scored only change highlights.
+    game.all_words.update(WORDS)
+    while not len(game.word_index):
+        dictionary.release.clear()
+        client._try_step(game.legal_moves()[1])
+        frame_state = client._get_frame_state()
+        score = game.player.score
+        dictionary.release.set()
+        client.validator.wait()
+
+    assert game.player.score == score
+    assert client._get_frame_state() != frame_state
+    client.close()
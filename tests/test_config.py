@@ -0,0 +1,106 @@
+import sys
+import json
+import random
+import pathlib
+import subprocess
+
+import pytest
+
+from jumpbble.config import (
+    EffectTable,
+    compile_config,
+    load_config,
+    load_letters,
+    load_special_tiles,
+)
+
+LETTERS = {"A": {"Number": 2, "Score": 1}, "B": {"Number": 1, "Score": 3}}
+SPECIAL_TILES = {"jump": 0.5, "erase": 0.25, "blind": 0.25}
+
+
+def test_config_is_loaded_once():
+    config = load_config()
+    assert load_config() is config
+    assert len(config.tiles) == sum(m["Number"] for m in config.letters.values())
+    assert config.letter_scores == {
+        letter: m["Score"] for letter, m in config.letters.items()
+    }
+
+
+def test_loaders_return_copies():
+    letters = load_letters()
+    letter = next(iter(letters))
+    letters[letter]["Score"] += 100
+    load_special_tiles().clear()
+    assert load_letters()[letter]["Score"] == letters[letter]["Score"] - 100
+    assert load_special_tiles() == load_config().special_tiles_dist
+
+
+def test_config_from_directory(tmp_path):
+    with open(tmp_path / "letters.json", "w") as json_stream:
+        json.dump(LETTERS, json_stream)
+    with open(tmp_path / "special_tiles.json", "w") as json_stream:
+        json.dump(SPECIAL_TILES, json_stream)
+    config = load_config(tmp_path)
+    assert config.tiles == ("A", "A", "B")
+    assert config.effects.effects == ("jump", "erase", "blind")
+    assert config.effects.cum_weights == (0.5, 0.75, 1.0)
+
+
+@pytest.mark.parametrize(
+    "letters, special_tiles",
+    [
+        ({}, SPECIAL_TILES),
+        ({"AB": {"Number": 1, "Score": 1}}, SPECIAL_TILES),
+        ({"?": {"Number": 1, "Score": 1}}, SPECIAL_TILES),
+        ({"A": {"Number": -1, "Score": 1}}, SPECIAL_TILES),
+        ({"A": {"Number": 1, "Score": 1.5}}, SPECIAL_TILES),
+        ({"A": {"Number": 0, "Score": 1}}, SPECIAL_TILES),
+        (LETTERS, {}),
+        (LETTERS, {"fly": 1.0}),
+        (LETTERS, {"jump": -0.5}),
+        (LETTERS, {"jump": 0.0}),
+        (LETTERS, {"jump": float("nan")}),
+    ],
+)
+def test_invalid_config_is_rejected(letters, special_tiles):
+    with pytest.raises(ValueError):
+        compile_config(letters, special_tiles)
+
+
+def test_roll_matches_random_choices():
+    table = EffectTable.of(SPECIAL_TILES)
+    rng, expected_rng = random.Random(0), random.Random(0)
+    rolls = [table.roll(rng) for _ in range(200)]
+    expected = [
+        expected_rng.choices(list(SPECIAL_TILES), list(SPECIAL_TILES.values()))[0]
+        for _ in range(200)
+    ]
+    assert rolls == expected
+
+
+def test_letter_spaces():
+    config = compile_config({**LETTERS, "*": {"Number": 1, "Score": 0}}, SPECIAL_TILES)
+    assert config.letter_spaces(15) == {"A": 1, "B": 2, "*": 0}
+    # Moving the length of the board lands on the same cell.
+    assert config.letter_spaces(2) == {"A": 1, "B": 0, "*": 0}
+
+
+def test_heavy_modules_load_on_first_use():
+    # Fresh interpreter so modules imported by other tests don't count.
+    code = (
+        "import sys, types, jumpbble.jumpbble, jumpbble.selfplay\n"
+        "pygame = sys.modules['pygame']\n"
+        "loaded = [type(pygame) is types.ModuleType, 'enchant' in sys.modules]\n"
+        "pygame.init\n"
+        "print(*loaded, type(pygame) is types.ModuleType)\n"
+    )
+    repo_dir = pathlib.Path(__file__).parents[1]
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert output[-3:] == ["False", "False", "True"]
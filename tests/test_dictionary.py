@@ -0,0 +1,36 @@
+import pytest
+
+from jumpbble import dictionary
+from jumpbble.dictionary import (
+    CompiledDictionary,
+    Dictionary,
+    WordList,
+    compile_words,
+)
+
+from conftest import WORDS
+
+
+def test_dictionary_without_check_cant_be_built():
+    class NoCheck(Dictionary):
+        pass
+
+    with pytest.raises(TypeError):
+        NoCheck()
+
+
+# Batches are checked one word at a time or all at once depending on size.
+@pytest.mark.parametrize("min_vector_batch", [1, 1 << 14])
+def test_compiled_matches_word_list(tmp_path, monkeypatch, min_vector_batch):
+    monkeypatch.setattr(dictionary, "_MIN_VECTOR_BATCH", min_vector_batch)
+    path = str(tmp_path / "words.jbd")
+    compile_words(WORDS, path)
+    compiled, words = CompiledDictionary(path), WordList(WORDS)
+    queries = WORDS + ["A", "CA", "CATS", "ZZ", "dog"]
+    try:
+        assert compiled.check_many(queries) == words.check_many(queries)
+        assert [compiled.has_prefix(query) for query in queries] == [
+            words.has_prefix(query) for query in queries
+        ]
+    finally:
+        compiled.close()
@@ -0,0 +1,66 @@
+import pytest
+
+from jumpbble.dictionary import WordList
+from jumpbble.engine import GameState, Move, SelectTile
+from jumpbble.journal import Journal, Summary, replay, verify
+
+
+def test_jump_past_int16_is_recorded(dictionary):
+    state = GameState(dictionary, seed=1)
+    state.player.status.add("jump", 2)
+    x, y = state.player.position
+    state.step(Move((40000, -40000)))
+
+    *_, move = state.journal
+    size = state.board.size
+    assert move == Move(state.board.wrap_offset(40000, -40000))
+    assert state.player.position == ((x + 40000) % size, (y - 40000) % size)
+
+
+def test_wildcard_tile_moved_far_replays(dictionary):
+    state = GameState(dictionary, seed=3)
+    state.step(SelectTile(state.current_tiles.index("*")))
+    state.step(Move((40000, 0)))
+
+    journal, summary = Journal.from_bytes(state.journal.to_bytes(Summary.of(state)))
+    replayed = replay(journal, dictionary)
+    assert Summary.of(replayed) == summary
+
+
+def test_replays_sharing_caches_match(dictionary):
+    shared = GameState(dictionary, seed=0)
+    for seed in range(3):
+        state = GameState(dictionary, seed=seed)
+        while not state.is_over:
+            state.step(state.legal_moves()[seed])
+        summary = Summary.of(state)
+        assert verify(state.journal, summary, dictionary, shared=shared) == (
+            True,
+            summary,
+        )
+
+
+def test_debug_changes_survive_save_and_block_replay(dictionary):
+    state = GameState(dictionary, seed=1)
+    state.step(state.legal_moves()[0])
+    state.journal.mark_debug()
+    state.player.status.add("jump", 3)
+
+    journal, summary = Journal.from_bytes(state.journal.to_bytes(Summary.of(state)))
+    assert journal.debug
+    with pytest.raises(ValueError):
+        replay(journal, dictionary)
+    assert verify(journal, summary, dictionary) == (False, Summary(-1, -1, 0))
+
+
+def test_word_cache_not_shared_across_dictionaries(dictionary):
+    state = GameState(dictionary, seed=3)
+    while not state.is_over:
+        state.step(state.legal_moves()[1])
+    summary = Summary.of(state)
+    assert state.all_words
+
+    shared = GameState(WordList([]), seed=0)
+    for word in state.all_words:
+        shared.word_cache.score(word)
+    assert verify(state.journal, summary, dictionary, shared=shared) == (True, summary)
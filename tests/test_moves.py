@@ -0,0 +1,32 @@
+import random
+import tracemalloc
+
+from jumpbble.engine import GameState, Move
+from jumpbble.moves import JumpMoves
+
+
+def test_jump_moves_match_every_cell():
+    moves = JumpMoves((1, 2), 4)
+    expected = [Move((x - 1, y - 2)) for x in range(4) for y in range(4)]
+    assert list(moves) == expected
+    assert [moves[i] for i in range(-16, 16)] == expected * 2
+    assert moves[3:9:2] == expected[3:9:2]
+    assert Move((2, 1)) in moves and Move((3, 0)) not in moves
+
+
+def test_jumps_on_large_board_use_bounded_memory(dictionary):
+    state = GameState(dictionary, seed=0, board_dim=4096)
+    state.player.status.add("jump", 1)
+
+    tracemalloc.start()
+    try:
+        moves = state.legal_moves()
+        move = random.Random(0).choice(moves)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(moves) == 4096 * 4096
+    assert peak < 64 * 1024
+    state.step(move)
+    assert state.n_moves == 1
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from jumpbble.player import STATUS_BITS, STATUS_NAMES, Player, Statuses
+
+
+def _active(turns):
+    return sum(STATUS_BITS[name] for name, n_turns in turns.items() if n_turns > 0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_active_mask_follows_turns(seed):
+    rng = random.Random(seed)
+    statuses = Statuses()
+    turns = dict.fromkeys(STATUS_NAMES, 0)
+    for _ in range(300):
+        name, op = rng.choice(STATUS_NAMES), rng.random()
+        if op < 0.3:
+            n_turns = rng.randrange(1, 5)
+            statuses.add(name, n_turns)
+            turns[name] += n_turns
+        elif op < 0.4:
+            n_turns = rng.randrange(0, 5)
+            statuses.set(name, n_turns)
+            turns[name] = n_turns
+        else:
+            statuses.decay()
+            turns = {name: max(n_turns - 1, 0) for name, n_turns in turns.items()}
+        assert statuses.as_dict() == turns
+        assert statuses.active == _active(turns)
+
+
+def test_turns_round_trip_through_array():
+    statuses = Statuses()
+    statuses.add("jump", 2)
+    statuses["erase"].turns = 5
+
+    restored = Statuses()
+    restored.load(statuses.to_array())
+    assert restored.as_dict() == statuses.as_dict()
+    assert restored.active == STATUS_BITS["jump"] | STATUS_BITS["erase"]
+    # Copies, not views.
+    array = restored.to_array()
+    array[:] = 0
+    assert restored["erase"].turns == 5
+    assert isinstance(array, np.ndarray)
+
+
+def test_views_read_like_a_dict():
+    statuses = Statuses()
+    statuses.add("mirror", 1)
+    assert list(statuses) == list(STATUS_NAMES)
+    assert "mirror" in statuses and "nothing" not in statuses
+    assert statuses.get("nothing") is None
+    assert {name: status.turns for name, status in statuses.items()} == (
+        statuses.as_dict()
+    )
+    assert statuses["mirror"].name == "mirror"
+
+
+def test_player_is_affected():
+    player = Player(position=(0, 0))
+    player.status.add("blind", 1)
+    assert player.is_affected("blind")
+    assert not player.is_affected("jump")
+    player.status.decay()
+    assert not player.is_affected("blind")
+    with pytest.raises(ValueError):
+        player.is_affected("nothing")
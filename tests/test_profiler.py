@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from jumpbble.profiler import PROFILER, Profiler, profiled
+
+
+def _frame(profiler: Profiler, **counts) -> None:
+    profiler.start_frame()
+    for name, n in counts.items():
+        profiler.count(name, n)
+    profiler.end_frame()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.timer("scan"):
+        pass
+    _frame(profiler, lookups=3)
+    assert profiler.frames == 0
+    assert profiler.report() == {}
+
+
+def test_counters_are_summed_per_frame_over_window():
+    profiler = Profiler(window=4)
+    profiler.enabled = True
+    for n in range(1, 7):
+        _frame(profiler, lookups=n)
+    # Frame without lookups still counts as 0.
+    _frame(profiler)
+
+    assert profiler.frames == 7
+    assert list(profiler.samples["lookups"]) == [4, 5, 6, 0]
+    assert profiler.totals["lookups"] == 21
+    assert profiler.percentiles("lookups") == {"p50": 5, "p95": 6, "p99": 6}
+    report = profiler.report()["lookups"]
+    assert report["max"] == 6
+    assert report["mean"] == 15 / 4
+    assert {"frame", "alloc_blocks", "gc"} <= profiler.report().keys()
+
+
+def test_timers_and_calls(tmp_path):
+    profiler = Profiler()
+    profiler.enabled = True
+    profiler.start_frame()
+    for _ in range(3):
+        with profiler.timer("scan"):
+            pass
+    profiler.end_frame()
+    assert profiler.totals["scan_calls"] == 3
+    assert 0 <= profiler.samples["scan"][0] <= profiler.samples["frame"][0]
+    assert profiler.overlay_lines()[0].split() == ["stage", "p50", "p95", "p99"]
+
+    path = tmp_path / "profile.json"
+    profiler.dump(str(path))
+    with open(path) as json_stream:
+        dumped = json.load(json_stream)
+    assert dumped["frames"] == 1
+    assert dumped["samples"]["scan"] == list(profiler.samples["scan"])
+
+    profiler.reset()
+    assert profiler.frames == 0
+    assert not profiler.samples
+
+
+@pytest.fixture
+def shared_profiler():
+    PROFILER.reset()
+    PROFILER.enabled = True
+    yield PROFILER
+    PROFILER.enabled = False
+    PROFILER.reset()
+
+
+def test_profiled_functions_are_timed(shared_profiler):
+    @profiled("work")
+    def work(n):
+        return n * 2
+
+    shared_profiler.start_frame()
+    assert work(2) == 4
+    assert work(3) == 6
+    shared_profiler.end_frame()
+    assert shared_profiler.totals["work_calls"] == 2
+    assert len(shared_profiler.samples["work"]) == 1
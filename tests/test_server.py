@@ -0,0 +1,101 @@
+import json
+import asyncio
+
+import pytest
+
+from jumpbble.server import GameServer, parse_action
+from jumpbble.engine import GameState, Move
+
+
+async def _session(server, path, lines):
+    await server.start(path)
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+        replies = []
+        for line in lines:
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        return replies
+    finally:
+        await server.close()
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        {"op": "move", "d_xy": [float("inf"), 0]},
+        {"op": "move", "d_xy": [float("nan"), 0]},
+        {"op": "move", "d_xy": [10**6, 0]},
+        {"op": "move", "d_xy": [1]},
+        {"op": "select"},
+        {"op": "fly"},
+    ],
+)
+def test_parse_action_rejects_malformed(message):
+    with pytest.raises(ValueError):
+        parse_action(message)
+
+
+def test_parse_action_move():
+    assert parse_action({"op": "move", "d_xy": [3, -2]}) == Move((3, -2))
+
+
+def test_malformed_commands_get_error_replies(dictionary, tmp_path):
+    server = GameServer(dictionary)
+    replies = asyncio.run(
+        _session(
+            server,
+            str(tmp_path / "jumpbble.sock"),
+            [
+                '{"op": "new", "seed": 1}',
+                '{"op": "move", "d_xy": [Infinity, 0]}',
+                '{"op": "view", "x": Infinity}',
+                '{"op": "new", "seed": -Infinity}',
+                '{"op": "move", "d_xy": [1000000, 0]}',
+                '{"op": "stats"}',
+            ],
+        )
+    )
+    assert [reply["op"] for reply in replies] == [
+        "update",
+        "error",
+        "error",
+        "error",
+        "error",
+        "stats",
+    ]
+
+
+def test_far_move_of_wildcard_tile(dictionary, tmp_path):
+    server = GameServer(dictionary)
+    state = server.new_game(1)
+    tile = state.current_tiles.index("*")
+    replies = asyncio.run(
+        _session(
+            server,
+            str(tmp_path / "jumpbble.sock"),
+            [
+                '{"op": "new", "seed": 1}',
+                json.dumps({"op": "select", "tile": tile}),
+                '{"op": "move", "d_xy": [40000, 0]}',
+            ],
+        )
+    )
+    assert replies[-1]["op"] == "update"
+    assert replies[-1]["position"] == [
+        (state.player.position[0] + 40000) % state.board.size,
+        state.player.position[1],
+    ]
+
+
+def test_sessions_share_caches(dictionary):
+    server = GameServer(dictionary)
+    first, second = server.new_game(1), server.new_game(2)
+    assert second.word_cache is first.word_cache
+    assert second.moves is first.moves
+    # Shared table gives the same moves as the game's own.
+    assert list(second.legal_moves()) == list(
+        GameState(dictionary, seed=2).legal_moves()
+    )
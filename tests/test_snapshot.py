@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from jumpbble import snapshot
+from jumpbble.engine import GameState
+from jumpbble.journal import Summary
+from jumpbble.selfplay import solver_policy
+
+
+def _play(state: GameState, rng: random.Random, n_turns: int) -> None:
+    for _ in range(n_turns):
+        if state.is_over:
+            return
+        for action in solver_policy(state, rng):
+            state.step(action)
+
+
+@pytest.mark.parametrize("board_dim", [15, 1100])
+def test_loaded_game_continues_like_saved(dictionary, tmp_path, board_dim):
+    path = tmp_path / "jumpbble.sav"
+    state = GameState(dictionary, seed=2, board_dim=board_dim)
+    _play(state, random.Random(0), 40)
+    assert len(state.word_index) > 0
+    snapshot.save(state, path)
+
+    loaded = GameState(dictionary, seed=9, board_dim=board_dim)
+    snapshot.load(loaded, path)
+    assert snapshot.dumps_state(loaded) == snapshot.dumps_state(state)
+    assert loaded.word_index.words == state.word_index.words
+
+    _play(state, random.Random(1), 40)
+    _play(loaded, random.Random(1), 40)
+    assert Summary.of(loaded) == Summary.of(state)
+    assert loaded.word_index.words == state.word_index.words
+
+
+def test_index_is_built_on_first_use(dictionary, tmp_path):
+    path = tmp_path / "jumpbble.sav"
+    state = GameState(dictionary, seed=2)
+    _play(state, random.Random(0), 40)
+    snapshot.save(state, path)
+
+    loaded = GameState(dictionary)
+    snapshot.load(loaded, path)
+    assert loaded.word_index._pending is not None
+    assert len(loaded.word_index) == len(state.word_index)
+    (word, cells), *_ = state.word_index
+    assert word in loaded.word_index.words_at(*cells[0])
+    assert loaded.word_index._pending is None
+
+
+def test_first_move_after_load_only_rescans_its_cells(
+    dictionary, tmp_path, monkeypatch
+):
+    path = tmp_path / "jumpbble.sav"
+    state = GameState(dictionary, seed=2, board_dim=1100)
+    _play(state, random.Random(0), 20)
+    snapshot.save(state, path)
+
+    loaded = GameState(dictionary, board_dim=1100)
+    snapshot.load(loaded, path)
+    monkeypatch.setattr(
+        loaded.board, "find_words", lambda: pytest.fail("Whole board rescanned")
+    )
+    _play(state, random.Random(1), 1)
+    _play(loaded, random.Random(1), 1)
+    assert Summary.of(loaded) == Summary.of(state)
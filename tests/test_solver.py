@@ -0,0 +1,67 @@
+import random
+
+from jumpbble.dictionary import Dictionary, WordList
+from jumpbble.engine import GameState
+from jumpbble.journal import Journal, Summary, verify
+from jumpbble.selfplay import move_points, solver_policy
+from jumpbble.solver import Solver
+
+from conftest import WORDS
+
+
+class _CountingWords(WordList):
+    def __init__(self, words) -> None:
+        super().__init__(words)
+        self.n_checks = 0
+
+    def check(self, word: str) -> bool:
+        self.n_checks += 1
+        return super().check(word)
+
+
+class _NoPrefixes(Dictionary):
+    """
+    Same words without prefix checks.
+    """
+
+    def __init__(self, words: _CountingWords) -> None:
+        self.words = words
+
+    def check(self, word: str) -> bool:
+        return self.words.check(word)
+
+
+def _wildcard_game(dictionary) -> GameState:
+    # Seed 1 starts with a wildcard tile, so every letter is tried on every cell.
+    state = GameState(dictionary, seed=1)
+    for x in range(state.board.size):
+        state.board.grid[x, 7] = state.board.encode("TAR"[x % 3])
+    return state
+
+
+def test_prefix_index_prunes_dictionary_checks():
+    pruned_words, full_words = _CountingWords(WORDS), _CountingWords(WORDS)
+    pruned = Solver(_wildcard_game(pruned_words)).placements()
+    full = Solver(_wildcard_game(_NoPrefixes(full_words))).placements()
+
+    assert sorted(pruned) == sorted(full)
+    assert max(hint.points for hint in pruned) > 0
+    assert 0 < pruned_words.n_checks < full_words.n_checks
+
+
+def test_hints_leave_chunked_board_unchanged(dictionary):
+    state = GameState(dictionary, seed=2, board_dim=1100)
+    rng = random.Random(0)
+    for _ in range(10):
+        for action in solver_policy(state, rng):
+            state.step(action)
+    modified = set(state.board.grid.modified)
+
+    Solver(state).best(3)
+    for move in state.legal_moves()[:50]:
+        move_points(state, move)
+
+    assert state.board.grid.modified == modified
+    summary = Summary.of(state)
+    journal, _ = Journal.from_bytes(state.journal.to_bytes(summary))
+    assert verify(journal, summary, dictionary) == (True, summary)
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from jumpbble.engine import GameState
+from jumpbble.player import STATUS_NAMES
+from jumpbble.selfplay import solver_policy
+from jumpbble.telemetry import Recorder, Telemetry
+
+
+def _recorded_game(dictionary, path, chunk_size):
+    state = GameState(dictionary, seed=2)
+    recorder = Recorder(path, chunk_size=chunk_size)
+    state.set_recorder(recorder)
+    rng = random.Random(0)
+    positions, words = [], []
+    while not state.is_over:
+        scored = set(state.all_words)
+        for action in solver_policy(state, rng):
+            state.step(action)
+        positions.append(state.player.position)
+        words.append(sorted(state.all_words - scored))
+    recorder.close()
+    return state, positions, words
+
+
+def test_chunks_read_back_as_recorded(dictionary, tmp_path):
+    state, positions, words = _recorded_game(dictionary, tmp_path, chunk_size=7)
+    telemetry = Telemetry(tmp_path)
+
+    assert len(telemetry) == state.n_moves
+    assert telemetry.n_chunks == -(-state.n_moves // 7)
+    assert all(n_rows == 7 for n_rows in telemetry.chunk_rows[:-1])
+    assert telemetry.column("move").tolist() == list(range(state.n_moves))
+    assert list(zip(telemetry.column("x"), telemetry.column("y"))) == positions
+    assert telemetry.column("points").sum() == state.player.score
+    assert [sorted(move_words) for move_words in telemetry.words()] == words
+    assert (telemetry.column("n_words") == [len(w) for w in words]).all()
+    effects = telemetry.column("effect")
+    assert ((effects >= -1) & (effects < len(STATUS_NAMES))).all()
+    assert telemetry.effects == list(STATUS_NAMES)
+
+
+def test_one_chunk_is_mapped_not_copied(dictionary, tmp_path):
+    state, _, _ = _recorded_game(dictionary, tmp_path, chunk_size=4096)
+    telemetry = Telemetry(tmp_path)
+    assert telemetry.n_chunks == 1
+    column = telemetry.column("points")
+    assert isinstance(column, np.memmap)
+    assert not column.flags.writeable
+
+
+def test_new_recording_replaces_old(dictionary, tmp_path):
+    _recorded_game(dictionary, tmp_path, chunk_size=3)
+    Recorder(tmp_path).close()
+    # Chunks of the old recording aren't listed any more.
+    with pytest.raises(OSError):
+        Telemetry(tmp_path)
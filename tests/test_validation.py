@@ -0,0 +1,114 @@
+import random
+import threading
+
+from jumpbble.dictionary import WordList
+from jumpbble.engine import GameState
+from jumpbble.journal import Summary
+from jumpbble.selfplay import solver_policy
+from jumpbble.validation import WordValidator
+
+from conftest import WORDS
+
+
+class _GatedWords(WordList):
+    def __init__(self, words) -> None:
+        super().__init__(words)
+        self.release = threading.Event()
+        self.release.set()
+        self.n_checks = 0
+
+    def check(self, word: str) -> bool:
+        self.release.wait(5)
+        self.n_checks += 1
+        return super().check(word)
+
+
+def _play(state: GameState, validator=None) -> None:
+    rng = random.Random(0)
+    while not state.is_over:
+        for action in solver_policy(state, rng):
+            state.step(action)
+        if validator is not None:
+            validator.wait()
+
+
+def test_background_checks_score_like_inline(dictionary):
+    inline = GameState(dictionary, seed=4)
+    _play(inline)
+
+    validator = WordValidator()
+    state = GameState(_GatedWords(WORDS), seed=4)
+    state.word_validator = validator
+    try:
+        _play(state, validator)
+    finally:
+        validator.close()
+    assert inline.player.score > 0
+    assert Summary.of(state) == Summary.of(inline)
+    assert state.all_words == inline.all_words
+    assert set(state.word_index) == set(inline.word_index)
+    assert validator.n_applied == state.n_moves
+
+
+def test_moves_wait_for_checks_of_last_move():
+    dictionary = _GatedWords(WORDS)
+    validator = WordValidator()
+    state = GameState(dictionary, seed=3)
+    state.word_validator = validator
+    try:
+        # Moves whose words are all cached are applied at once.
+        dictionary.release.clear()
+        while not validator.busy:
+            state.step(state.legal_moves()[1])
+            validator.apply_ready()
+        # Checks are still running, so no move is legal until they're applied.
+        assert not state.legal_moves()
+        assert not state.is_legal(state.direction_move("right"))
+        dictionary.release.set()
+        validator.wait()
+        assert not validator.busy
+        assert state.legal_moves()
+    finally:
+        dictionary.release.set()
+        validator.close()
+
+
+def test_cached_words_are_applied_without_checking():
+    dictionary = _GatedWords(WORDS)
+    validator = WordValidator()
+    state = GameState(dictionary, seed=3)
+    # Every word of the game is already cached.
+    replay = GameState(dictionary, seed=3)
+    _play(replay)
+    n_checks = dictionary.n_checks
+    state.word_cache = replay.word_cache
+    state.word_validator = validator
+    dictionary.release.clear()
+    try:
+        rng = random.Random(0)
+        while not state.is_over:
+            for action in solver_policy(state, rng):
+                state.step(action)
+            assert validator.apply_ready() >= 0
+            assert not validator.busy
+    finally:
+        dictionary.release.set()
+        validator.close()
+    assert dictionary.n_checks == n_checks
+    assert Summary.of(state) == Summary.of(replay)
+
+
+def test_clear_drops_unscored_moves():
+    dictionary = _GatedWords(WORDS)
+    dictionary.release.clear()
+    validator = WordValidator()
+    state = GameState(dictionary, seed=3)
+    state.word_validator = validator
+    state.step(state.legal_moves()[0])
+    assert validator.busy
+    validator.clear()
+    dictionary.release.set()
+    assert not validator.busy
+    assert validator.wait() == 0
+    assert validator.n_applied == 0
+    validator.close()
@@ -0,0 +1,76 @@
+import numpy as np
+
+from jumpbble.board import Board
+from jumpbble.player import STATUS_IDX
+from jumpbble.vecsim import N_DIAGONAL_DIRECTIONS, BatchSimulator
+
+
+def _naive_runs(line: np.ndarray, idx: int):
+    # Letters either side of idx up to the first cell that isn't a letter.
+    if line[idx] in Board.DEFAULT_CODES:
+        return None
+    start, end = idx, idx + 1
+    while start > 0 and line[start - 1] not in Board.DEFAULT_CODES:
+        start -= 1
+    while end < len(line) and line[end] not in Board.DEFAULT_CODES:
+        end += 1
+    return line[start:end].tobytes().decode() if end - start > 1 else None
+
+
+def test_games_keep_tiles_and_score_each_word_once(dictionary):
+    sim = BatchSimulator(32, dictionary, seed=0)
+    n_tiles = sim.bag.shape[1]
+    while not sim.done.all():
+        sim.step(*sim.sample_random_actions())
+        rack_len = (sim.rack != 0).sum(axis=1)
+        assert (sim.rack_len == rack_len).all()
+        assert ((~sim.bag_taken).sum(axis=1) == sim.bag_left).all()
+        # Every tile is in the bag, on the rack or was placed.
+        assert (sim.bag_left + sim.rack_len + sim.n_moves == n_tiles).all()
+
+    assert sim.score.sum() > 0
+    for game in range(sim.n_games):
+        assert all(dictionary.check(word) for word in sim.words[game])
+        assert sim.score[game] == sum(
+            sim.word_cache.score(word) for word in sim.words[game]
+        )
+
+
+def test_finished_games_dont_change(dictionary):
+    sim = BatchSimulator(4, dictionary, seed=1)
+    sim.run_random()
+    grid, score = sim.grid.copy(), sim.score.copy()
+    assert not sim.step(*sim.sample_random_actions()).any()
+    assert (sim.grid == grid).all()
+    assert (sim.score == score).all()
+
+
+def test_same_seed_plays_same_games(dictionary):
+    first = BatchSimulator(8, dictionary, seed=2).run_random()
+    second = BatchSimulator(8, dictionary, seed=2).run_random()
+    assert (first == second).all()
+
+
+def test_runs_through_match_line_scan(dictionary):
+    sim = BatchSimulator(16, dictionary, seed=3)
+    sim.run_random(max_steps=40)
+    rng = np.random.default_rng(0)
+    games = np.arange(sim.n_games)
+    x = rng.integers(sim.size, size=sim.n_games)
+    y = rng.integers(sim.size, size=sim.n_games)
+
+    expected = []
+    for game, cx, cy in zip(games, x, y):
+        row = _naive_runs(sim.grid[game, cx, :], cy)
+        col = _naive_runs(sim.grid[game, :, cy], cx)
+        expected.extend((int(game), word) for word in (row, col) if word)
+    assert sorted(sim._runs_through(games, x, y)) == sorted(expected)
+
+
+def test_diagonal_games_only_move_diagonally(dictionary):
+    sim = BatchSimulator(4, dictionary, seed=4)
+    sim.status[1, STATUS_IDX["diagonal"]] = 2
+    mask = sim.legal_mask()
+    assert mask[0].all()
+    assert not mask[1, :-N_DIAGONAL_DIRECTIONS].any()
+    assert mask[1, -N_DIAGONAL_DIRECTIONS:].all()
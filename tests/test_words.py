@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from jumpbble.engine import GameState
+from jumpbble.selfplay import solver_policy
+from jumpbble.words import WordIndex
+
+
+def _rescanned(state: GameState):
+    # Every valid word found by scanning the whole board.
+    return {
+        (word, tuple(cells))
+        for word, cells in state.board.find_words()
+        if state.word_cache.score(word) != 0
+    }
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_full_rescan(dictionary, seed):
+    state = GameState(dictionary, seed=seed)
+    rng = random.Random(seed)
+    # Erasing breaks words, which the index has to drop.
+    state.player.status.add("erase", 20)
+    while not state.is_over:
+        for action in solver_policy(state, rng):
+            state.step(action)
+        index = state.word_index
+        assert set(index) == _rescanned(state)
+        mask = np.zeros((state.board_dim, state.board_dim), dtype=np.uint8)
+        for _, cells in index:
+            for cell in cells:
+                mask[cell] += 1
+        assert (index.mask == mask).all()
+
+
+def test_update_replaces_broken_and_extended_words():
+    index = WordIndex(15)
+    index.add("CAT", [(2, 3), (2, 4), (2, 5)])
+    index.add("AT", [(1, 4), (2, 4)])
+    assert list(index.words_at(2, 4)) == ["CAT", "AT"]
+    assert index.mask[2, 4] == 2
+
+    # Extended along the same axis.
+    index.update("CATS", [(2, 3), (2, 4), (2, 5), (2, 6)])
+    assert sorted(word for word, _ in index) == ["AT", "CATS"]
+    # Broken by an erased or invalid letter.
+    index.update(None, [(0, 4), (1, 4), (2, 4)])
+    assert [word for word, _ in index] == ["CATS"]
+    assert index.mask[1, 4] == 0
+    assert index.mask[2, 4] == 1
+    assert not index.is_highlighted(1, 4)
+
+
+def test_chunked_window_matches_dense():
+    dense, chunked = WordIndex(1100), WordIndex(1100, chunked=True)
+    for index in (dense, chunked):
+        index.add("DOG", [(1099, 0), (1099, 1), (1099, 2)])
+        index.add("GO", [(1098, 2), (1099, 2)])
+    xs = np.array([1097, 1098, 1099, 0])
+    ys = np.array([1099, 0, 1, 2, 3])
+    assert (chunked.window(xs, ys) == dense.window(xs, ys)).all()
+    assert dense.window(xs, ys).sum() == 4
+
+
+def test_restored_index_matches_saved(dictionary):
+    state = GameState(dictionary, seed=3)
+    rng = random.Random(0)
+    while not state.is_over:
+        for action in solver_policy(state, rng):
+            state.step(action)
+    saved = state.word_index
+    assert len(saved) > 0
+    restored = WordIndex.restore(saved.size, saved.chunked, *saved.starts())
+    assert len(restored) == len(saved)
+    assert restored.words == saved.words
+    assert (restored.mask == saved.mask).all()